@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+from responses import RequestsMock
+
+from chapter_sync.console import Console
+
+# The number of chapters in a series, from a fresh series to a very long one.
+SIZES = [10, 1_000, 10_000]
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n}-chapters")
+def size(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def responses():
+    with RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
+
+@pytest.fixture
+def console():
+    return Console()
@@ -0,0 +1,184 @@
+"""A local stand-in for the fiction sites which series are synced from.
+
+Royal Road-shaped series are served under `/fiction/{id}`, and custom series
+(listed in a table of contents, and linked by "next" links) under `/custom/{id}`.
+Responses can be delayed and failed according to `Faults`, so that concurrency,
+retries and rate limiting can be exercised (and measured) without a real site.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import threading
+from collections import Counter
+from collections.abc import Generator
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse
+
+# Every chapter was released a day after the last, from 2020-01-01.
+EPOCH = 1577836800
+
+
+@dataclass
+class Faults:
+    # Seconds by which every response is delayed.
+    latency: float = 0
+    # The fraction of responses which are (retryable) server errors.
+    error_rate: float = 0
+    # The fraction of responses which are rate limited (429s).
+    throttle_rate: float = 0
+    # The `Retry-After` sent with rate limited responses, if any.
+    retry_after: int | None = None
+
+    seed: int = 0
+
+
+@dataclass
+class FakeSite:
+    """Serves `chapters` chapters for any series id, failing per `faults`."""
+
+    chapters: int = 10
+    faults: Faults = field(default_factory=Faults)
+
+    # The number of requests made for each path, and their response statuses.
+    requests: Counter[str] = field(default_factory=Counter, init=False)
+    statuses: Counter[int] = field(default_factory=Counter, init=False)
+
+    _random: random.Random = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self):
+        self._random = random.Random(self.faults.seed)  # noqa: S311
+
+    def app(self) -> FastAPI:
+        app = FastAPI()
+        app.middleware("http")(self.inject_faults)
+
+        app.get("/fiction/{series}", response_class=HTMLResponse)(self.royal_road_toc)
+        app.get("/fiction/{series}/chapter/{number}", response_class=HTMLResponse)(
+            self.royal_road_chapter
+        )
+        app.get("/custom/{series}/", response_class=HTMLResponse)(self.custom_toc)
+        app.get("/custom/{series}/chapter/{number}", response_class=HTMLResponse)(
+            self.custom_chapter
+        )
+        return app
+
+    async def inject_faults(self, request: Request, call_next):
+        with self._lock:
+            self.requests[request.url.path] += 1
+            roll = self._random.random()
+
+        if self.faults.latency:
+            await asyncio.sleep(self.faults.latency)
+
+        if roll < self.faults.error_rate:
+            response = Response("Internal Server Error", status_code=500)
+        elif roll < self.faults.error_rate + self.faults.throttle_rate:
+            headers = {}
+            if self.faults.retry_after is not None:
+                headers["Retry-After"] = str(self.faults.retry_after)
+            response = Response("Too Many Requests", status_code=429, headers=headers)
+        else:
+            response = await call_next(request)
+
+        with self._lock:
+            self.statuses[response.status_code] += 1
+        return response
+
+    def royal_road_toc(self, series: int):
+        rows = "\n".join(
+            f'<tr data-url="/fiction/{series}/chapter/{n}" data-volume-id="null">'
+            f'<td><a href="/fiction/{series}/chapter/{n}">{chapter_title(n)}</a></td>'
+            "</tr>"
+            for n in range(1, self.chapters + 1)
+        )
+        return f"""
+            <html>
+              <head><title>Series {series}</title></head>
+              <body><table id="chapters"><tbody>{rows}</tbody></table></body>
+            </html>
+        """
+
+    def royal_road_chapter(self, series: int, number: int):
+        return f"""
+            <html>
+              <head><title>{chapter_title(number)}</title></head>
+              <body>
+                <div class="chapter-inner chapter-content">
+                  {chapter_content(series, number)}
+                </div>
+                <div class="profile-info">
+                  <time unixtime="{EPOCH + (number - 1) * 86400}"></time>
+                </div>
+              </body>
+            </html>
+        """
+
+    def custom_toc(self, series: int, request: Request):
+        links = "\n".join(
+            f'<li><a href="{request.base_url}custom/{series}/chapter/{n}">'
+            f"{chapter_title(n)}</a></li>"
+            for n in range(1, self.chapters + 1)
+        )
+        return f"<html><head></head><body><ul>{links}</ul></body></html>"
+
+    def custom_chapter(self, series: int, number: int):
+        next_link = ""
+        if number < self.chapters:
+            next_link = f'<a class="next" href="{number + 1}">Next</a>'
+
+        return f"""
+            <html>
+              <head></head>
+              <body>
+                <div class="content">
+                  <h1>{chapter_title(number)}</h1>
+                  {chapter_content(series, number)}
+                </div>
+                {next_link}
+              </body>
+            </html>
+        """
+
+
+def chapter_title(number: int) -> str:
+    return f"Chapter {number}"
+
+
+def chapter_text(series: int, number: int) -> str:
+    return f"Series {series}, chapter {number}."
+
+
+def chapter_content(series: int, number: int) -> str:
+    return f"<p>{chapter_text(series, number)}</p>"
+
+
+@contextlib.contextmanager
+def serve(app: FastAPI) -> Generator[str, None, None]:
+    """Serve the app (on a free port) in a background thread, yielding its url."""
+    config = uvicorn.Config(app, port=0, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    # `time.sleep` may well be patched out, by the `sleeps` fixture.
+    poll = threading.Event()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("The fake site failed to start")
+        poll.wait(0.01)
+
+    (socket,) = server.servers[0].sockets
+    host, port = socket.getsockname()[:2]
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
@@ -0,0 +1,180 @@
+"""Generators for realistic, arbitrarily large, chapter pages.
+
+The shapes are taken from the pages recorded in `pages/` (copies of those in
+`tests/handlers`), padded out with the kinds of content which the cleaning
+passes exist to handle.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from pendulum import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from chapter_sync.schema import Base, Chapter, Series
+
+PAGES = Path(__file__).parent / "pages"
+
+hidden_style = """
+<style>
+    .cjVhNzc1Y2Q0NGM0NDM5ZjhiZjQ1 {
+        display: none;
+        speak: never;
+    }
+</style>
+"""
+
+cf_email = (
+    '<a href="/cdn-cgi/l/email-protection" class="__cf_email__" '
+    'data-cfemail="85d5eaecebf1dac8e0dac5">[email&#160;protected]</a>'
+)
+
+
+def recorded_page(name: str) -> str:
+    """Return one of the real pages recorded in `pages/`."""
+    return (PAGES / f"{name}.html").read_text()
+
+
+def paragraph(i: int) -> str:
+    if i % 50 == 0:
+        return f'<p class="cjVhNzc1Y2Q0NGM0NDM5ZjhiZjQ1">Stolen notice {i}</p>'
+    if i % 25 == 0:
+        return f'<div class="spoiler-new"><p>Spoiler {i}</p></div>'
+    if i % 20 == 0:
+        return f"<p>{cf_email}_The_Sky {i}</p>"
+    if i % 10 == 0:
+        return f"<p>Pasted from word {i}<o:p></o:p></p>"
+    if i % 5 == 0:
+        return f'<p><span style="color: rgb(255, 0, 0); font-weight: 600">Status {i}</span></p>'
+    return (
+        f'<p class="cnRmYTk">Paragraph {i}, which contains <em>some</em> '
+        "emphasized text and a reasonable amount of prose to pad out its length.</p>"
+    )
+
+
+def royal_road_chapter(paragraphs: int = 200, comments: int = 50) -> str:
+    body = "\n".join(paragraph(i) for i in range(1, paragraphs + 1))
+    comment_section = "\n".join(
+        f'<div class="comment"><div class="media-body"><p style="color: #999">'
+        f"Comment {i}</p></div></div>"
+        for i in range(comments)
+    )
+    return f"""
+<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8"/>
+    {hidden_style}
+  </head>
+  <body>
+    <div>
+      <div class="portlet light chapter">
+        <div class="portlet-body">
+          <div class="chapter-inner chapter-content">
+            <h3><span style="font-weight: 600">Chapter Title</span></h3>
+            {body}
+          </div>
+        </div>
+      </div>
+      <div class="portlet light">
+        <div class="portlet-body profile">
+          <div class="col-md-8 profile-info">
+            <time unixtime="1577836800">Thursday, February 15th, 2024 18:42</time>
+          </div>
+        </div>
+      </div>
+      <div class="comments">{comment_section}</div>
+    </div>
+  </body>
+</html>
+"""
+
+
+def royal_road_toc(chapters: int) -> str:
+    rows = "\n".join(
+        f'<tr style="cursor: pointer" data-url="/series/chapter{i}" '
+        f'data-volume-id="null" class="chapter-row">'
+        f'<td><a href="/series/chapter{i}">Chapter {i}</a></td>'
+        f'<td data-content="0" class="text-right"><a href="/series/chapter{i}">'
+        f'<time unixtime="1577836800" format="agoshort">1 month </time> ago</a></td>'
+        "</tr>"
+        for i in range(1, chapters + 1)
+    )
+    return f"""
+<!DOCTYPE html>
+<html lang="en">
+  <head><meta charset="utf-8"/><title>Series - Table of Contents</title></head>
+  <body>
+    <div class="portlet light">
+      <div class="portlet-body">
+        <table class="table no-border" id="chapters" data-chapters="{chapters}">
+          <tbody>{rows}</tbody>
+        </table>
+      </div>
+    </div>
+  </body>
+</html>
+"""
+
+
+def custom_toc(chapters: int) -> str:
+    links = "\n".join(
+        f'<li><a href="https://example.com/series/chapter{i}">Chapter {i}</a></li>'
+        for i in range(1, chapters + 1)
+    )
+    return f"""
+<!DOCTYPE html>
+<html lang="en">
+  <head><meta charset="utf-8"/></head>
+  <body><ul class="toc">{links}</ul></body>
+</html>
+"""
+
+
+def custom_chapter(paragraphs: int = 200) -> str:
+    body = "\n".join(paragraph(i) for i in range(1, paragraphs + 1))
+    return f"""
+<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8"/>
+    <meta property="article:published_time" content="2020-01-01T00:00:00+00:00"/>
+  </head>
+  <body>
+    <article><div class="entry-content">{body}</div></article>
+  </body>
+</html>
+"""
+
+
+def make_series(chapters: int, content: str = "<p>Content</p>", **kwargs) -> Series:
+    """Build a (transient) series, with `chapters` chapters of `content`."""
+    series = Series(
+        id=1,
+        name="series",
+        type="custom",
+        url="https://example.com/series/",
+        title="Series",
+        author="Author",
+        **kwargs,
+    )
+    series.chapters = [
+        Chapter(
+            series_id=1,
+            number=i,
+            title=f"Chapter {i}",
+            url=f"https://example.com/series/chapter{i}",
+            content=content,
+            published_at=datetime(2020, 1, 1),
+        )
+        for i in range(1, chapters + 1)
+    ]
+    return series
+
+
+def create_db() -> Session:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return Session(bind=engine)
@@ -0,0 +1,86 @@
+import pytest
+from bs4 import BeautifulSoup, Tag
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.fixtures import recorded_page, royal_road_chapter
+from chapter_sync.clean import (
+    CF_EMAIL_CLASS,
+    CF_EMAIL_HREF,
+    RE_COLOR_DECLARATION,
+    RE_COLOR_STYLE,
+    RE_HIDDEN_CLASS,
+    RE_NAMESPACED_ELEMENT,
+    Cleaner,
+    decode_cf_email,
+    hidden_classes,
+)
+
+
+def multi_pass(soup: BeautifulSoup, content: Tag):
+    """Clean the page with a separate pass over the whole document per cleaner.
+
+    The approach superseded by the single-pass `Cleaner`, which it's benchmarked
+    (and checked) against.
+    """
+    for namespaced in soup.find_all(RE_NAMESPACED_ELEMENT):
+        namespaced.decompose()
+
+    for a in soup.find_all("a", class_=CF_EMAIL_CLASS, href=CF_EMAIL_HREF):
+        a.insert_before(decode_cf_email(a["data-cfemail"]))
+        a.decompose()
+
+    for tag in soup.find_all(style=RE_COLOR_STYLE):
+        tag["style"] = RE_COLOR_DECLARATION.sub("", tag["style"])
+
+    for spoiler in soup.find_all(class_="spoiler-new"):
+        spoiler.decompose()
+
+    for style in soup.find_all("style"):
+        match = RE_HIDDEN_CLASS.match(style.string)
+        if not match:
+            continue
+
+        for warning in content.find_all(class_=match.group(1)):
+            warning.decompose()
+
+
+def single_pass(soup: BeautifulSoup, content: Tag):
+    cleaner = Cleaner(removed_classes={"spoiler-new", *hidden_classes(soup)})
+    cleaner.clean(content)
+
+
+def parse(page: str):
+    soup = BeautifulSoup(page, "html5lib")
+    content = soup.find("div", class_="chapter-content")
+    return (soup, content), {}
+
+
+@pytest.fixture(params=[100, 1000], ids=lambda n: f"{n}-paragraphs")
+def page(request):
+    return royal_road_chapter(paragraphs=request.param, comments=request.param // 2)
+
+
+@pytest.mark.parametrize("clean", [multi_pass, single_pass])
+@pytest.mark.benchmark(group="clean")
+def test_clean(benchmark: BenchmarkFixture, page: str, clean):
+    # Parsing is excluded from the timings, since both approaches share its cost.
+    benchmark.pedantic(clean, setup=lambda: parse(page), rounds=20)
+
+
+def assert_equivalent(page: str):
+    (multi_soup, multi_content), _ = parse(page)
+    multi_pass(multi_soup, multi_content)
+
+    (single_soup, single_content), _ = parse(page)
+    single_pass(single_soup, single_content)
+
+    assert str(single_content) == str(multi_content)
+
+
+def test_equivalent(page: str):
+    assert_equivalent(page)
+
+
+@pytest.mark.parametrize("name", ["royal_road_chapter1", "royal_road_chapter2"])
+def test_equivalent_recorded(name: str):
+    assert_equivalent(recorded_page(name))
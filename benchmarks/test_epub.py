@@ -0,0 +1,76 @@
+import io
+import zipfile
+
+import pytest
+import xmltodict
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.fixtures import make_series, royal_road_chapter
+from chapter_sync.cover import generate_cover_image
+from chapter_sync.epub import Epub
+
+# A realistically sized chapter body, without the surrounding page.
+content = royal_road_chapter(paragraphs=50, comments=0)
+
+
+@pytest.mark.benchmark(group="epub.from_series")
+def test_from_series(benchmark: BenchmarkFixture, size: int):
+    series = make_series(size, content)
+
+    epub = benchmark(Epub.from_series, series, *series.chapters)
+    assert len(epub.chapters) == size
+
+
+@pytest.mark.benchmark(group="epub.write")
+def test_write(benchmark: BenchmarkFixture, size: int):
+    series = make_series(size, content)
+    epub = Epub.from_series(series, *series.chapters)
+
+    def write():
+        epub.write(io.BytesIO())
+
+    benchmark.pedantic(write, rounds=3 if size > 1_000 else 10)
+
+
+@pytest.mark.benchmark(group="cover")
+def test_generate_cover_image(benchmark: BenchmarkFixture):
+    series = make_series(0)
+
+    cover = benchmark(generate_cover_image, series)
+    assert cover
+
+
+@pytest.mark.benchmark(group="epub.toc")
+def test_write_toc(benchmark: BenchmarkFixture, size: int):
+    series = make_series(size, content)
+    epub = Epub.from_series(series, *series.chapters)
+
+    def write():
+        with zipfile.ZipFile(io.BytesIO(), "w") as zf:
+            epub.write_toc_ncx(zf, epub.id, epub.title, epub.author)
+            epub.write_content_opf(zf, epub.id, epub.title, epub.author)
+
+    benchmark(write)
+
+
+def write_toc_xmltodict(epub: Epub, zf: zipfile.ZipFile):
+    # The dict-based serialization which `write_toc_ncx` replaced.
+    toc = epub.toc_ncx_dict(epub.id, epub.title, epub.author)
+    zf.writestr(epub.toc_ncx_filename, xmltodict.unparse(toc, pretty=True, indent="  "))
+
+
+def write_toc_streamed(epub: Epub, zf: zipfile.ZipFile):
+    epub.write_toc_ncx(zf, epub.id, epub.title, epub.author)
+
+
+@pytest.mark.parametrize("write_toc", [write_toc_xmltodict, write_toc_streamed])
+@pytest.mark.benchmark(group="epub.toc")
+def test_write_toc_ncx(benchmark: BenchmarkFixture, write_toc):
+    series = make_series(5_000, content)
+    epub = Epub.from_series(series, *series.chapters)
+
+    def write():
+        with zipfile.ZipFile(io.BytesIO(), "w") as zf:
+            write_toc(epub, zf)
+
+    benchmark(write)
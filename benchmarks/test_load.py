@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from benchmarks.fake_site import FakeSite, Faults, serve
+from benchmarks.fixtures import create_db
+from chapter_sync.console import Console
+from chapter_sync.request import requests_session
+from chapter_sync.retry import CircuitBreaker, FetchError, RetryPolicy
+from chapter_sync.schema import Chapter, Series
+from chapter_sync.sync import update_series
+
+profiles = {
+    "clean": Faults(),
+    "slow": Faults(latency=0.05),
+    "flaky": Faults(latency=0.01, error_rate=0.05),
+    "throttled": Faults(latency=0.01, throttle_rate=0.02, retry_after=1),
+}
+
+
+def crawl(database: Session, series: Series, console: Console, workers: int) -> int:
+    """Sync the series until all of its chapters are collected, returning the passes.
+
+    As with `watch`, a pass which trips the site's circuit breaker is followed by
+    another (with a fresh breaker, rather than waiting out its reset).
+    """
+    for passes in range(1, 21):
+        policy = RetryPolicy(
+            base_delay=0.1, max_delay=5, breaker=CircuitBreaker(threshold=20)
+        )
+        try:
+            update_series(
+                database,
+                series,
+                console,
+                requests_session(retry_policy=policy),
+                workers=workers,
+            )
+        except FetchError:
+            database.rollback()
+            continue
+        return passes
+    raise RuntimeError("The crawl didn't complete")
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+@pytest.mark.parametrize("profile", profiles.keys())
+@pytest.mark.benchmark(group="load")
+def test_crawl(
+    benchmark: BenchmarkFixture, console: Console, profile: str, workers: int
+):
+    chapters = 200
+    site = FakeSite(chapters=chapters, faults=profiles[profile])
+
+    with serve(site.app()) as url:
+
+        def setup():
+            database = create_db()
+            series = Series(
+                name="series",
+                type="royal-road",
+                url=f"{url}/fiction/1",
+                title="Series",
+            )
+            database.add(series)
+            database.commit()
+            return (database, series), {}
+
+        def run(database: Session, series: Series):
+            start = time.perf_counter()
+            passes = crawl(database, series, console, workers)
+            elapsed = time.perf_counter() - start
+
+            # Every chapter is collected exactly once, however many faults occurred.
+            numbers = database.scalars(select(Chapter.number)).all()
+            assert sorted(numbers) == list(range(1, chapters + 1))
+
+            benchmark.extra_info.update(
+                chapters_per_second=round(chapters / elapsed, 1),
+                passes=passes,
+                statuses={str(k): v for k, v in site.statuses.items()},
+            )
+            database.close()
+
+        benchmark.pedantic(run, setup=setup, rounds=1)
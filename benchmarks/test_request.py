@@ -0,0 +1,31 @@
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from requests import Session
+from responses import RequestsMock
+
+from benchmarks.fixtures import (
+    custom_chapter,
+    recorded_page,
+    royal_road_chapter,
+    royal_road_toc,
+)
+from chapter_sync.request import get_soup
+
+pages = {
+    "recorded-royal-road": recorded_page("royal_road_chapter1"),
+    "recorded-custom": recorded_page("custom_chapter1"),
+    "royal-road": royal_road_chapter(),
+    "custom": custom_chapter(),
+    "royal-road-toc": royal_road_toc(1_000),
+}
+
+
+@pytest.mark.parametrize("page", pages.values(), ids=pages.keys())
+@pytest.mark.benchmark(group="get_soup")
+def test_get_soup(benchmark: BenchmarkFixture, responses: RequestsMock, page: str):
+    url = "https://example.com/page"
+    responses.get(url, body=page)
+
+    session = Session()
+    soup = benchmark(get_soup, session, url)
+    assert soup.body
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+commands = {
+    "help": ["--help"],
+    "series-list": ["series", "list"],
+}
+
+
+@pytest.mark.parametrize("args", commands.values(), ids=commands.keys())
+@pytest.mark.benchmark(group="startup")
+def test_startup(benchmark: BenchmarkFixture, tmp_path: Path, args: list[str]):
+    # Short commands should start in well under 100ms, beyond the interpreter's
+    # own startup (see `-X importtime` for where the time goes).
+    env = {
+        **os.environ,
+        "DATABASE_NAME": str(tmp_path / "chapter-sync.sqlite"),
+        "XDG_CACHE_HOME": str(tmp_path / "cache"),
+    }
+
+    def run():
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "chapter_sync", *args],
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+
+    # The first run creates (and migrates) the database.
+    run()
+    benchmark.pedantic(run, rounds=10)
+
+
+@pytest.mark.benchmark(group="startup")
+def test_interpreter(benchmark: BenchmarkFixture):
+    # The baseline, for comparison.
+    benchmark.pedantic(
+        subprocess.run, args=([sys.executable, "-c", "pass"],), rounds=10
+    )
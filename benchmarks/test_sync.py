@@ -0,0 +1,62 @@
+import re
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from requests import Session as RequestsSession
+from responses import RequestsMock
+
+from benchmarks.fixtures import (
+    create_db,
+    custom_chapter,
+    custom_toc,
+    royal_road_chapter,
+    royal_road_toc,
+)
+from chapter_sync.console import Console
+from chapter_sync.schema import Chapter, Series
+from chapter_sync.sync import update_series
+
+sites = {
+    "royal-road": (royal_road_toc, royal_road_chapter(paragraphs=20, comments=5), {}),
+    "custom": (
+        custom_toc,
+        custom_chapter(paragraphs=20),
+        {"chapter_selector": "ul.toc a", "content_selector": "div.entry-content"},
+    ),
+}
+
+
+@pytest.mark.parametrize("type", sites.keys())
+@pytest.mark.benchmark(group="sync")
+def test_update_series(
+    benchmark: BenchmarkFixture,
+    responses: RequestsMock,
+    console: Console,
+    size: int,
+    type: str,
+):
+    toc, chapter, settings = sites[type]
+    url = "https://example.com/series/"
+
+    responses.get(url, body=toc(size))
+    # A single (pattern) registration, since `responses` matches linearly.
+    responses.add_callback(
+        responses.GET,
+        re.compile(rf"{url}chapter\d+"),
+        callback=lambda request: (200, {}, chapter),
+    )
+
+    def setup():
+        database = create_db()
+        series = Series(name="series", type=type, url=url, title="Series")
+        series.settings = settings
+        database.add(series)
+        database.commit()
+        return (database, series, console, RequestsSession()), {}
+
+    def sync(database, series, console, requests):
+        update_series(database, series, console, requests)
+        assert database.query(Chapter).count() == size
+        database.close()
+
+    benchmark.pedantic(sync, setup=setup, rounds=1 if size > 1_000 else 3)
@@ -9,11 +9,11 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
 from chapter_sync.cli.base import console, database, email_client
-from chapter_sync.cli.chapter import Export, List, Send, Set
+from chapter_sync.cli.chapter import Export, List, Search, Send, Set
 from chapter_sync.console import Console, escape, render_datetime, render_float
 from chapter_sync.email import EmailClient
-from chapter_sync.epub import Epub
 from chapter_sync.schema import Chapter, Series
+from chapter_sync.search import highlight, search_chapters
 
 
 def export(
@@ -21,6 +21,8 @@ def export(
     database: Annotated[Session, cappa.Dep(database)],
     console: Annotated[Console, cappa.Dep(console)],
 ):
+    from chapter_sync.epub import Epub
+
     chapter = get_chapter(database, command.series, command.number)
 
     ebook = chapter.ebook
@@ -72,6 +74,34 @@ def list_chapters(
     )
 
 
+def search(
+    command: Search,
+    database: Annotated[Session, cappa.Dep(database)],
+    console: Annotated[Console, cappa.Dep(console)],
+):
+    results = search_chapters(
+        database, command.query, series=command.series, limit=command.limit
+    )
+    if not results:
+        console.info("No chapters found")
+        return
+
+    table_result = [
+        (
+            escape(r.chapter.series.title),
+            r.chapter.number,
+            f"[link={escape(r.chapter.url)}]{escape(r.chapter.title)}[/link]",
+            highlight(r.snippet, "[bold]", "[/bold]", escape=escape),
+        )
+        for r in results
+    ]
+    console.table(
+        f"Results for '{escape(command.query)}'",
+        ["Series", "Chapter", "Title", "Match"],
+        table_result,
+    )
+
+
 def send(
     command: Send,
     database: Annotated[Session, cappa.Dep(database)],
@@ -81,14 +111,13 @@ def send(
     ebook = chapter.ebook
     assert ebook
 
-    for subscriber in chapter.series.email_subscribers:
-        title = chapter.filename()
-        email_client.send(
-            subject=title,
-            to=subscriber.email,
-            filename=title,
-            attachment=ebook,
-        )
+    title = chapter.filename()
+    email_client.send_all(
+        subject=title,
+        to=[subscriber.email for subscriber in chapter.series.email_subscribers],
+        filename=title,
+        attachment=ebook,
+    )
 
 
 def set_chapter(
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+from bs4 import BeautifulSoup, Tag
+
+RE_NAMESPACED_ELEMENT = re.compile(r"[a-z]+:[a-z]+")
+RE_COLOR_STYLE = re.compile(r"(?:color|background)\s*:")
+RE_COLOR_DECLARATION = re.compile(r"(?:color|background)\s*:[^;]+;?")
+RE_HIDDEN_CLASS = re.compile(r"\s*\.(\w+)\s*{[^}]*display:\s*none;[^}]*}")
+
+CF_EMAIL_CLASS = "__cf_email__"
+CF_EMAIL_HREF = "/cdn-cgi/l/email-protection"
+
+
+@dataclass
+class Cleaner:
+    """Applies a set of cleaning passes to a tree in a single traversal.
+
+    Rather than each pass walking the whole document (as `find_all` would),
+    every element of the given subtree is visited once, and checked against only
+    the enabled passes. Removed elements' descendants are never visited. The
+    root itself is cleaned too, but never removed.
+
+    Examples:
+        >>> soup = BeautifulSoup(
+        ...     '<div><o:p>x</o:p><p style="color: red;">y</p>'
+        ...     '<p class="spoiler-new">z</p></div>',
+        ...     "html.parser",
+        ... )
+        >>> Cleaner(removed_classes={"spoiler-new"}).clean(soup.div)
+        >>> soup.div
+        <div><p style="">y</p></div>
+    """
+
+    # Namespaced elements (e.g. `<o:p>` from Word) cause epub validation errors.
+    namespaced_elements: bool = True
+    # Cloudflare mangles things that look like email addresses.
+    emails: bool = True
+    # Inline colors tend to be unreadable on e-readers.
+    colors: bool = True
+    # Elements with any of these classes are removed entirely.
+    removed_classes: set[str] = field(default_factory=set)
+
+    def clean(self, root: Tag):
+        self.restyle(root)
+
+        stack = [root]
+        while stack:
+            tag = stack.pop()
+            if tag is not root and not self.visit(tag):
+                continue
+
+            stack.extend(child for child in tag.contents if isinstance(child, Tag))
+
+    def visit(self, tag: Tag) -> bool:
+        """Clean a single element, returning whether it was retained."""
+        if self.namespaced_elements and RE_NAMESPACED_ELEMENT.search(tag.name):
+            tag.decompose()
+            return False
+
+        classes = tag.get("class")
+        if (
+            classes
+            and self.removed_classes
+            and self.removed_classes.intersection(classes)
+        ):
+            tag.decompose()
+            return False
+
+        if (
+            self.emails
+            and tag.name == "a"
+            and classes
+            and CF_EMAIL_CLASS in classes
+            and tag.get("href") == CF_EMAIL_HREF
+        ):
+            tag.insert_before(decode_cf_email(str(tag["data-cfemail"])))
+            tag.decompose()
+            return False
+
+        self.restyle(tag)
+        return True
+
+    def restyle(self, tag: Tag):
+        """Clean a single element's attributes, which never removes it."""
+        if self.colors:
+            style = tag.get("style")
+            if style and RE_COLOR_STYLE.search(str(style)):
+                tag["style"] = RE_COLOR_DECLARATION.sub("", str(style))
+
+
+def decode_cf_email(data: str) -> str:
+    # See: https://usamaejaz.com/cloudflare-email-decoding/
+    enc = bytes.fromhex(data)
+    return bytes([c ^ enc[0] for c in enc[1:]]).decode("utf8")
+
+
+def hidden_classes(soup: BeautifulSoup) -> set[str]:
+    """Find the css classes which the page's stylesheets hide with `display: none`."""
+    result = set()
+    for style in soup.find_all("style"):
+        match = RE_HIDDEN_CLASS.match(style.string or "")
+        if match:
+            result.add(match.group(1))
+    return result
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import importlib.resources
 import sys
 from collections.abc import Generator
 from dataclasses import dataclass
@@ -8,7 +7,6 @@ from pathlib import Path
 from typing import Annotated
 
 import cappa
-from alembic.config import Config
 from cappa.help import HelpFormatter
 from dotenv import load_dotenv
 from requests import Session as RequestsSession
@@ -16,43 +14,59 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 from typing_extensions import Doc
 
+from chapter_sync import schema_version
 from chapter_sync.cli.chapter import Chapter
 from chapter_sync.cli.db import Db
 from chapter_sync.cli.series import Series
 from chapter_sync.cli.subscriber import Subscriber
 from chapter_sync.console import Console
 from chapter_sync.email import EmailClient
-from chapter_sync.request import requests_session
+from chapter_sync.images import ImageCache, ImageProfile
+from chapter_sync.request import ResponseCache, requests_session
 
 
 def database_url(chapter_sync: ChapterSync) -> str:
     return f"sqlite:///{chapter_sync.database_name}"
 
 
-def requests() -> RequestsSession:
-    return requests_session()
+def response_cache(chapter_sync: ChapterSync) -> ResponseCache | None:
+    if chapter_sync.cache_dir is None:
+        if chapter_sync.offline:
+            raise cappa.Exit("`--offline` requires a `--cache-dir`", code=1)
+        return None
 
+    return ResponseCache(
+        chapter_sync.cache_dir,
+        ttl=chapter_sync.cache_ttl,
+        max_size=chapter_sync.cache_size * 1024 * 1024,
+        offline=chapter_sync.offline,
+    )
 
-def alembic_config(database_url: Annotated[str, cappa.Dep(database_url)]) -> Config:
-    migrations = importlib.resources.files("chapter_sync.migrations")
-    alembic_ini = migrations.joinpath("alembic.ini")
-    alembic_cfg = Config(str(alembic_ini))
-    alembic_cfg.set_main_option("sqlalchemy.url", database_url)
-    alembic_cfg.set_main_option("script_location", str(migrations))
-    return alembic_cfg
+
+def image_cache(chapter_sync: ChapterSync) -> ImageCache:
+    # Kept alongside the page cache, if there is one.
+    return ImageCache(chapter_sync.cache_dir)
+
+
+def requests(
+    response_cache: Annotated[ResponseCache | None, cappa.Dep(response_cache)],
+) -> RequestsSession:
+    return requests_session(response_cache)
 
 
 def database(
     database_url: Annotated[str, cappa.Dep(database_url)],
-    alembic_config: Annotated[Config | None, cappa.Dep(alembic_config)] = None,
+    migrate: bool = True,
 ) -> Generator[Session, None, None]:
-    from chapter_sync.db import bootstrap
-
     engine = create_engine(database_url)
 
-    if alembic_config:
+    if migrate:
         with engine.connect() as conn:
-            bootstrap(conn, alembic_config)
+            # Alembic is only loaded when the database isn't known to be up to date.
+            if not schema_version.is_current(conn):
+                from chapter_sync.db import alembic_config, bootstrap
+
+                bootstrap(conn, alembic_config(database_url))
 
     with Session(bind=engine) as session:
         yield session
@@ -95,16 +109,43 @@ class ChapterSync:
     ] = 0
     tty: Annotated[bool | None, cappa.Arg(long="--tty/--no-tty")] = None
 
+    cache_dir: Annotated[
+        Path | None,
+        cappa.Arg(long=True, default=cappa.Env("CACHE_DIR")),
+        Doc("Cache fetched pages in the given directory. Disabled by default."),
+    ] = None
+    cache_ttl: Annotated[
+        int | None,
+        cappa.Arg(long=True, default=cappa.Env("CACHE_TTL")),
+        Doc(
+            "The duration (in seconds) after which a cached page is refetched. "
+            "Defaults to never expiring."
+        ),
+    ] = None
+    cache_size: Annotated[
+        int,
+        cappa.Arg(long=True, default=cappa.Env("CACHE_SIZE")),
+        Doc(
+            "The maximum size (in MB) of the page cache, beyond which the least "
+            "recently used pages are evicted. Defaults to 512."
+        ),
+    ] = 512
+    offline: Annotated[
+        bool,
+        cappa.Arg(long=["--offline", "--cache-only"]),
+        Doc(
+            "Only use pages from the `--cache-dir`, never the network. "
+            "Useful for iterating on series settings."
+        ),
+    ] = False
+
     def __call__(self):
         help_formatter = HelpFormatter()
         raise cappa.HelpExit(help_formatter(cappa.collect(ChapterSync), "chapter-sync"))
 
 
-@cappa.command(invoke="chapter_sync.sync.sync")
 @dataclass
-class Sync:
-    """Sync updates to all series."""
-
+class SyncOptions:
     series: Annotated[
         list[int] | None,
         cappa.Arg(long=True),
@@ -115,6 +156,39 @@ class Sync:
         cappa.Arg(long="--update/--no-update"),
         Doc("Whether to check the series for new content updates (Default True)"),
     ] = True
+    schedule: Annotated[
+        bool,
+        cappa.Arg(long="--schedule/--no-schedule"),
+        Doc(
+            "Only update the series which are due to be checked, according to "
+            "each series' release cadence (Default False)"
+        ),
+    ] = False
+    recheck: Annotated[
+        int,
+        cappa.Arg(long=True),
+        Doc(
+            "Re-fetch the most recent N chapters of each series, recording a new "
+            "revision of any chapter whose content has changed (Default 0)"
+        ),
+    ] = 0
+    workers: Annotated[
+        int,
+        cappa.Arg(short="j", long=True),
+        Doc(
+            "The number of chapters of a series to fetch concurrently, when "
+            "the series' chapters are listed up front; and the number of epubs "
+            "to build concurrently, when sending (Default 1)"
+        ),
+    ] = 1
+    save_pages: Annotated[
+        bool,
+        cappa.Arg(long="--save-pages/--no-save-pages"),
+        Doc(
+            "Whether to retain the raw page of each new chapter, so that it can "
+            "later be reprocessed with `series reprocess` (Default False)"
+        ),
+    ] = False
     save: Annotated[
         bool,
         cappa.Arg(long="--save/--no-save"),
@@ -136,18 +210,104 @@ class Sync:
         ),
     ] = True
 
+    max_attachment_size: Annotated[
+        int,
+        cappa.Arg(long=True, default=cappa.Env("MAX_ATTACHMENT_SIZE")),
+        Doc(
+            "The largest epub (in MB) to send, beyond which a block of chapters "
+            "is split into several epubs. Emails are base64 encoded, so this should "
+            "be comfortably below your SMTP provider's limit. 0 disables splitting "
+            "(Default 18)"
+        ),
+    ] = 18
+
+    images: Annotated[
+        ImageProfile | None,
+        cappa.Arg(long=True, default=cappa.Env("IMAGES")),
+        Doc(
+            "Embed chapters' images in their epubs, scaled and recompressed for "
+            "the given kind of device ('eink' or 'tablet'). By default, images "
+            "are left as links, which most e-readers won't follow."
+        ),
+    ] = None
+    split_chapters: Annotated[
+        int,
+        cappa.Arg(long=True, default=cappa.Env("SPLIT_CHAPTERS")),
+        Doc(
+            "Split chapters larger than this (in KB) across several files within "
+            "their epubs. Many e-readers render files over ~300KB very slowly, "
+            "so e.g. 256. 0 disables splitting (Default 0)"
+        ),
+    ] = 0
+
+    public_url: Annotated[
+        str | None,
+        cappa.Arg(long=True, default=cappa.Env("PUBLIC_URL")),
+        Doc(
+            "The url at which the `web` app is reachable by subscribers. Required "
+            "(along with `--link-secret`) to send download links to subscribers "
+            "whose delivery is 'link'."
+        ),
+    ] = None
+    link_secret: Annotated[
+        str | None,
+        cappa.Arg(long=True, default=cappa.Env("LINK_SECRET")),
+        Doc(
+            "The secret with which download links are signed. The `web` app must "
+            "be given the same `LINK_SECRET`."
+        ),
+    ] = None
+    link_ttl: Annotated[
+        int,
+        cappa.Arg(long=True, default=cappa.Env("LINK_TTL")),
+        Doc("The number of days after which download links expire (Default 7)"),
+    ] = 7
+
+    profile: Annotated[
+        bool,
+        cappa.Arg(long=True),
+        Doc("After syncing, report the slowest stages and series (Default False)"),
+    ] = False
+    trace_file: Annotated[
+        Path | None,
+        cappa.Arg(long=True, default=cappa.Env("TRACE_FILE")),
+        Doc(
+            "Append a trace of each sync (as OTLP/JSON, one line per sync) to "
+            "the given file, e.g. for the OpenTelemetry collector."
+        ),
+    ] = None
+
     export_to: Annotated[Path | None, cappa.Arg(default=cappa.Env("EXPORT_TO"))] = None
 
 
-@cappa.command(invoke="chapter_sync.sync.watch")
+@cappa.command(invoke="chapter_sync.sync.sync")
+@dataclass
+class Sync(SyncOptions):
+    """Sync updates to all series."""
+
+
+@cappa.command(name="watch", invoke="chapter_sync.sync.watch")
 @dataclass
-class Watch(Sync):
+class Watch(SyncOptions):
     """Periodically sync updates to all series."""
 
+    schedule: Annotated[
+        bool,
+        cappa.Arg(long="--schedule/--no-schedule"),
+        Doc(
+            "Only update the series which are due to be checked, according to "
+            "each series' release cadence (Default True)"
+        ),
+    ] = True
+
     interval: Annotated[
         int,
         cappa.Arg(short=True, long=True),
-        Doc("The duration (in seconds) to wait between each sync. Defaults to 3600."),
+        Doc(
+            "The duration (in seconds) to wait between each sync. When scheduling, "
+            "this is the longest wait; the next sync starts as soon as a series "
+            "is due. Defaults to 3600."
+        ),
     ] = 3600
     iterations: Annotated[
         int,
@@ -156,6 +316,22 @@ class Watch(Sync):
             "The number of times to perform a sync. Defaults to 0, which will sync until stopped."
         ),
     ] = 0
+    health_file: Annotated[
+        Path | None,
+        cappa.Arg(long=True, default=cappa.Env("HEALTH_FILE")),
+        Doc(
+            "Continually record the state of the watch process (as JSON) "
+            "in the given file, for external monitoring."
+        ),
+    ] = None
+    metrics_file: Annotated[
+        Path | None,
+        cappa.Arg(long=True, default=cappa.Env("METRICS_FILE")),
+        Doc(
+            "After each sync, write Prometheus metrics to the given file "
+            "(e.g. for node_exporter's textfile collector)."
+        ),
+    ] = None
 
 
 @dataclass
@@ -11,7 +11,7 @@ from typing_extensions import Doc
 class Chapter:
     """A collection of commands for managing chapters."""
 
-    command: cappa.Subcommands[Export | List | Send | Set]
+    command: cappa.Subcommands[Export | List | Search | Send | Set]
 
 
 @cappa.command(invoke="chapter_sync.chapter.export")
@@ -48,6 +48,25 @@ class List:
     series: Annotated[int, Doc("The 'id' of the series to list chapters for.")]
 
 
+@cappa.command(invoke="chapter_sync.chapter.search")
+@dataclass
+class Search:
+    """Search the content of all chapters."""
+
+    query: Annotated[str, Doc("The text to search for.")]
+
+    series: Annotated[
+        int | None,
+        cappa.Arg(short=True, long=True),
+        Doc("Only search chapters of the series with the given 'id'."),
+    ] = None
+    limit: Annotated[
+        int,
+        cappa.Arg(short="n", long=True),
+        Doc("The maximum number of results to show. Defaults to 20."),
+    ] = 20
+
+
 @cappa.command(invoke="chapter_sync.chapter.send")
 @dataclass
 class Send:
@@ -8,13 +8,16 @@ import cappa
 from typing_extensions import Doc
 
 from chapter_sync.handlers import HandlerTypes
+from chapter_sync.images import ImageProfile
 
 
 @dataclass
 class Series:
     """A collection of commands for managing series."""
 
-    command: cappa.Subcommands[Add | Remove | Subscribe | Export | List | Set]
+    command: cappa.Subcommands[
+        Add | Remove | Subscribe | Export | List | Set | Reprocess
+    ]
 
 
 @cappa.command(invoke="chapter_sync.series.add")
@@ -108,7 +111,11 @@ class Subscribe:
 @cappa.command(invoke="chapter_sync.series.export")
 @dataclass
 class Export:
-    """Export the series as a standalone ebook."""
+    """Export the series as a standalone ebook.
+
+    Very long series can instead be split into numbered volumes (one ebook each),
+    by chapter count, size, or the site's own volumes.
+    """
 
     series: Annotated[int, Doc("The 'id' of the series to export")]
 
@@ -126,9 +133,49 @@ class Export:
     force: Annotated[
         bool,
         cappa.Arg(short=True, long=True),
-        Doc("Do not save the resultant epub to the chapter."),
+        Doc(
+            "Rebuild the epub entirely, rather than updating the saved epub (and "
+            "re-split any volumes)."
+        ),
+    ] = False
+
+    volume_chapters: Annotated[
+        int | None,
+        cappa.Arg(long=True),
+        Doc("Split the series into volumes of (at most) this many chapters."),
+    ] = None
+    volume_size: Annotated[
+        int | None,
+        cappa.Arg(long=True),
+        Doc("Split the series into volumes of (roughly) at most this many MB."),
+    ] = None
+    by_volume: Annotated[
+        bool,
+        cappa.Arg(long=True),
+        Doc(
+            "Split the series into the volumes the site groups its chapters by "
+            "(Royal Road only)."
+        ),
     ] = False
 
+    images: Annotated[
+        ImageProfile | None,
+        cappa.Arg(long=True, default=cappa.Env("IMAGES")),
+        Doc(
+            "Embed chapters' images, scaled and recompressed for the given kind "
+            "of device ('eink' or 'tablet')."
+        ),
+    ] = None
+    split_chapters: Annotated[
+        int,
+        cappa.Arg(long=True, default=cappa.Env("SPLIT_CHAPTERS")),
+        Doc(
+            "Split chapters larger than this (in KB) across several files within "
+            "the epub, which many e-readers render far more quickly. 0 disables "
+            "splitting (Default 0)"
+        ),
+    ] = 0
+
 
 @cappa.command(invoke="chapter_sync.series.list_series")
 @dataclass
@@ -167,3 +214,21 @@ class Set:
         cappa.Arg(long=True),
         Doc("Set the settings of the series to a new value."),
     ] = None
+
+
+@cappa.command(invoke="chapter_sync.series.reprocess")
+@dataclass
+class Reprocess:
+    """Re-extract the series' chapters from their saved pages, without refetching.
+
+    Only chapters whose raw page was retained (see `sync --save-pages`) can be
+    reprocessed.
+    """
+
+    series: Annotated[int, Doc("The 'id' of the series to reprocess")]
+
+    workers: Annotated[
+        int | None,
+        cappa.Arg(short="j", long=True),
+        Doc("The number of processes to use. Defaults to the number of CPUs."),
+    ] = None
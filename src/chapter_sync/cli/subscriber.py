@@ -6,6 +6,8 @@ from typing import Annotated
 import cappa
 from typing_extensions import Doc
 
+from chapter_sync.schema import DeliveryMode, DigestPolicy
+
 
 @dataclass
 class Subscriber:
@@ -26,6 +28,23 @@ class Add:
             "Optional subscriber email. This enables the sending of emails on subscriptions."
         ),
     ] = None
+    digest: Annotated[
+        DigestPolicy,
+        cappa.Arg(long=True),
+        Doc(
+            "How often to email the subscriber: 'immediate' sends each update as it's "
+            "found, while 'hourly' or 'daily' bundle all updates into one email "
+            "per period. Defaults to 'immediate'."
+        ),
+    ] = "immediate"
+    delivery: Annotated[
+        DeliveryMode,
+        cappa.Arg(long=True),
+        Doc(
+            "Whether to email the subscriber epubs as attachments, or links to "
+            "download them (see `sync --public-url`). Defaults to 'attachment'."
+        ),
+    ] = "attachment"
 
 
 @cappa.command(invoke="chapter_sync.subscriber.remove")
@@ -54,7 +73,7 @@ class List:
     """List all subscriber in the database."""
 
 
-@cappa.command(invoke="chapter_sync.subscriber.set_subscribers")
+@cappa.command(invoke="chapter_sync.subscriber.set_subscriber")
 @dataclass
 class Set:
     """Change attributes about the chapter manually."""
@@ -66,6 +85,16 @@ class Set:
         cappa.Arg(long=True),
         Doc("Set the email of the subscriber to a new value."),
     ] = None
+    digest: Annotated[
+        DigestPolicy | None,
+        cappa.Arg(long=True),
+        Doc("Set how often to email the subscriber: 'immediate', 'hourly' or 'daily'."),
+    ] = None
+    delivery: Annotated[
+        DeliveryMode | None,
+        cappa.Arg(long=True),
+        Doc("Set how to deliver epubs to the subscriber: 'attachment' or 'link'."),
+    ] = None
 
     series: Annotated[
         list[int] | None,
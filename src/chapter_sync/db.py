@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib.resources
 from typing import Annotated
 
 import alembic.command
@@ -11,11 +12,21 @@ from alembic.script import ScriptDirectory
 from alembic.util import AutogenerateDiffsDetected
 from sqlalchemy import Connection
 
-from chapter_sync.cli.base import alembic_config, console
+from chapter_sync import schema_version
+from chapter_sync.cli.base import console, database_url
 from chapter_sync.cli.db import Revision
 from chapter_sync.console import Console, confirm
 
 
+def alembic_config(database_url: Annotated[str, cappa.Dep(database_url)]) -> Config:
+    migrations = importlib.resources.files("chapter_sync.migrations")
+    alembic_ini = migrations.joinpath("alembic.ini")
+    alembic_cfg = Config(str(alembic_ini))
+    alembic_cfg.set_main_option("sqlalchemy.url", database_url)
+    alembic_cfg.set_main_option("script_location", str(migrations))
+    return alembic_cfg
+
+
 def bootstrap(conn: Connection, alembic_config: Config):
     script = ScriptDirectory.from_config(alembic_config)
     env_context = EnvironmentContext(alembic_config, script)
@@ -24,18 +35,15 @@ def bootstrap(conn: Connection, alembic_config: Config):
     head = env_context.get_head_revision()
     revision = migration_context.get_current_revision()
 
-    if not revision:
-        alembic.command.upgrade(alembic_config, "head")
-        return
-
-    if head == revision:
-        return
+    if revision and head != revision:
+        if not confirm("Database version is out of date, would you like to upgrade?"):
+            raise cappa.Exit("Database must be upgraded! Run `chapter-sync db upgrade`")
 
-    if confirm("Database version is out of date, would you like to upgrade?"):
+    if head != revision:
         alembic.command.upgrade(alembic_config, "head")
-        return
 
-    raise cappa.Exit("Database must be upgraded! Run `chapter-sync db upgrade`")
+    if head:
+        schema_version.cache_head(head)
 
 
 def upgrade(
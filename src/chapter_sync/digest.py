@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+
+from chapter_sync.schema import (
+    Chapter,
+    DigestPolicy,
+    EmailSubscriber,
+    EmailSubscription,
+    as_utc,
+    utcnow,
+)
+
+# The period between each of a subscriber's digests, by policy. "immediate"
+# subscribers are instead sent each block of chapters as it's sent.
+PERIODS: dict[DigestPolicy, timedelta] = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+}
+
+
+def window_start(subscriber: EmailSubscriber) -> datetime:
+    """Find the start of the subscriber's current digest window.
+
+    Their first digest covers the chapters sent since they subscribed.
+    """
+    return as_utc(subscriber.digest_sent_at or subscriber.created_at)
+
+
+def is_due(subscriber: EmailSubscriber, now: datetime | None = None) -> bool:
+    period = PERIODS.get(subscriber.digest)
+    if period is None:
+        return False
+
+    now = now or utcnow()
+    return now - window_start(subscriber) >= period
+
+
+def due(database: Session, now: datetime | None = None) -> Sequence[EmailSubscriber]:
+    """Select the digest subscribers whose digest window has elapsed."""
+    subscribers = database.scalars(
+        select(EmailSubscriber)
+        .where(EmailSubscriber.digest.in_(PERIODS))
+        .where(EmailSubscriber.email.is_not(None))
+        .order_by(EmailSubscriber.id)
+    ).all()
+    return [s for s in subscribers if is_due(s, now)]
+
+
+def pending_chapters(
+    database: Session, subscriber: EmailSubscriber, now: datetime | None = None
+) -> Sequence[Chapter]:
+    """Find the chapters, of all subscribed series, sent within the digest window.
+
+    Chapters are "sent" (see `Chapter.sent_at`) to immediate subscribers as they're
+    collected; digests bundle up everything sent since the last digest.
+    """
+    now = now or utcnow()
+    query = (
+        select(Chapter)
+        .join(EmailSubscription, EmailSubscription.series_id == Chapter.series_id)
+        .where(EmailSubscription.subscriber_id == subscriber.id)
+        .where(Chapter.sent_at > window_start(subscriber))
+        .where(Chapter.sent_at <= now)
+        .options(joinedload(Chapter.series))
+        .order_by(Chapter.series_id, Chapter.number)
+    )
+    return database.scalars(query).all()
+
+
+def record_digest(subscriber: EmailSubscriber, now: datetime | None = None):
+    subscriber.digest_sent_at = now or utcnow()
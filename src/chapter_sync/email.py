@@ -1,10 +1,14 @@
+import contextlib
 import os
 import smtplib
+from collections.abc import Generator, Mapping, Sequence
 from dataclasses import dataclass, field
+from email import policy
 from email.message import EmailMessage
 
 from typing_extensions import Self
 
+from chapter_sync import metrics, trace
 from chapter_sync.console import Console
 
 
@@ -16,6 +20,8 @@ class EmailClient:
     username: str | None = None
     password: str | None = None
 
+    _smtp: smtplib.SMTP | None = field(default=None, init=False, repr=False)
+
     @classmethod
     def from_env(cls, console: Console, environ=os.environ) -> Self:
         host = environ.get("SMTP_HOST")
@@ -23,6 +29,43 @@ class EmailClient:
         password = environ.get("SMTP_PASSWORD")
         return cls(console, host, username, password)
 
+    @property
+    def configured(self) -> bool:
+        return bool(self.host and self.username and self.password)
+
+    @contextlib.contextmanager
+    def connection(self) -> Generator[None, None, None]:
+        """Reuse one (logged in) SMTP connection for every send within the block.
+
+        Outside of a `connection` block, each `send`/`send_all` opens its own.
+        """
+        if self._smtp is not None or not self.configured:
+            yield
+            return
+
+        with self._connect() as smtp:
+            self._smtp = smtp
+            try:
+                yield
+            finally:
+                self._smtp = None
+
+    def _connect(self) -> smtplib.SMTP:
+        assert self.host and self.username and self.password
+        try:
+            smtp = smtplib.SMTP_SSL(self.host)
+        except Exception:
+            metrics.email_send_failures.inc()
+            raise
+
+        try:
+            smtp.login(self.username, self.password)
+        except Exception:
+            metrics.email_send_failures.inc()
+            smtp.close()
+            raise
+        return smtp
+
     def send(
         self,
         *,
@@ -32,29 +75,80 @@ class EmailClient:
         filename: str,
         body: str | None = None,
     ):
-        if not (self.host and self.username and self.password):
+        self.send_all(
+            subject=subject,
+            to=[to],
+            attachment=attachment,
+            filename=filename,
+            body=body,
+        )
+
+    def send_all(
+        self,
+        *,
+        subject: str,
+        to: Sequence[str],
+        attachment: bytes,
+        filename: str,
+        body: str | None = None,
+    ):
+        """Send the same email to each of `to`, individually."""
+        self.send_books(
+            subject=subject,
+            to=to,
+            books={filename: attachment},
+            body=body,
+        )
+
+    def send_books(
+        self,
+        *,
+        subject: str,
+        to: Sequence[str],
+        books: Mapping[str, bytes],
+        body: str | None = None,
+    ):
+        """Send an email, with each of `books` (by filename) attached, to each of `to`.
+
+        The message (and its attachments, which dominate its size) is encoded
+        once; only the `To` header differs between recipients.
+        """
+        if not to:
+            return
+
+        if not self.configured:
             self.console.warn(
                 "Not all of `SMTP_HOST`, `SMTP_USERNAME`, and `SMTP_PASSWORD` "
                 "environment variables are set"
             )
             return
 
-        msg = EmailMessage()
+        msg = EmailMessage(policy=policy.SMTP)
 
         msg["Subject"] = subject
         msg["From"] = self.username
-        msg["To"] = to
 
         if body:
             msg.set_content(body)
 
-        msg.add_attachment(
-            attachment,
-            maintype="application",
-            subtype="epub+zip",
-            filename=filename,
-        )
+        for filename, book in books.items():
+            msg.add_attachment(
+                book,
+                maintype="application",
+                subtype="epub+zip",
+                filename=filename,
+            )
+        payload = msg.as_bytes()
 
-        with smtplib.SMTP_SSL(self.host) as s:
-            s.login(self.username, self.password)
-            s.send_message(msg)
+        with trace.span("email.send", recipients=len(to)), self.connection():
+            assert self._smtp is not None and self.username
+            for recipient in to:
+                header = policy.SMTP.fold("To", recipient).encode()
+                with metrics.email_send_duration.time():
+                    try:
+                        self._smtp.sendmail(
+                            self.username, [recipient], header + payload
+                        )
+                    except Exception:
+                        metrics.email_send_failures.inc()
+                        raise
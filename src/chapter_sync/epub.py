@@ -1,23 +1,37 @@
 from __future__ import annotations
 
+import copy
 import datetime
 import html
 import importlib.resources
+import io
+import mimetypes
 import os.path
+import re
+import struct
+import time
 import unicodedata
 import uuid
 import zipfile
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from io import BytesIO
-from typing import BinaryIO
-
-import xmltodict
+from typing import BinaryIO, TextIO
+from xml.sax import saxutils
 
+from chapter_sync import metrics, trace
 from chapter_sync.cover import generate_cover_image
+from chapter_sync.images import EmbeddedImage, ImageEmbedder, embed, image_urls
 from chapter_sync.schema import Chapter, Series
+from chapter_sync.sections import split_content
 
 templates = importlib.resources.files("chapter_sync.templates")
 
+# The timestamp given to every file of a reproducible epub (the earliest a zip
+# file can record).
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
 
 default_chapter_template = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
 <html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
@@ -32,6 +46,19 @@ default_chapter_template = """<?xml version="1.0" encoding="UTF-8" standalone="n
 </html>
 """
 
+# The sections after the first of a chapter split across several files.
+default_chapter_section_template = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<head>
+    <title>{title}</title>
+    <link rel="stylesheet" type="text/css" href="../Styles/base.css" />
+</head>
+<body>
+{text}
+</body>
+</html>
+"""
+
 default_footnotes_template = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
 <html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
 <head>
@@ -87,7 +114,10 @@ default_cover_template = """<?xml version="1.0" encoding="UTF-8" standalone="no"
 class EpubFile:
     id: str
     path: str
-    contents: str | bytes
+    # `None` for a file which is copied, as is, from the epub being updated.
+    contents: str | bytes | None
+    # Files without a title (e.g. the continuation of a chapter too large for one
+    # file) aren't listed in the table of contents.
     title: str | None = None
     filetype: str = "application/xhtml+xml"
 
@@ -110,9 +140,20 @@ class Epub:
 
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
 
+    # The images embedded in the chapters (see `ImageEmbedder`), and the device
+    # profile they were prepared for; if they were embedded at all.
+    images: list[EpubFile] = field(default_factory=list)
+    image_profile: str | None = None
+    # The size beyond which chapters were split (see `chapter_files`), if at all.
+    max_chapter_size: int = 0
+
+    # Whether identical inputs should produce a byte-identical epub.
+    reproducible: bool = True
+
     frontmatter_template: str = default_frontmatter_template
     cover_template: str = default_cover_template
     chapter_template: str = default_chapter_template
+    chapter_section_template: str = default_chapter_section_template
     footnotes_template: str = default_footnotes_template
 
     mimetype_filename = "mimetype"
@@ -125,11 +166,74 @@ class Epub:
         cls,
         series: Series,
         *chapters: Chapter,
+        reproducible: bool = True,
+        prebuilt: Mapping[int, int] | None = None,
+        title: str | None = None,
+        id: str | None = None,
+        max_chapter_size: int = 0,
+        images: ImageEmbedder | None = None,
+        prebuilt_images: Sequence[str] = (),
     ) -> Epub:
+        """Assemble an epub of (the given chapters of) a series.
+
+        A reproducible epub is dated by its latest chapter, rather than the time
+        it was built; so the same chapters always produce the same epub.
+
+        The epub is titled and identified as the series, unless it's one of
+        several (e.g. a volume) which need a `title` and `id` of their own.
+
+        The `prebuilt` chapters (by number, to their number of files) aren't
+        rendered, but copied from the epub being updated (see `write`'s
+        `load_from`).
+
+        Given a `max_chapter_size`, larger chapters are split across several files
+        (see `split_content`), which e-readers open far more quickly.
+
+        Given an `ImageEmbedder`, the chapters' images are fetched and embedded,
+        rather than left as remote links. The `prebuilt_images` (by filename)
+        are those the prebuilt chapters embed.
+        """
+        if reproducible:
+            downloaded = max((c.published_at for c in chapters), default="Unknown")
+        else:
+            downloaded = datetime.datetime.now()
+
+        prebuilt = prebuilt or {}
+
+        prepared: dict[str, EmbeddedImage] = {}
+        if images is not None:
+            prepared = images.prepare(
+                url
+                for chapter in chapters
+                if chapter.number not in prebuilt
+                for url in image_urls(chapter.content, chapter.url)
+            )
+
+        image_files = {
+            filename: EpubFile(
+                id=f"image_{filename.split('.')[0]}",
+                path=f"images/{filename}",
+                contents=None,
+                filetype=mimetypes.guess_type(filename)[0] or "image/jpeg",
+            )
+            for filename in prebuilt_images
+        }
+        for image in prepared.values():
+            image_files.setdefault(
+                image.filename,
+                EpubFile(
+                    id=f"image_{image.hash[:16]}",
+                    path=f"images/{image.filename}",
+                    contents=image.data,
+                    filetype=image.media_type,
+                ),
+            )
+
         return cls(
-            title=series.title,
+            title=title or series.title,
             author=series.author or "Unknown",
-            id=str(series.id),
+            id=id or str(series.id),
+            reproducible=reproducible,
             cover=EpubFile(
                 id="cover_html",
                 title="Cover",
@@ -156,7 +260,7 @@ class Epub:
                 title="Front Matter",
                 path="frontmatter.html",
                 contents=cls.frontmatter_template.format(
-                    downloaded=datetime.datetime.now(),
+                    downloaded=downloaded,
                     started=series.created_at or "Unknown",
                     updated=series.last_built_at or "Unknown",
                     title=series.title,
@@ -170,33 +274,83 @@ class Epub:
                 filetype="text/css",
             ),
             chapters=[
-                EpubFile(
-                    id=f"chapter_{chapter.number}",
-                    title=chapter.title,
-                    path=f"chapter/{chapter.number}.html",
-                    contents=cls.chapter_template.format(
-                        title=normalize(chapter.title, escape_html=True),
-                        text=normalize(chapter.content),
-                    ),
-                )
+                file
                 for chapter in chapters
+                for file in cls.chapter_files(
+                    chapter,
+                    sections=prebuilt.get(chapter.number),
+                    max_size=max_chapter_size,
+                    images=prepared,
+                )
             ],
+            images=[image_files[name] for name in sorted(image_files)],
+            image_profile=images.profile.name if images is not None else None,
+            max_chapter_size=max_chapter_size,
         )
 
+    @classmethod
+    def chapter_files(
+        cls,
+        chapter: Chapter,
+        *,
+        sections: int | None = None,
+        max_size: int = 0,
+        images: Mapping[str, EmbeddedImage] | None = None,
+    ) -> list[EpubFile]:
+        """Render a chapter as one file; or several, if it's larger than a `max_size`.
+
+        Only the first file is listed in the table of contents. Given a number of
+        `sections`, the (prebuilt) chapter's files are copied instead. Any of the
+        chapter's `images` (by url) are pointed at their embedded file.
+        """
+
+        def name(section: int) -> str:
+            if section == 1:
+                return f"{chapter.number}.html"
+            return f"{chapter.number}-{section}.html"
+
+        def file(section: int, contents: str | None) -> EpubFile:
+            suffix = "" if section == 1 else f"_{section}"
+            return EpubFile(
+                id=f"chapter_{chapter.number}{suffix}",
+                title=chapter.title if section == 1 else None,
+                path=f"chapter/{name(section)}",
+                contents=contents,
+            )
+
+        if sections is not None:
+            return [file(section, None) for section in range(1, sections + 1)]
+
+        title = normalize(chapter.title, escape_html=True)
+        texts = [normalize(chapter.content)]
+        if images:
+            texts = [embed(texts[0], chapter.url, images, prefix="../images/")]
+        if max_size:
+            texts = split_content(texts[0], max_size, name)
+
+        files = [file(1, cls.chapter_template.format(title=title, text=texts[0]))]
+        for section, text in enumerate(texts[1:], start=2):
+            contents = cls.chapter_section_template.format(title=title, text=text)
+            files.append(file(section, contents))
+        return files
+
     def write_buffer(self):
         buffer = BytesIO()
         self.write(buffer)
         buffer.seek(0)
         return buffer
 
+    @trace.traced("epub.write")
     def write(
         self,
         output_file: str | BinaryIO | None = None,
         *,
-        load_from: str | None = None,
+        load_from: str | BinaryIO | None = None,
         output_dir: str | None = None,
         compress: bool = True,
     ):
+        start = time.perf_counter()
+
         if output_file is None:
             output_file = self.title + ".epub"
 
@@ -204,7 +358,7 @@ class Epub:
             output_file = os.path.join(output_dir, output_file)
 
         from_zf = None
-        if load_from:
+        if load_from is not None:
             from_zf = zipfile.ZipFile(
                 load_from,
                 "r",
@@ -217,10 +371,26 @@ class Epub:
             compression=compress and zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED,
         )
 
-        self.write_mimetype(to_zf, from_zf=from_zf)
-        self.write_container(to_zf, from_zf=from_zf)
-        self.write_toc_ncx(to_zf, self.id, self.title, self.author, from_zf=from_zf)
-        self.write_content_opf(to_zf, self.id, self.title, self.author, from_zf=from_zf)
+        date_time = REPRODUCIBLE_DATE_TIME if self.reproducible else None
+
+        self.write_mimetype(to_zf, from_zf=from_zf, date_time=date_time)
+        self.write_container(to_zf, from_zf=from_zf, date_time=date_time)
+        self.write_toc_ncx(
+            to_zf,
+            self.id,
+            self.title,
+            self.author,
+            from_zf=from_zf,
+            date_time=date_time,
+        )
+        self.write_content_opf(
+            to_zf,
+            self.id,
+            self.title,
+            self.author,
+            from_zf=from_zf,
+            date_time=date_time,
+        )
 
         content_files = [
             self.cover,
@@ -229,16 +399,39 @@ class Epub:
             self.footnotes,
             self.style,
             *self.chapters,
+            *self.images,
         ]
         for file in content_files:
-            to_zf.writestr("OEBPS/" + file.path, file.contents)
+            filename = "OEBPS/" + file.path
+            if file.contents is None:
+                if from_zf is None:
+                    raise ValueError(f"No epub to copy '{filename}' from")
+                copy_member(from_zf, to_zf, filename)
+            else:
+                write_content(
+                    to_zf, filename, content=file.contents, date_time=date_time
+                )
+
+        self.replicate_other_files(to_zf, from_zf, date_time=date_time)
 
-        self.replicate_other_files(to_zf, from_zf)
+        to_zf.close()
+        if from_zf:
+            from_zf.close()
+
+        metrics.epub_build_duration.observe(time.perf_counter() - start)
+        if isinstance(output_file, str):
+            metrics.epub_size.observe(os.path.getsize(output_file))
+        elif output_file.seekable():
+            metrics.epub_size.observe(output_file.tell())
 
         return to_zf.filename
 
     def write_mimetype(
-        self, zf: zipfile.ZipFile, *, from_zf: zipfile.ZipFile | None = None
+        self,
+        zf: zipfile.ZipFile,
+        *,
+        from_zf: zipfile.ZipFile | None = None,
+        date_time: tuple[int, ...] | None = None,
     ):
         """Write the mimetype file.
 
@@ -250,10 +443,15 @@ class Epub:
             content="application/epub+zip",
             compress_type=zipfile.ZIP_STORED,
             from_zf=from_zf,
+            date_time=date_time,
         )
 
     def write_container(
-        self, zf: zipfile.ZipFile, *, from_zf: zipfile.ZipFile | None = None
+        self,
+        zf: zipfile.ZipFile,
+        *,
+        from_zf: zipfile.ZipFile | None = None,
+        date_time: tuple[int, ...] | None = None,
     ):
         """We need an index file, that lists all other HTML files.
 
@@ -277,6 +475,7 @@ class Epub:
             content=container_xml,
             compress_type=zipfile.ZIP_STORED,
             from_zf=from_zf,
+            date_time=date_time,
         )
 
     def write_toc_ncx(
@@ -287,18 +486,43 @@ class Epub:
         author: str,
         *,
         from_zf: zipfile.ZipFile | None = None,
+        date_time: tuple[int, ...] | None = None,
     ):
-        toc_ncx = {
+        with write_xml(zf, self.toc_ncx_filename, date_time=date_time) as xml:
+            with xml.element(
+                "ncx",
+                {
+                    "xmlns": "http://www.daisy.org/z3986/2005/ncx/",
+                    "version": "2005-1",
+                    "xml:lang": "en-US",
+                },
+            ):
+                with xml.element("head"):
+                    xml.leaf("meta", attrs={"name": "dtb:uid", "content": id})
+                with xml.element("docTitle"):
+                    xml.leaf("text", title)
+                with xml.element("docAuthor"):
+                    xml.leaf("text", author)
+
+                with xml.element("navMap"):
+                    for file in self.toc_files():
+                        with xml.element("navPoint", {"class": "h1", "id": file.id}):
+                            with xml.element("navLabel"):
+                                xml.leaf("text", file.title)
+                            xml.leaf("content", attrs={"src": file.path})
+
+    def toc_ncx_dict(self, id: str, title: str, author: str) -> dict:
+        """Return the table of contents, as `xmltodict.unparse` would write it.
+
+        `write_toc_ncx` used to build (and write) this dict, and is checked and
+        benchmarked against it.
+        """
+        return {
             "ncx": {
                 "@xmlns": "http://www.daisy.org/z3986/2005/ncx/",
                 "@version": "2005-1",
                 "@xml:lang": "en-US",
-                "head": {
-                    "meta": {
-                        "@name": "dtb:uid",
-                        "@content": id,
-                    },
-                },
+                "head": {"meta": {"@name": "dtb:uid", "@content": id}},
                 "docTitle": {"text": title},
                 "docAuthor": {"text": author},
                 "navMap": {
@@ -309,22 +533,20 @@ class Epub:
                             "navLabel": {"text": file.title},
                             "content": {"@src": file.path},
                         }
-                        for file in [
-                            self.cover,
-                            self.frontmatter,
-                            *self.chapters,
-                            self.footnotes,
-                        ]
+                        for file in self.toc_files()
                     ]
                 },
             }
         }
-        write_content(
-            zf,
-            self.toc_ncx_filename,
-            content=toc_ncx,
-            from_zf=from_zf,
-        )
+
+    def toc_files(self) -> list[EpubFile]:
+        # Only the first part of a split chapter has a title, and an entry.
+        return [
+            self.cover,
+            self.frontmatter,
+            *(c for c in self.chapters if c.title is not None),
+            self.footnotes,
+        ]
 
     def write_content_opf(
         self,
@@ -333,99 +555,83 @@ class Epub:
         title: str,
         author: str,
         from_zf: zipfile.ZipFile | None = None,
+        date_time: tuple[int, ...] | None = None,
     ):
-        chapters = [
-            {
-                "@id": file.id,
-                "@href": file.path,
-                "@media-type": "application/xhtml+xml",
-            }
-            for file in self.chapters
+        manifest = [
+            ("cover_html", "cover.html", "application/xhtml+xml"),
+            ("cover_image", "images/cover.png", "image/png"),
+            *((file.id, file.path, file.filetype) for file in self.chapters),
+            *((file.id, file.path, file.filetype) for file in self.images),
+            ("footnotes", "footnotes.html", "application/xhtml+xml"),
+            ("frontmatter", "frontmatter.html", "application/xhtml+xml"),
+            ("style", "Styles/base.css", "text/css"),
+            ("ncx", "toc.ncx", "application/x-dtbncx+xml"),
         ]
-        spine_items = [{"@idref": file.id} for file in self.chapters]
-
-        content_opf = {
-            "package": {
-                "@version": "2.0",
-                "@xmlns": "http://www.idpf.org/2007/opf",
-                "@unique-identifier": "book_identifier",
-                "metadata": {
-                    "@xmlns:dc": "http://purl.org/dc/elements/1.1/",
-                    "@xmlns:opf": "http://www.idpf.org/2007/opf",
-                    "dc:identifier": {
-                        "@id": "book_identifier",
-                        "#text": id,
-                    },
-                    "dc:title": title,
-                    "dc:language": "en",
-                    "dc:creator": {"@opf:role": "aut", "#text": author},
-                    "meta": [
-                        {"@name": "generator", "@content": "chapter-sync"},
-                        {"@name": "cover", "@content": "cover_image"},
-                    ],
-                },
-                "manifest": {
-                    "item": [
-                        {
-                            "@id": "cover_html",
-                            "@href": "cover.html",
-                            "@media-type": "application/xhtml+xml",
-                        },
-                        {
-                            "@id": "cover_image",
-                            "@href": "images/cover.png",
-                            "@media-type": "image/png",
-                        },
-                        *chapters,
-                        {
-                            "@id": "footnotes",
-                            "@href": "footnotes.html",
-                            "@media-type": "application/xhtml+xml",
-                        },
-                        {
-                            "@id": "frontmatter",
-                            "@href": "frontmatter.html",
-                            "@media-type": "application/xhtml+xml",
-                        },
-                        {
-                            "@id": "style",
-                            "@href": "Styles/base.css",
-                            "@media-type": "text/css",
-                        },
-                        {
-                            "@id": "ncx",
-                            "@href": "toc.ncx",
-                            "@media-type": "application/x-dtbncx+xml",
-                        },
-                    ]
-                },
-                "spine": {
-                    "@toc": "ncx",
-                    "itemref": [
-                        {"@idref": "cover_html", "@linear": "no"},
-                        {"@idref": "frontmatter", "@linear": "no"},
-                        *spine_items,
-                        {"@idref": "footnotes", "@linear": "no"},
-                    ],
-                },
-                "guide": {
-                    "reference": {
-                        "@type": "cover",
-                        "@title": "Cover",
-                        "@href": "cover.html",
-                    }
+        spine = [
+            ("cover_html", "no"),
+            ("frontmatter", "no"),
+            *((file.id, None) for file in self.chapters),
+            ("footnotes", "no"),
+        ]
+
+        with write_xml(zf, self.content_opf_filename, date_time=date_time) as xml:
+            with xml.element(
+                "package",
+                {
+                    "version": "2.0",
+                    "xmlns": "http://www.idpf.org/2007/opf",
+                    "unique-identifier": "book_identifier",
                 },
-            }
-        }
-        write_content(
-            zf,
-            self.content_opf_filename,
-            content=content_opf,
-            from_zf=from_zf,
-        )
+            ):
+                with xml.element(
+                    "metadata",
+                    {
+                        "xmlns:dc": "http://purl.org/dc/elements/1.1/",
+                        "xmlns:opf": "http://www.idpf.org/2007/opf",
+                    },
+                ):
+                    xml.leaf("dc:identifier", id, attrs={"id": "book_identifier"})
+                    xml.leaf("dc:title", title)
+                    xml.leaf("dc:language", "en")
+                    xml.leaf("dc:creator", author, attrs={"opf:role": "aut"})
+                    xml.leaf(
+                        "meta", attrs={"name": "generator", "content": "chapter-sync"}
+                    )
+                    xml.leaf("meta", attrs={"name": "cover", "content": "cover_image"})
+                    options = build_options(self.image_profile, self.max_chapter_size)
+                    for name, value in options.items():
+                        xml.leaf("meta", attrs={"name": name, "content": value})
+
+                with xml.element("manifest"):
+                    for item_id, href, media_type in manifest:
+                        xml.leaf(
+                            "item",
+                            attrs={
+                                "id": item_id,
+                                "href": href,
+                                "media-type": media_type,
+                            },
+                        )
+
+                with xml.element("spine", {"toc": "ncx"}):
+                    for idref, linear in spine:
+                        attrs = {"idref": idref}
+                        if linear is not None:
+                            attrs["linear"] = linear
+                        xml.leaf("itemref", attrs=attrs)
+
+                with xml.element("guide"):
+                    xml.leaf(
+                        "reference",
+                        attrs={"type": "cover", "title": "Cover", "href": "cover.html"},
+                    )
 
     def replicate_other_files(
-        self, zf: zipfile.ZipFile, from_zf: zipfile.ZipFile | None = None
+        self,
+        zf: zipfile.ZipFile,
+        from_zf: zipfile.ZipFile | None = None,
+        *,
+        date_time: tuple[int, ...] | None = None,
     ):
         """Add files from the `from_zf` to the destination oneself.
 
@@ -438,34 +644,265 @@ class Epub:
         files = set(zf.namelist())
         from_files = set(from_zf.namelist())
         missing_files = from_files - files
-        for missing_file in missing_files:
-            zf.writestr(missing_file, from_zf.read(missing_file))
+        for missing_file in sorted(missing_files):
+            copy_member(from_zf, zf, missing_file)
 
 
 def write_content(
     zf: zipfile.ZipFile,
     filename: str,
     *,
-    content: str | dict,
+    content: str | bytes | dict,
     compress_type=None,
     from_zf: zipfile.ZipFile | None = None,
     full_document: bool = True,
+    date_time: tuple[int, ...] | None = None,
 ):
     # existing_content_str = None
     # if from_zf:
     #     existing_content_str = from_zf.read(filename)
 
-    if isinstance(content, str):
-        zf.writestr(filename, content, compress_type=compress_type)
+    if isinstance(content, dict):
+        # Only the (tiny) container is still written from a dict; the large
+        # documents are streamed by `XmlWriter`.
+        import xmltodict
 
-    elif isinstance(content, dict):
         # existing_content = xmltodict.parse(existing_content_str)
 
-        content_str = xmltodict.unparse(
+        content = xmltodict.unparse(
             content, pretty=True, indent="  ", full_document=full_document
         )
 
-        zf.writestr(filename, content_str, compress_type=compress_type)
+    zf.writestr(zip_info(zf, filename, date_time), content, compress_type=compress_type)
+
+
+def zip_info(
+    zf: zipfile.ZipFile, filename: str, date_time: tuple[int, ...] | None = None
+) -> zipfile.ZipInfo:
+    """Describe a file to be written, timestamped `date_time` (rather than now)."""
+    if date_time is None:
+        date_time = time.localtime(time.time())[:6]
+
+    info = zipfile.ZipInfo(filename, date_time=date_time)
+    # As `ZipFile.writestr` would, given only the filename.
+    info.compress_type = zf.compression
+    info.external_attr = 0o600 << 16
+    return info
+
+
+@contextmanager
+def write_xml(
+    zf: zipfile.ZipFile, filename: str, *, date_time: tuple[int, ...] | None = None
+) -> Iterator[XmlWriter]:
+    """Stream an XML document directly into a new file of the zip file."""
+    with io.TextIOWrapper(
+        zf.open(zip_info(zf, filename, date_time), "w"), encoding="utf-8", newline="\n"
+    ) as stream:
+        xml = XmlWriter(stream)
+        xml.declaration()
+        yield xml
+
+
+@dataclass
+class XmlWriter:
+    """Write a pretty-printed XML document, an element at a time.
+
+    Large documents (the table of contents and manifest of a long series) are
+    never assembled in memory. The output is the same as `xmltodict.unparse`
+    (with `pretty=True` and a two space indent) would produce for the equivalent
+    dict, so switching between them doesn't change an epub.
+    """
+
+    stream: TextIO
+    indent: str = "  "
+    depth: int = 0
+
+    def declaration(self):
+        self.stream.write('<?xml version="1.0" encoding="utf-8"?>\n')
+
+    @contextmanager
+    def element(self, tag: str, attrs: dict[str, str] | None = None):
+        """Write an element, whose children are written within the context."""
+        self.stream.write(f"{self.indent * self.depth}<{tag}{_attrs(attrs)}>\n")
+        self.depth += 1
+        yield
+        self.depth -= 1
+        self.stream.write(f"{self.indent * self.depth}</{tag}>")
+        if self.depth:
+            self.stream.write("\n")
+
+    def leaf(
+        self, tag: str, text: str | None = None, attrs: dict[str, str] | None = None
+    ):
+        """Write an element without children."""
+        self.stream.write(
+            f"{self.indent * self.depth}<{tag}{_attrs(attrs)}>"
+            f"{_escape(text or '')}</{tag}>"
+        )
+        if self.depth:
+            self.stream.write("\n")
+
+
+def _attrs(attrs: dict[str, str] | None) -> str:
+    if not attrs:
+        return ""
+    return "".join(f" {k}={_quoteattr(v)}" for k, v in attrs.items())
+
+
+# Most values (ids, paths, and the like) need no escaping, and checking is far
+# cheaper than `saxutils` escaping them regardless.
+_SPECIAL_CHARACTERS = re.compile("[&<>\"'\n\r\t]")
+
+
+def _escape(value: str) -> str:
+    if _SPECIAL_CHARACTERS.search(value) is None:
+        return value
+    return saxutils.escape(value)
+
+
+def _quoteattr(value: str) -> str:
+    if _SPECIAL_CHARACTERS.search(value) is None:
+        return f'"{value}"'
+    return saxutils.quoteattr(value)
+
+
+def copy_member(from_zf: zipfile.ZipFile, to_zf: zipfile.ZipFile, filename: str):
+    """Copy a file between zip files as is, i.e. without recompressing it.
+
+    `zipfile` has no public means of doing so, so the member's local header and
+    (compressed) data are written directly, as `ZipFile.writestr` would.
+    """
+    info = from_zf.getinfo(filename)
+
+    assert from_zf.fp is not None
+    from_zf.fp.seek(info.header_offset)
+    header = struct.unpack(
+        zipfile.structFileHeader, from_zf.fp.read(zipfile.sizeFileHeader)
+    )
+    from_zf.fp.seek(
+        header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH],
+        os.SEEK_CUR,
+    )
+    data = from_zf.fp.read(info.compress_size)
+
+    copied = copy.copy(info)
+    # The sizes and CRC are known up front, so there's no trailing data descriptor.
+    copied.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+
+    assert to_zf.fp is not None
+    with to_zf._lock:
+        copied.header_offset = to_zf.fp.tell()
+        to_zf.fp.write(copied.FileHeader())
+        to_zf.fp.write(data)
+
+        to_zf.filelist.append(copied)
+        to_zf.NameToInfo[copied.filename] = copied
+        to_zf.start_dir = to_zf.fp.tell()
+        to_zf._didModify = True
+
+
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+_CHAPTER_PATH = re.compile(r"OEBPS/chapter/(\d+)(?:-(\d+))?\.html")
+# Embedded chapter images, as opposed to the cover.
+_IMAGE_PATH = re.compile(r"OEBPS/images/(?!cover\.png$)([^/]+)")
+
+# Record the device profile an epub's images were prepared for, and the size
+# beyond which its chapters were split; if either.
+IMAGE_PROFILE_META = "chapter-sync:images"
+SPLIT_META = "chapter-sync:split"
+_BUILD_OPTION = re.compile(r'<meta name="(chapter-sync:[a-z]+)" content="([^"]*)"')
+
+
+def build_options(image_profile: str | None, max_chapter_size: int) -> dict[str, str]:
+    """Describe how an epub is built, as recorded in its metadata."""
+    options = {}
+    if image_profile is not None:
+        options[IMAGE_PROFILE_META] = image_profile
+    if max_chapter_size:
+        options[SPLIT_META] = str(max_chapter_size)
+    return options
+
+
+def epub_build_options(ebook: bytes) -> dict[str, str]:
+    """Return how an (existing) epub was built (see `build_options`).
+
+    An epub built differently (e.g. for another image profile, or with/without
+    images at all) can't be reused as is.
+    """
+    try:
+        with zipfile.ZipFile(BytesIO(ebook)) as zf:
+            opf = zf.read(Epub.content_opf_filename).decode()
+    except (zipfile.BadZipFile, KeyError):
+        # Not an epub this built, so certainly built without any options.
+        return {}
+
+    return {name: html.unescape(value) for name, value in _BUILD_OPTION.findall(opf)}
+
+
+def image_profile(ebook: bytes) -> str | None:
+    """Return the device profile an epub's images were embedded for, if any."""
+    return epub_build_options(ebook).get(IMAGE_PROFILE_META)
+
+
+def series_epub(
+    series: Series,
+    chapters: Sequence[Chapter],
+    existing: bytes | None = None,
+    *,
+    title: str | None = None,
+    id: str | None = None,
+    images: ImageEmbedder | None = None,
+    max_chapter_size: int = 0,
+) -> bytes:
+    """Build the epub of a series' chapters; updating its `existing` epub, if any.
+
+    The chapters already in the existing epub are copied (still compressed) from
+    it, so only the new chapters (and the table of contents) are built; and,
+    because epubs are reproducible, the result is identical to a full rebuild.
+    The existing epub is only discarded if it includes chapters which no longer
+    exist, or it was built differently (its images embedded for a different
+    profile than `images`', or its chapters split at another size).
+    """
+    profile = images.profile.name if images is not None else None
+    options = build_options(profile, max_chapter_size)
+    if existing is not None and epub_build_options(existing) != options:
+        existing = None
+
+    # The number of files of each chapter (see `Epub.chapter_files`).
+    prebuilt: dict[int, int] = {}
+    prebuilt_images: list[str] = []
+    if existing is not None:
+        with zipfile.ZipFile(BytesIO(existing)) as zf:
+            for name in zf.namelist():
+                if match := _CHAPTER_PATH.fullmatch(name):
+                    number = int(match.group(1))
+                    section = int(match.group(2) or 1)
+                    prebuilt[number] = max(prebuilt.get(number, 0), section)
+                elif match := _IMAGE_PATH.fullmatch(name):
+                    prebuilt_images.append(match.group(1))
+
+    numbers = {c.number for c in chapters}
+    if existing is not None and prebuilt.keys() == numbers:
+        return existing
+    if not prebuilt.keys() <= numbers:
+        existing = None
+        prebuilt = {}
+        prebuilt_images = []
+
+    buffer = BytesIO()
+    epub = Epub.from_series(
+        series,
+        *chapters,
+        prebuilt=prebuilt,
+        title=title,
+        id=id,
+        max_chapter_size=max_chapter_size,
+        images=images,
+        prebuilt_images=prebuilt_images,
+    )
+    epub.write(buffer, load_from=BytesIO(existing) if existing is not None else None)
+    return buffer.getvalue()
 
 
 def normalize(value: str, escape_html: bool = False):
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections.abc import Callable, Collection, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from chapter_sync.console import Console
+from chapter_sync.handlers import ChapterLink
+from chapter_sync.retry import CircuitOpenError, RetryLaterError, deferred_retries
+from chapter_sync.schema import Chapter, FrontierEntry, as_utc, utcnow
+
+# A claimed entry whose worker hasn't finished with it within this long (i.e.
+# it was killed) may be claimed by another worker.
+LEASE = timedelta(minutes=10)
+
+# Entries which have failed this many times are left in place (along with their
+# last error), but are no longer attempted.
+MAX_ATTEMPTS = 5
+
+
+def enqueue(database: Session, series_id: int, links: Iterable[ChapterLink]) -> int:
+    """Add newly discovered chapters to the frontier, ignoring known urls."""
+    known = set(
+        database.scalars(
+            select(FrontierEntry.url).where(FrontierEntry.series_id == series_id)
+        )
+    )
+
+    count = 0
+    for link in links:
+        if link.url in known:
+            continue
+
+        database.add(
+            FrontierEntry(
+                series_id=series_id,
+                url=link.url,
+                title=link.title,
+                number=link.number,
+                volume_id=link.volume_id,
+            )
+        )
+        known.add(link.url)
+        count += 1
+
+    database.commit()
+    return count
+
+
+def claim(
+    database: Session, series_id: int, worker: str, *, exclude: Collection[int] = ()
+) -> FrontierEntry | None:
+    """Claim the lowest-numbered available entry of a series, if any.
+
+    The claim is made with a conditional update, so that concurrent workers
+    racing for the same entry can't both succeed.
+    """
+    now = utcnow()
+    available = or_(
+        FrontierEntry.claimed_at.is_(None), FrontierEntry.claimed_at < now - LEASE
+    )
+
+    candidates = database.scalars(
+        select(FrontierEntry.id)
+        .where(
+            FrontierEntry.series_id == series_id,
+            FrontierEntry.attempts < MAX_ATTEMPTS,
+            FrontierEntry.id.not_in(exclude),
+            or_(FrontierEntry.retry_at.is_(None), FrontierEntry.retry_at <= now),
+            available,
+        )
+        .order_by(FrontierEntry.number)
+        .limit(10)
+    ).all()
+
+    for id in candidates:
+        result = database.execute(
+            update(FrontierEntry)
+            .where(FrontierEntry.id == id, available)
+            .values(claimed_by=worker, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        database.commit()
+
+        if result.rowcount == 1:  # type: ignore
+            return database.get(FrontierEntry, id, populate_existing=True)
+
+    return None
+
+
+def release(
+    database: Session,
+    entry: FrontierEntry,
+    error: str | None = None,
+    *,
+    retry_at: datetime | None = None,
+):
+    """Give up a claim on an entry, recording the failed attempt (if any).
+
+    An entry given a `retry_at` isn't claimable again until then.
+    """
+    if error is not None:
+        entry.attempts += 1
+        entry.last_error = error
+
+    entry.retry_at = retry_at
+    entry.claimed_by = None
+    entry.claimed_at = None
+    database.commit()
+
+
+def complete(database: Session, entry: FrontierEntry, chapter: Chapter):
+    """Store a collected chapter, and remove its entry from the frontier."""
+    database.add(chapter)
+    database.delete(entry)
+    database.commit()
+
+
+def next_retry(
+    database: Session, series_id: int, *, exclude: Collection[int] = ()
+) -> datetime | None:
+    """Return when the soonest of a series' rescheduled entries may be retried."""
+    return database.scalar(
+        select(func.min(FrontierEntry.retry_at)).where(
+            FrontierEntry.series_id == series_id,
+            FrontierEntry.attempts < MAX_ATTEMPTS,
+            FrontierEntry.id.not_in(exclude),
+        )
+    )
+
+
+def drain(
+    database: Session,
+    series_id: int,
+    collect: Callable[[ChapterLink], Chapter | None],
+    *,
+    console: Console,
+    workers: int = 1,
+    stop: threading.Event | None = None,
+) -> int:
+    """Collect every available entry of a series, returning the number collected.
+
+    Because each entry is claimed before it's collected, several workers (whether
+    threads, or entirely separate processes) can drain the same series at once.
+    `collect` is called from up to `workers` threads at a time, and so must not
+    touch `database`; chapters are stored (one commit per chapter) as they complete.
+
+    A fetch which should be retried (see `RetryLaterError`) is rescheduled, rather
+    than its worker waiting to retry it; other entries are collected meanwhile.
+    """
+    worker = uuid4().hex
+    claimed: dict[Future, FrontierEntry] = {}
+    # Entries which fail are retried on a later drain, rather than immediately.
+    failed: set[int] = set()
+    count = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                # Once stopped, in-flight chapters are completed, but no more
+                # are claimed.
+                while len(claimed) < workers and not (stop and stop.is_set()):
+                    entry = claim(database, series_id, worker, exclude=failed)
+                    if entry is None:
+                        break
+
+                    link = ChapterLink(
+                        entry.url, entry.title, entry.number, entry.volume_id
+                    )
+                    # Run in a copy of this context, so the worker's spans are
+                    # nested under this one.
+                    context = contextvars.copy_context()
+                    claimed[
+                        executor.submit(
+                            context.run, _attempt, collect, link, entry.attempts
+                        )
+                    ] = entry
+
+                if not claimed:
+                    # Only rescheduled entries remain (if any), so wait for the
+                    # soonest of them.
+                    retry_at = next_retry(database, series_id, exclude=failed)
+                    if retry_at is None or (stop and stop.is_set()):
+                        break
+
+                    delay = (as_utc(retry_at) - utcnow()).total_seconds()
+                    if stop:
+                        stop.wait(max(delay, 0))
+                    else:
+                        time.sleep(max(delay, 0))
+                    continue
+
+                done, _ = wait(claimed, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = claimed.pop(future)
+                    url = entry.url
+
+                    try:
+                        chapter = future.result()
+                        if chapter is None:
+                            raise RuntimeError("No content found")
+
+                        complete(database, entry, chapter)
+                    except CircuitOpenError:
+                        # Not the entry's fault; it's left for a later drain.
+                        release(database, entry)
+                        raise
+                    except RetryLaterError as e:
+                        console.trace(f"Rescheduled '{url}': {e}")
+                        retry_at = utcnow() + timedelta(seconds=e.delay)
+                        release(database, entry, str(e), retry_at=retry_at)
+                        continue
+                    except IntegrityError as e:
+                        database.rollback()
+                        error = str(e.orig)
+                    except Exception as e:
+                        error = repr(e)
+                    else:
+                        count += 1
+                        continue
+
+                    console.warn(f"Failed to collect '{url}': {error}")
+                    release(database, entry, error)
+                    failed.add(entry.id)
+        finally:
+            for entry in claimed.values():
+                release(database, entry)
+
+    return count
+
+
+def _attempt(
+    collect: Callable[[ChapterLink], Chapter | None], link: ChapterLink, attempts: int
+) -> Chapter | None:
+    with deferred_retries(attempts):
+        return collect(link)
@@ -1,15 +1,25 @@
 from chapter_sync.handlers.base import (
+    ChapterLink,
     HandlerTypes,
     detect,
     get_chapter_handler,
+    get_collect_handler,
+    get_discover_handler,
     get_infer_handler,
+    get_refresh_handler,
+    get_reprocess_handler,
     get_settings_handler,
 )
 
 __all__ = [
     "get_settings_handler",
     "get_chapter_handler",
+    "ChapterLink",
     "HandlerTypes",
     "detect",
+    "get_collect_handler",
+    "get_discover_handler",
     "get_infer_handler",
+    "get_refresh_handler",
+    "get_reprocess_handler",
 ]
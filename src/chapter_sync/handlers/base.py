@@ -1,6 +1,7 @@
 import functools
 import json
 from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Literal, TypeAlias
 
 import cappa
@@ -8,6 +9,16 @@ import cappa
 HandlerTypes: TypeAlias = Literal["custom", "royal-road"]
 
 
+@dataclass
+class ChapterLink:
+    """A discovered, but not yet collected, chapter."""
+
+    url: str
+    title: str | None
+    number: int
+    volume_id: str | None = None
+
+
 def detect(url: str) -> HandlerTypes:
     from chapter_sync.handlers import royal_road
 
@@ -60,6 +71,46 @@ def get_chapter_handler(type: HandlerTypes) -> Callable:
     return chapter_handlers[type]
 
 
+def get_discover_handler(type: HandlerTypes) -> Callable:
+    from chapter_sync.handlers import custom, royal_road
+
+    discover_handlers: dict[HandlerTypes, Callable] = {
+        "custom": custom.discover_handler,
+        "royal-road": royal_road.discover_handler,
+    }
+    return discover_handlers[type]
+
+
+def get_collect_handler(type: HandlerTypes) -> Callable:
+    from chapter_sync.handlers import custom, royal_road
+
+    collect_handlers: dict[HandlerTypes, Callable] = {
+        "custom": custom.collect_handler,
+        "royal-road": royal_road.collect_handler,
+    }
+    return collect_handlers[type]
+
+
+def get_refresh_handler(type: HandlerTypes) -> Callable:
+    from chapter_sync.handlers import custom, royal_road
+
+    refresh_handlers: dict[HandlerTypes, Callable] = {
+        "custom": custom.refresh_handler,
+        "royal-road": royal_road.refresh_handler,
+    }
+    return refresh_handlers[type]
+
+
+def get_reprocess_handler(type: HandlerTypes) -> Callable:
+    from chapter_sync.handlers import custom, royal_road
+
+    reprocess_handlers: dict[HandlerTypes, Callable] = {
+        "custom": custom.reprocess_handler,
+        "royal-road": royal_road.reprocess_handler,
+    }
+    return reprocess_handlers[type]
+
+
 def _settings_loader(handler):
     @functools.wraps(handler)
     def wrapper(content: str | None):
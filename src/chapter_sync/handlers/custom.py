@@ -1,18 +1,22 @@
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 import cappa
+from bs4 import BeautifulSoup
 from pendulum import now
 from requests import Session
 
+from chapter_sync import trace
+from chapter_sync.clean import Cleaner
 from chapter_sync.console import Console
+from chapter_sync.handlers.base import ChapterLink
 from chapter_sync.request import (
-    clean_emails,
-    clean_namespaced_elements,
+    compress_page,
+    get_page,
     get_soup,
     join_path,
     published_at,
-    strip_colors,
 )
 from chapter_sync.schema import Chapter, Series
 
@@ -33,6 +37,8 @@ class Settings:
     next_selector: str | None = None
     # If present, use to filter out content that matches the selector
     filter_selector: str | None = None
+    # When following `next_selector`, fetch the next page while the current one is processed
+    prefetch: bool = True
 
 
 def settings_handler(raw: dict | None):
@@ -46,20 +52,72 @@ def settings_handler(raw: dict | None):
 
 
 def chapter_handler(
-    requests: Session, series: Series, settings: Settings, console: Console
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    console: Console,
+    *,
+    save_pages: bool = False,
 ) -> Generator[Chapter, None, None]:
     if settings.chapter_selector:
-        yield from find_by_chapter(requests, series, settings, console=console)
+        yield from find_by_chapter(
+            requests, series, settings, console=console, save_pages=save_pages
+        )
     elif settings.next_selector:
-        yield from find_by_next(requests, series, settings, console=console)
+        yield from find_by_next(
+            requests, series, settings, console=console, save_pages=save_pages
+        )
     else:
         raise NotImplementedError()
 
 
-def find_by_chapter(
+def refresh_handler(
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    chapter: Chapter,
+    console: Console,
+) -> Chapter | None:
+    """Re-collect an already-collected chapter, as it currently exists upstream."""
+    for refreshed in _collect_chapter(
+        requests,
+        series,
+        settings,
+        chapter.url,
+        console=console,
+        title=chapter.title,
+        number=chapter.number,
+    ):
+        return refreshed
+    return None
+
+
+def reprocess_handler(
+    series: Series, settings: Settings, chapter: Chapter, page: str
+) -> Chapter | None:
+    """Re-extract a chapter from its stored page, without refetching it."""
+    for reprocessed in _extract_chapter(
+        BeautifulSoup(page, "html5lib"),
+        series,
+        settings,
+        chapter.url,
+        title=chapter.title,
+        number=chapter.number,
+    ):
+        return reprocessed
+    return None
+
+
+def discover_handler(
     requests: Session, series: Series, settings: Settings, console: Console
-) -> Generator[Chapter, None, None]:
-    assert settings.chapter_selector
+) -> list[ChapterLink] | None:
+    """Find the series' not-yet-collected chapters, from its table of contents.
+
+    Series which follow `next_selector` links can't be discovered ahead of time,
+    so `None` is returned for them.
+    """
+    if not settings.chapter_selector:
+        return None
 
     url = series.url
 
@@ -70,32 +128,77 @@ def find_by_chapter(
 
     existing_chapters = {c.url: c for c in series.chapters}
 
-    existing_chapter = None
+    links = []
+    number = 0
     for chapter_link in soup.select(settings.chapter_selector):
         chapter_url = str(chapter_link.get("href"))
 
         if chapter_url in existing_chapters:
-            existing_chapter = existing_chapters[chapter_url]
+            number = existing_chapters[chapter_url].number
             continue
 
         if base:
             chapter_url = join_path(base, chapter_url)
 
-        for chapter in _collect_chapter(
-            requests,
-            series,
-            settings,
-            chapter_url,
-            console=console,
-            title=chapter_link.string,
-            number=existing_chapter.number + 1 if existing_chapter else 1,
-        ):
+        number += 1
+        links.append(ChapterLink(chapter_url, chapter_link.string, number))
+
+    return links
+
+
+def collect_handler(
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    link: ChapterLink,
+    console: Console,
+    *,
+    save_pages: bool = False,
+) -> Chapter | None:
+    """Collect a single chapter found by `discover_handler`.
+
+    The fetched page is only kept (compressed) on the chapter if `save_pages`.
+    """
+    for chapter in _collect_chapter(
+        requests,
+        series,
+        settings,
+        link.url,
+        console=console,
+        title=link.title,
+        number=link.number,
+        save_pages=save_pages,
+    ):
+        return chapter
+    return None
+
+
+def find_by_chapter(
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    console: Console,
+    *,
+    save_pages: bool = False,
+) -> Generator[Chapter, None, None]:
+    links = discover_handler(requests, series, settings, console)
+    assert links is not None
+
+    for link in links:
+        chapter = collect_handler(
+            requests, series, settings, link, console, save_pages=save_pages
+        )
+        if chapter:
             yield chapter
-            existing_chapter = chapter
 
 
 def find_by_next(
-    requests: Session, series: Series, settings: Settings, console: Console
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    console: Console,
+    *,
+    save_pages: bool = False,
 ) -> Generator[Chapter, None, None]:
     assert settings.next_selector
 
@@ -107,35 +210,76 @@ def find_by_next(
 
     existing_urls = {c.url for c in series.chapters}
 
-    while next_url:
-        if next_url not in existing_urls:
-            for chapter in _collect_chapter(
-                requests,
-                series,
-                settings,
-                next_url,
-                console=console,
-                number=last_chapter.number + 1 if last_chapter else 1,
-            ):
+    # Each page is fetched once, and used for both the chapter content and the
+    # link to the next page. When `prefetch` is enabled, the next page is fetched
+    # in the background while the current chapter is processed (and stored by
+    # the consumer of this generator).
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(get_page, requests, next_url, console=console)
+
+        while pending:
+            url = next_url
+            # As in `_collect_chapter`, the spans cover (waiting on) the fetch,
+            # parsing and extraction; but not the consumer's handling of the
+            # chapters.
+            with trace.span("collect_chapter", url=url):
+                page = pending.result()
+                pending = None
+
+                with trace.span("parse"):
+                    soup = BeautifulSoup(page, "html5lib")
+
+                # The next link must be found before the content is cleaned, which
+                # may well remove it.
+                next_url = _find_next_url(soup, series, settings, url)
+                if next_url and settings.prefetch:
+                    pending = executor.submit(
+                        get_page, requests, next_url, console=console
+                    )
+
+                chapters: list[Chapter] = []
+                if url not in existing_urls:
+                    console.trace(f"Extracting chapter at '{url}'")
+                    with trace.span("extract"):
+                        chapters = list(
+                            _extract_chapter(
+                                soup,
+                                series,
+                                settings,
+                                url,
+                                number=last_chapter.number + 1 if last_chapter else 1,
+                            )
+                        )
+                    if save_pages:
+                        for chapter in chapters:
+                            chapter.page = compress_page(page)
+
+            for chapter in chapters:
                 yield chapter
                 last_chapter = chapter
 
-        existing_urls.add(next_url)
+            existing_urls.add(url)
 
-        soup = get_soup(requests, next_url, console=console)
+            if next_url and not pending:
+                pending = executor.submit(get_page, requests, next_url, console=console)
 
-        assert soup.head
-        base = soup.head.base and soup.head.base.get("href") or False
 
-        next_link = soup.select(settings.next_selector)
-        if not next_link:
-            break
+def _find_next_url(
+    soup: BeautifulSoup, series: Series, settings: Settings, url: str
+) -> str | None:
+    assert settings.next_selector
+    assert soup.head
+    base = soup.head.base and soup.head.base.get("href") or False
+
+    next_link = soup.select(settings.next_selector)
+    if not next_link:
+        return None
 
-        next_link_url = str(next_link[0].get("href"))
-        if base:
-            next_link_url = join_path(series.url, base, next_link_url)
+    next_link_url = str(next_link[0].get("href"))
+    if base:
+        next_link_url = join_path(series.url, base, next_link_url)
 
-        next_url = join_path(next_url, next_link_url)
+    return join_path(url, next_link_url)
 
 
 def _collect_chapter(
@@ -147,18 +291,43 @@ def _collect_chapter(
     console: Console,
     title: str | None = None,
     number: int = 1,
+    save_pages: bool = False,
 ):
     console.trace(f"Extracting chapter at '{url}'")
-    soup = get_soup(requests, url, console=console)
+    with trace.span("collect_chapter", url=url):
+        page = get_page(requests, url, console=console)
+        with trace.span("parse"):
+            soup = BeautifulSoup(page, "html5lib")
+
+        # Extracted eagerly, so the span covers the (lazy) cleaning.
+        with trace.span("extract"):
+            chapters = list(
+                _extract_chapter(
+                    soup, series, settings, url, title=title, number=number
+                )
+            )
 
-    if not soup.select(settings.content_selector):
-        return
+        if save_pages:
+            for chapter in chapters:
+                chapter.page = compress_page(page)
 
-    clean_namespaced_elements(soup)
-    clean_emails(soup)
-    strip_colors(soup)
+    yield from chapters
+
+
+def _extract_chapter(
+    soup: BeautifulSoup,
+    series: Series,
+    settings: Settings,
+    url: str,
+    *,
+    title: str | None = None,
+    number: int = 1,
+):
+    cleaner = Cleaner()
 
     for content in soup.select(settings.content_selector):
+        cleaner.clean(content)
+
         if settings.filter_selector:
             for filtered in content.select(settings.filter_selector):
                 filtered.decompose()
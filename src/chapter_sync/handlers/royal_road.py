@@ -3,15 +3,18 @@ from collections.abc import Generator
 from dataclasses import dataclass
 
 import pendulum
+from bs4 import BeautifulSoup, Tag
 from requests import Session
 
+from chapter_sync import trace
+from chapter_sync.clean import Cleaner, hidden_classes
 from chapter_sync.console import Console
+from chapter_sync.handlers.base import ChapterLink
 from chapter_sync.request import (
-    clean_emails,
-    clean_namespaced_elements,
+    compress_page,
+    get_page,
     get_soup,
     join_path,
-    strip_colors,
 )
 from chapter_sync.schema import Chapter, Series
 
@@ -46,8 +49,23 @@ def settings_handler(raw: dict | None):
 
 
 def chapter_handler(
-    requests: Session, series: Series, settings: Settings, console: Console
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    console: Console,
+    *,
+    save_pages: bool = False,
 ) -> Generator[Chapter, None, None]:
+    for link in discover_handler(requests, series, settings, console):
+        yield collect_handler(
+            requests, series, settings, link, console, save_pages=save_pages
+        )
+
+
+def discover_handler(
+    requests: Session, series: Series, settings: Settings, console: Console
+) -> list[ChapterLink]:
+    """Find the series' not-yet-collected chapters, from its table of contents."""
     # TODO: It's likely most kinds of sites can be handled in terms of the "custom" handler
     #       based on TOC. The main drawback would be things like login requirements, or
     #       the below extra cleaning bits. A system of callbacks for cleaning could be the most
@@ -61,12 +79,14 @@ def chapter_handler(
     if len(series.chapters) > 0:
         existing_chapter_number = series.chapters[-1].number
 
+    links = []
     chapter_elements = soup.select("#chapters tbody tr[data-url]")
     for number, chapter in enumerate(chapter_elements, start=1):
-        if settings.volume_id:
-            chapter_volume_id = chapter.get("data-volume-id")
-            if chapter_volume_id != settings.volume_id:
-                continue
+        volume_id = chapter.get("data-volume-id")
+        # Chapters outside of any volume have a volume id of "null".
+        volume_id = None if volume_id in (None, "", "null") else str(volume_id)
+        if settings.volume_id and volume_id != settings.volume_id:
+            continue
 
         chapter_url = join_path(series.url, str(chapter.get("data-url")))
 
@@ -78,16 +98,64 @@ def chapter_handler(
             new_chapter_number = existing_chapter_number + 1
 
         title = chapter.find("a", href=True).string.strip()  # type: ignore
-        yield _collect_chapter(
-            requests,
-            series,
-            chapter_url,
-            console=console,
-            title=title,
-            number=new_chapter_number,
-        )
+        links.append(ChapterLink(chapter_url, title, new_chapter_number, volume_id))
         existing_chapter_number = new_chapter_number
 
+    return links
+
+
+def collect_handler(
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    link: ChapterLink,
+    console: Console,
+    *,
+    save_pages: bool = False,
+) -> Chapter | None:
+    """Collect a single chapter found by `discover_handler`.
+
+    The fetched page is only kept (compressed) on the chapter if `save_pages`.
+    """
+    chapter = _collect_chapter(
+        requests,
+        series,
+        link.url,
+        console=console,
+        title=link.title,
+        number=link.number,
+        save_pages=save_pages,
+    )
+    chapter.volume_id = link.volume_id
+    return chapter
+
+
+def refresh_handler(
+    requests: Session,
+    series: Series,
+    settings: Settings,
+    chapter: Chapter,
+    console: Console,
+) -> Chapter | None:
+    """Re-collect an already-collected chapter, as it currently exists upstream."""
+    return _collect_chapter(
+        requests,
+        series,
+        chapter.url,
+        console=console,
+        title=chapter.title,
+        number=chapter.number,
+    )
+
+
+def reprocess_handler(
+    series: Series, settings: Settings, chapter: Chapter, page: str
+) -> Chapter | None:
+    """Re-extract a chapter from its stored page, without refetching it."""
+    return _extract_chapter(
+        page, series, chapter.url, title=chapter.title, number=chapter.number
+    )
+
 
 def _collect_chapter(
     requests: Session,
@@ -97,17 +165,36 @@ def _collect_chapter(
     console: Console,
     title: str | None = None,
     number: int = 1,
+    save_pages: bool = False,
 ):
     console.trace(f"Extracting chapter at '{url}'")
-    soup = get_soup(requests, url, console=console)
+    with trace.span("collect_chapter", url=url):
+        page = get_page(requests, url, console=console)
 
-    clean_namespaced_elements(soup)
-    clean_emails(soup)
-    strip_colors(soup)
-    strip_spoilers(soup)
+        with trace.span("extract"):
+            chapter = _extract_chapter(page, series, url, title=title, number=number)
+        if save_pages:
+            chapter.page = compress_page(page)
+        return chapter
+
+
+def _extract_chapter(
+    page: str,
+    series: Series,
+    url: str,
+    *,
+    title: str | None = None,
+    number: int = 1,
+):
+    soup = BeautifulSoup(page, "html5lib")
 
     content = soup.find("div", class_="chapter-content")
-    strip_display_none_content(soup, content)
+    assert isinstance(content, Tag)
+
+    # Royalroad has started inserting "this was stolen" notices into its
+    # HTML, and hiding them with CSS, so those are stripped along with spoilers.
+    cleaner = Cleaner(removed_classes={"spoiler-new", *hidden_classes(soup)})
+    cleaner.clean(content)
 
     published_at = pendulum.from_timestamp(
         int(soup.find(class_="profile-info").find("time").get("unixtime"))  # type: ignore
@@ -121,22 +208,3 @@ def _collect_chapter(
         content=str(content),
         published_at=published_at,
     )
-
-
-def strip_display_none_content(soup, content):
-    # Royalroad has started inserting "this was stolen" notices into its
-    # HTML, and hiding them with CSS. Currently the CSS is very easy to
-    # find, so do so and filter them out.
-    for style in soup.find_all("style"):
-        match = re.match(r"\s*\.(\w+)\s*{[^}]*display:\s*none;[^}]*}", style.string)
-        if not match:
-            continue
-
-        css_class = match.group(1)
-        for warning in content.find_all(class_=css_class):
-            warning.decompose()
-
-
-def strip_spoilers(soup):
-    for spoiler in soup.find_all(class_=("spoiler-new")):
-        spoiler.decompose()
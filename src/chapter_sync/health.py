@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+from chapter_sync.schema import utcnow
+
+Status = Literal["starting", "syncing", "sleeping", "stopping", "stopped"]
+
+
+@dataclass
+class HealthFile:
+    """A JSON file describing the state of a running `watch`.
+
+    The file is rewritten (atomically) whenever the state changes, so an external
+    monitor can check that the process is alive, and that its syncs are keeping
+    up: `next_sync_at` having long passed indicates a stuck process.
+
+    Without a `path`, updates are ignored.
+    """
+
+    path: Path | None
+
+    iterations: int = 0
+    last_sync_at: datetime | None = None
+    last_error: str | None = None
+
+    pid: int = field(default_factory=os.getpid)
+
+    def update(self, status: Status, *, next_sync_at: datetime | None = None):
+        if self.path is None:
+            return
+
+        state = {
+            "status": status,
+            "pid": self.pid,
+            "updated_at": utcnow().isoformat(),
+            "iterations": self.iterations,
+            "last_sync_at": self.last_sync_at and self.last_sync_at.isoformat(),
+            "next_sync_at": next_sync_at and next_sync_at.isoformat(),
+            "last_error": self.last_error,
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(f".{self.path.name}.tmp")
+        temp.write_text(json.dumps(state, indent=2))
+        temp.replace(self.path)
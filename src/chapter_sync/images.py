@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+import sqlite3
+import threading
+import urllib.parse
+import warnings
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Literal, get_args
+
+from requests import Session
+
+from chapter_sync import trace
+from chapter_sync.console import Console
+from chapter_sync.request import get_content
+from chapter_sync.retry import FetchError
+
+ImageProfile = Literal["eink", "tablet"]
+IMAGE_PROFILES: tuple[ImageProfile, ...] = get_args(ImageProfile)
+
+# Content is serialized by bs4, so attributes are reliably double quoted.
+RE_IMG_SRC = re.compile(r'(<img\b[^>]*?\bsrc=")([^"]*)(")')
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """How images are prepared for a kind of e-reader.
+
+    Images are only ever scaled down, to fit within `max_width` x `max_height`.
+    Opaque images are recompressed as JPEG at the given `quality`; those with
+    transparency as PNG.
+    """
+
+    name: str
+    max_width: int
+    max_height: int
+    quality: int = 80
+    grayscale: bool = False
+
+
+PROFILES: dict[ImageProfile, DeviceProfile] = {
+    # e.g. A 6-7" e-ink reader, which can only show grays anyway.
+    "eink": DeviceProfile("eink", 1072, 1448, quality=70, grayscale=True),
+    "tablet": DeviceProfile("tablet", 1536, 2048, quality=85),
+}
+
+
+@dataclass(frozen=True)
+class EmbeddedImage:
+    # The hash of the original image, so the same image (at any url) is one file.
+    hash: str
+    data: bytes
+    media_type: str
+
+    @property
+    def filename(self) -> str:
+        extension = "png" if self.media_type == "image/png" else "jpg"
+        return f"{self.hash[:16]}.{extension}"
+
+
+@dataclass
+class ImageCache:
+    """A persistent store of chapter images, deduplicated by their content.
+
+    Each url is only fetched once, and each distinct image only prepared once
+    per profile; however many urls, chapters and series it appears in. Without
+    a `path`, the cache only lasts as long as the process.
+    """
+
+    path: Path | None = None
+
+    filename = "images.sqlite"
+
+    _connection: sqlite3.Connection | None = field(default=None, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            database = ":memory:"
+            if self.path is not None:
+                self.path.mkdir(parents=True, exist_ok=True)
+                database = str(self.path / self.filename)
+
+            self._connection = sqlite3.connect(database, check_same_thread=False)
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS image_source (
+                    url TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS image (
+                    hash TEXT NOT NULL,
+                    profile TEXT NOT NULL,
+                    media_type TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (hash, profile)
+                );
+                """
+            )
+        return self._connection
+
+    def source(self, url: str) -> str | None:
+        """Return the hash of the image last fetched from `url`, if any."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT hash FROM image_source WHERE url = ?", (url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, hash: str, profile: DeviceProfile) -> EmbeddedImage | None:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT media_type, data FROM image WHERE hash = ? AND profile = ?",
+                (hash, profile.name),
+            ).fetchone()
+        if row is None:
+            return None
+        return EmbeddedImage(hash=hash, data=row[1], media_type=row[0])
+
+    def set(self, url: str, image: EmbeddedImage, profile: DeviceProfile):
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO image_source VALUES (?, ?)", (url, image.hash)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO image VALUES (?, ?, ?, ?)",
+                (image.hash, profile.name, image.media_type, image.data),
+            )
+            self.connection.commit()
+
+
+@dataclass
+class ImageEmbedder:
+    """Fetches and prepares the images referenced by chapters, to embed in epubs.
+
+    Images are fetched concurrently (up to `workers` at once) through the given
+    session; so through the response cache and retry policy, like pages.
+    """
+
+    session: Session
+    profile: DeviceProfile
+    cache: ImageCache = field(default_factory=ImageCache)
+    workers: int = 4
+    console: Console | None = None
+
+    @trace.traced("images.prepare")
+    def prepare(self, urls: Iterable[str]) -> dict[str, EmbeddedImage]:
+        """Prepare each of the (distinct) urls, omitting any which failed."""
+        distinct = list(dict.fromkeys(urls))
+        if not distinct:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            images = executor.map(self.prepare_one, distinct)
+            return {
+                url: image
+                for url, image in zip(distinct, images, strict=True)
+                if image is not None
+            }
+
+    def prepare_one(self, url: str) -> EmbeddedImage | None:
+        hash = self.cache.source(url)
+        if hash is not None:
+            image = self.cache.get(hash, self.profile)
+            if image is not None:
+                return image
+
+        try:
+            data = get_content(self.session, url, console=self.console)
+            image = prepare_image(data, self.profile)
+        except (FetchError, OSError, ValueError) as e:
+            # The image is left as a (remote) link, rather than failing the epub.
+            if self.console:
+                self.console.warn(f"Couldn't embed image '{url}': {e}")
+            return None
+
+        self.cache.set(url, image, self.profile)
+        return image
+
+
+def prepare_image(data: bytes, profile: DeviceProfile) -> EmbeddedImage:
+    """Scale down, and recompress, an image for the given device profile.
+
+    Raises `ValueError` for an image too large (in pixels, however small the
+    file) to safely decode; Pillow would otherwise only warn for some of them.
+    """
+    from PIL import Image
+
+    hash = hashlib.sha256(data).hexdigest()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(BytesIO(data)) as original:
+                image = original.copy()
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        raise ValueError(str(e)) from e
+
+    image.thumbnail((profile.max_width, profile.max_height))
+
+    transparent = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    if transparent:
+        image = image.convert("LA" if profile.grayscale else "RGBA")
+    else:
+        image = image.convert("L" if profile.grayscale else "RGB")
+
+    output = BytesIO()
+    if transparent:
+        image.save(output, format="PNG", optimize=True)
+        media_type = "image/png"
+    else:
+        image.save(output, format="JPEG", quality=profile.quality, optimize=True)
+        media_type = "image/jpeg"
+
+    return EmbeddedImage(hash=hash, data=output.getvalue(), media_type=media_type)
+
+
+def image_urls(content: str, base_url: str) -> list[str]:
+    """Find the (absolute) urls of the images in a chapter's content."""
+    return [
+        url
+        for match in RE_IMG_SRC.finditer(content)
+        if (url := _absolute(match.group(2), base_url))
+    ]
+
+
+def embed(
+    content: str, base_url: str, images: Mapping[str, EmbeddedImage], prefix: str
+) -> str:
+    """Point the content's images at their embedded files (at `prefix`)."""
+
+    def replace(match: re.Match) -> str:
+        image = images.get(_absolute(match.group(2), base_url) or "")
+        if image is None:
+            return match.group(0)
+        return f"{match.group(1)}{prefix}{image.filename}{match.group(3)}"
+
+    return RE_IMG_SRC.sub(replace, content)
+
+
+def _absolute(src: str, base_url: str) -> str | None:
+    url = urllib.parse.urljoin(base_url, html.unescape(src))
+    if urllib.parse.urlsplit(url).scheme not in ("http", "https"):
+        # e.g. Already inline, as a `data:` url.
+        return None
+    return url
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from sqlalchemy.orm import Session
+
+from chapter_sync.schema import (
+    Chapter,
+    DownloadAccess,
+    DownloadLink,
+    EmailSubscriber,
+    Series,
+    as_utc,
+    utcnow,
+)
+
+
+def sign(link_id: int, expires: int, secret: str) -> str:
+    message = f"{link_id}:{expires}".encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify(link_id: int, expires: int, signature: str, secret: str) -> bool:
+    return hmac.compare_digest(sign(link_id, expires, secret), signature)
+
+
+def is_expired(link: DownloadLink, now: datetime | None = None) -> bool:
+    now = now or utcnow()
+    return as_utc(link.expires_at) <= now
+
+
+def create_link(
+    database: Session,
+    series: Series,
+    block: Sequence[Chapter],
+    *,
+    ttl: timedelta,
+    subscriber: EmailSubscriber | None = None,
+) -> DownloadLink:
+    """Record a link to the epub of a block of chapters, valid for `ttl`."""
+    chapter = block[0] if len(block) == 1 and block[0].ebook is not None else None
+
+    link = DownloadLink(
+        series_id=series.id,
+        chapter_id=chapter.id if chapter else None,
+        subscriber_id=subscriber.id if subscriber else None,
+        first_number=block[0].number,
+        last_number=block[-1].number,
+        # Whole seconds, since the signed expiry is.
+        expires_at=(utcnow() + ttl).replace(microsecond=0),
+    )
+    database.add(link)
+    database.flush()
+    return link
+
+
+def url(link: DownloadLink, *, public_url: str, secret: str) -> str:
+    """Build the link's (signed) url, to the web app's download endpoint."""
+    expires = int(as_utc(link.expires_at).timestamp())
+    query = urlencode({"expires": expires, "signature": sign(link.id, expires, secret)})
+    return f"{public_url.rstrip('/')}/download/{link.id}?{query}"
+
+
+def record_access(
+    database: Session,
+    link: DownloadLink,
+    *,
+    remote_addr: str | None = None,
+    user_agent: str | None = None,
+):
+    database.add(
+        DownloadAccess(link_id=link.id, remote_addr=remote_addr, user_agent=user_agent)
+    )
+    database.commit()
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import contextlib
+import math
+import threading
+import time
+from collections.abc import Generator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, TypeVar
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = tuple(2.0**n for n in range(14, 27, 2))  # 16KiB - 64MiB
+
+LabelValues = tuple[str, ...]
+
+M = TypeVar("M", bound="Metric")
+
+
+@dataclass
+class Metric:
+    """A named family of samples, in the Prometheus text exposition format."""
+
+    name: str
+    help: str
+    labels: Sequence[str] = ()
+
+    type: ClassVar[str]
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def label_values(self, labels: dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {list(self.labels)}")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.type}",
+            *self.samples(),
+        ]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError()
+
+    def format_labels(self, values: LabelValues, **extra: str) -> str:
+        pairs = [*zip(self.labels, values), *extra.items()]
+        if not pairs:
+            return ""
+
+        rendered = ",".join(f'{k}="{escape_label(v)}"' for k, v in pairs)
+        return f"{{{rendered}}}"
+
+
+@dataclass
+class Counter(Metric):
+    type = "counter"
+
+    _values: dict[LabelValues, float] = field(default_factory=dict, init=False)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self.label_values(labels), 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{self.format_labels(k)} {format_value(v)}" for k, v in values
+        ]
+
+
+@dataclass
+class Gauge(Metric):
+    type = "gauge"
+
+    _values: dict[LabelValues, float] = field(default_factory=dict, init=False)
+
+    def set(self, value: float, **labels):
+        key = self.label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float | None:
+        return self._values.get(self.label_values(labels))
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{self.format_labels(k)} {format_value(v)}" for k, v in values
+        ]
+
+
+@dataclass
+class Histogram(Metric):
+    type = "histogram"
+
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+
+    # Per label values: the count in each bucket (non-cumulative), then the sum.
+    _values: dict[LabelValues, tuple[list[int], float]] = field(
+        default_factory=dict, init=False
+    )
+
+    def observe(self, value: float, **labels):
+        key = self.label_values(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0)
+            index = next(
+                (i for i, bound in enumerate(self.buckets) if value <= bound),
+                len(self.buckets),
+            )
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextlib.contextmanager
+    def time(self, **labels) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        counts, _ = self._values.get(self.label_values(labels)) or ([], 0)
+        return sum(counts)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = [(k, (list(c), s)) for k, (c, s) in self._values.items()]
+        values.sort(key=lambda item: item[0])
+
+        result = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip([*self.buckets, math.inf], counts):
+                cumulative += count
+                labels = self.format_labels(key, le=format_value(bound))
+                result.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = self.format_labels(key)
+            result.append(f"{self.name}_sum{labels} {format_value(total)}")
+            result.append(f"{self.name}_count{labels} {cumulative}")
+        return result
+
+
+@dataclass
+class Registry:
+    metrics: list[Metric] = field(default_factory=list)
+
+    def register(self, metric: M) -> M:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "".join("\n".join(metric.render()) + "\n" for metric in self.metrics)
+
+    def write_textfile(self, path: Path):
+        """Write the metrics to a file, e.g. for node_exporter's textfile collector.
+
+        The file is replaced atomically, so it's never read half-written.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f".{path.name}.tmp")
+        temp.write_text(self.render())
+        temp.replace(path)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def format_value(value: float) -> str:
+    """Format a sample value.
+
+    Examples:
+        >>> format_value(3.0), format_value(0.25), format_value(math.inf)
+        ('3', '0.25', '+Inf')
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+registry = Registry()
+
+fetch_duration = registry.register(
+    Histogram(
+        "chapter_sync_fetch_duration_seconds",
+        "Time taken by each page fetch attempt.",
+        ["host"],
+    )
+)
+fetch_responses = registry.register(
+    Counter(
+        "chapter_sync_fetch_responses_total",
+        "Page fetch attempts, by response status ('error' if there was none).",
+        ["host", "status"],
+    )
+)
+fetch_retries = registry.register(
+    Counter(
+        "chapter_sync_fetch_retries_total",
+        "Page fetches retried after a failed attempt.",
+        ["host"],
+    )
+)
+chapters_collected = registry.register(
+    Counter(
+        "chapter_sync_chapters_collected_total",
+        "New chapters collected, by series.",
+        ["series"],
+    )
+)
+epub_build_duration = registry.register(
+    Histogram(
+        "chapter_sync_epub_build_duration_seconds",
+        "Time taken to write each epub.",
+    )
+)
+epub_size = registry.register(
+    Histogram(
+        "chapter_sync_epub_size_bytes",
+        "Size of each written epub.",
+        buckets=SIZE_BUCKETS,
+    )
+)
+email_send_duration = registry.register(
+    Histogram(
+        "chapter_sync_email_send_duration_seconds",
+        "Time taken to send each email.",
+    )
+)
+email_send_failures = registry.register(
+    Counter(
+        "chapter_sync_email_send_failures_total",
+        "Emails which failed to send.",
+    )
+)
+last_sync = registry.register(
+    Gauge(
+        "chapter_sync_last_sync_timestamp_seconds",
+        "When the most recent sync finished (as a unix timestamp).",
+    )
+)
@@ -22,6 +22,15 @@ def process_revision_directives(
             directives[:] = []
 
 
+def include_name(name: str | None, type_: str, parent_names) -> bool:
+    # The full-text search index is managed by raw DDL (it's an FTS5 virtual
+    # table on sqlite, which also creates several shadow tables), so it should
+    # be ignored by autogenerate.
+    if type_ == "table" and name and name.startswith("chapter_search"):
+        return False
+    return True
+
+
 def run_migrations_online() -> None:
     config = context.config
 
@@ -37,6 +46,7 @@ def run_migrations_online() -> None:
             target_metadata=metadata,
             compare_types=True,
             render_as_batch=True,
+            include_name=include_name,
             process_revision_directives=process_revision_directives,
         )
 
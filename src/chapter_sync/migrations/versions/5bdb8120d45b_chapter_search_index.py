@@ -0,0 +1,64 @@
+"""Chapter search index.
+
+Revision ID: 5bdb8120d45b
+Revises: 63139caea00e
+Create Date: 2026-10-19 09:12:44.301822
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5bdb8120d45b"
+down_revision: str | None = "63139caea00e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# The schema as of this revision, rather than whatever `chapter_sync.search` has
+# since become.
+sqlite_ddl = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chapter_search "
+    "USING fts5(title, content, tokenize='porter unicode61')",
+]
+postgresql_ddl = [
+    """
+    CREATE TABLE IF NOT EXISTS chapter_search (
+        chapter_id INTEGER PRIMARY KEY REFERENCES chapter (id) ON DELETE CASCADE,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', title), 'A')
+            || setweight(to_tsvector('english', content), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_chapter_search_document "
+    "ON chapter_search USING gin (document)",
+]
+
+
+def upgrade() -> None:
+    from bs4 import BeautifulSoup
+
+    conn = op.get_bind()
+    dialect = conn.dialect.name
+    for statement in postgresql_ddl if dialect == "postgresql" else sqlite_ddl:
+        op.execute(statement)
+
+    key = "chapter_id" if dialect == "postgresql" else "rowid"
+    insert = sa.text(
+        f"INSERT INTO chapter_search ({key}, title, content) "  # noqa: S608
+        "VALUES (:id, :title, :content)"
+    )
+
+    chapters = conn.execute(sa.text("SELECT id, title, content FROM chapter"))
+    for id, title, content in chapters.all():
+        text = BeautifulSoup(content, "html.parser").get_text(" ", strip=True)
+        conn.execute(insert, {"id": id, "title": title, "content": text})
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS chapter_search")
@@ -1,19 +1,203 @@
-import re
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
 import time
 import urllib.parse
-from typing import cast
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 import pendulum
-from bs4 import BeautifulSoup, Tag
-from requests import Session
+from requests import Response, Session
+from requests.exceptions import ConnectionError, Timeout
+from requests.structures import CaseInsensitiveDict
 
+from chapter_sync import metrics, trace
 from chapter_sync.console import Console
+from chapter_sync.retry import (
+    RETRYABLE_STATUSES,
+    CircuitOpenError,
+    FetchError,
+    RetryLaterError,
+    RetryPolicy,
+    deferred_attempts,
+    parse_retry_after,
+)
+
+# bs4 is slow to import, and isn't needed by most commands, so it's imported on
+# first use.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+class CacheMissError(FetchError):
+    """Raised when running offline, and a requested page has not been cached."""
+
 
-RE_NAMESPACED_ELEMENT = re.compile(r"[a-z]+:[a-z]+")
+@dataclass
+class ResponseCache:
+    """A persistent cache of successful GET responses, keyed by URL.
 
+    Entries older than `ttl` seconds are considered stale, and are refetched
+    (unless `offline`, in which case any cached copy is used). Once the total
+    (compressed) size of the cache exceeds `max_size` bytes, the least recently
+    used entries are evicted.
+    """
 
-def requests_session():
-    return Session()
+    path: Path
+    ttl: int | None = None
+    max_size: int = 512 * 1024 * 1024
+    offline: bool = False
+
+    filename = "responses.sqlite"
+
+    _connection: sqlite3.Connection | None = field(default=None, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path / self.filename, check_same_thread=False
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    encoding TEXT,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_response_accessed_at "
+                "ON response (accessed_at)"
+            )
+        return self._connection
+
+    def get(self, url: str) -> Response | None:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT status_code, headers, encoding, body, fetched_at "
+                "FROM response WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            status_code, headers, encoding, body, fetched_at = row
+            now = time.time()
+            if (
+                not self.offline
+                and self.ttl is not None
+                and now - fetched_at > self.ttl
+            ):
+                return None
+
+            self.connection.execute(
+                "UPDATE response SET accessed_at = ? WHERE url = ?", (now, url)
+            )
+            self.connection.commit()
+
+        response = Response()
+        response.url = url
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = encoding
+        response._content = zlib.decompress(body)
+        return response
+
+    def set(self, url: str, response: Response):
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.status_code,
+                    json.dumps(dict(response.headers)),
+                    response.encoding,
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+            self.connection.commit()
+
+    def _evict(self):
+        (total,) = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM response"
+        ).fetchone()
+        if total <= self.max_size:
+            return
+
+        rows = self.connection.execute(
+            "SELECT url, size FROM response ORDER BY accessed_at DESC"
+        )
+        retained = 0
+        evicted = []
+        for url, size in rows:
+            retained += size
+            if retained > self.max_size:
+                evicted.append((url,))
+
+        self.connection.executemany("DELETE FROM response WHERE url = ?", evicted)
+
+
+class RetryingSession(Session):
+    """A `requests.Session` carrying the `RetryPolicy` used by `get_page`.
+
+    The policy's circuit breaker is shared by every request made with the
+    session, so it's remembered (for the session's lifetime) which hosts are down.
+    """
+
+    def __init__(self, retry_policy: RetryPolicy | None = None):
+        super().__init__()
+        self.retry_policy = retry_policy or RetryPolicy()
+
+
+class CachedSession(RetryingSession):
+    """A `requests.Session` which serves GET requests through a `ResponseCache`."""
+
+    def __init__(self, cache: ResponseCache, retry_policy: RetryPolicy | None = None):
+        super().__init__(retry_policy)
+        self.cache = cache
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, *args, **kwargs)
+
+        response = self.cache.get(url)
+        if response is not None:
+            return response
+
+        if self.cache.offline:
+            raise CacheMissError("Not cached (running offline)", url)
+
+        response = super().request(method, url, *args, **kwargs)
+        if response.status_code == 200:
+            self.cache.set(url, response)
+        return response
+
+
+def requests_session(
+    cache: ResponseCache | None = None, retry_policy: RetryPolicy | None = None
+):
+    if cache is None:
+        return RetryingSession(retry_policy)
+    return CachedSession(cache, retry_policy)
 
 
 def get_soup(
@@ -22,79 +206,162 @@ def get_soup(
     *,
     console: Console | None = None,
     method="html5lib",
-    retry=3,
-    retry_delay=10,
+    policy: RetryPolicy | None = None,
     timeout=30,
 ):
-    page = session.get(url, timeout=timeout)
-    if not page:
-        if (
-            page.status_code == 403
-            and page.headers.get("Server", False) == "cloudflare"
-            and "captcha-bypass" in page.text
-        ):
-            raise RuntimeError("Couldn't due to Cloudflare protection", url)
-
-        if retry and retry > 0:
-            real_delay = retry_delay
-            if "Retry-After" in page.headers:
-                real_delay = int(page.headers["Retry-After"])
-
-            if console:
-                console.trace(
-                    f"Load failed: waiting {real_delay} to retry ({page.status_code}: {page.url})",
-                )
-            time.sleep(real_delay)
-
-            return get_soup(
-                session,
-                url,
-                console=console,
-                method=method,
-                retry=retry - 1,
-                retry_delay=retry_delay,
-                timeout=timeout,
-            )
-        raise RuntimeError("Couldn't fetch", url)
+    from bs4 import BeautifulSoup
 
-    return BeautifulSoup(page.text, method)
+    with trace.span("get_soup", url=url):
+        page = get_page(session, url, console=console, policy=policy, timeout=timeout)
+        with trace.span("parse"):
+            return BeautifulSoup(page, method)
 
 
-def join_path(*segments):
-    return urllib.parse.urljoin(*segments)
+def get_page(
+    session: Session,
+    url,
+    *,
+    console: Console | None = None,
+    policy: RetryPolicy | None = None,
+    timeout=30,
+) -> str:
+    """Fetch a page, retrying transient failures according to `policy`.
+
+    The policy defaults to the session's own (if it's a `RetryingSession`).
+    Raises `CircuitOpenError` if the url's host has been failing, rather than
+    continuing to wait on it; and `RetryLaterError` rather than waiting to retry,
+    within `deferred_retries`.
+    """
+    host = urllib.parse.urlsplit(url).netloc
+    with trace.span("get_page", host=host) as span:
+        page = _get(
+            session,
+            url,
+            host,
+            console=console,
+            policy=_policy(session, policy),
+            timeout=timeout,
+        ).text
+        if span:
+            span.set(bytes=len(page))
+        return page
+
+
+def get_content(
+    session: Session,
+    url,
+    *,
+    console: Console | None = None,
+    policy: RetryPolicy | None = None,
+    timeout=30,
+) -> bytes:
+    """Fetch a (binary) resource, such as an image, retrying as `get_page` does."""
+    host = urllib.parse.urlsplit(url).netloc
+    with trace.span("get_content", host=host) as span:
+        content = _get(
+            session,
+            url,
+            host,
+            console=console,
+            policy=_policy(session, policy),
+            timeout=timeout,
+        ).content
+        if span:
+            span.set(bytes=len(content))
+        return content
+
+
+def _policy(session: Session, policy: RetryPolicy | None) -> RetryPolicy:
+    if policy is not None:
+        return policy
+    if isinstance(session, RetryingSession):
+        return session.retry_policy
+    return RetryPolicy()
 
 
-def clean_namespaced_elements(soup: BeautifulSoup):
-    for namespaced in soup.find_all(RE_NAMESPACED_ELEMENT):
-        # Namespaced elements are going to cause validation errors
-        namespaced.decompose()
+def _get(
+    session: Session,
+    url,
+    host: str,
+    *,
+    console: Console | None,
+    policy: RetryPolicy,
+    timeout,
+) -> Response:
+    breaker = policy.breaker
+    deferred = deferred_attempts()
+
+    for attempt in range(policy.retries + 1):
+        breaker.check(host)
+
+        if attempt:
+            metrics.fetch_retries.inc(host=host)
+
+        retry_after = None
+        try:
+            with metrics.fetch_duration.time(host=host):
+                page = session.get(url, timeout=timeout)
+        except (ConnectionError, Timeout) as e:
+            metrics.fetch_responses.inc(host=host, status="error")
+            reason = repr(e)
+        else:
+            metrics.fetch_responses.inc(host=host, status=page.status_code)
+            if page:
+                breaker.succeed(host)
+                return page
+
+            if (
+                page.status_code == 403
+                and page.headers.get("Server", False) == "cloudflare"
+                and "captcha-bypass" in page.text
+            ):
+                breaker.fail(host)
+                raise FetchError("Couldn't due to Cloudflare protection", url)
+
+            if page.status_code not in RETRYABLE_STATUSES:
+                raise FetchError("Couldn't fetch", url, page.status_code)
+
+            reason = f"{page.status_code}: {page.url}"
+            retry_after = parse_retry_after(page.headers.get("Retry-After"))
 
+        breaker.fail(host)
+        if attempt == policy.retries:
+            break
 
-def clean_emails(soup: BeautifulSoup):
-    # Cloudflare is used on many sites, and mangles things that look like email addresses
-    # e.g. Point_Me_@_The_Sky becomes
-    # <a href="/cdn-cgi/l/email-protection" class="__cf_email__" data-cfemail="85d5eaecebf1dac8e0dac5">[email&#160;protected]</a>_The_Sky
-    for a in soup.find_all(
-        "a", class_="__cf_email__", href="/cdn-cgi/l/email-protection"
-    ):
-        # See: https://usamaejaz.com/cloudflare-email-decoding/
-        enc = bytes.fromhex(a["data-cfemail"])
-        email = bytes([c ^ enc[0] for c in enc[1:]]).decode("utf8")
-        a.insert_before(email)
-        a.decompose()
+        delay = policy.delay(attempt if deferred is None else deferred, retry_after)
+        if delay > policy.max_delay:
+            # Rather than block everything else on this host, skip it for now.
+            breaker.open(host, delay)
+            raise CircuitOpenError(host, time.time() + delay)
 
+        if deferred is not None:
+            # The caller reschedules the fetch, rather than a worker waiting on it.
+            raise RetryLaterError(url, reason, delay)
 
-def strip_colors(soup: BeautifulSoup):
-    for tag in soup.find_all(style=re.compile(r"(?:color|background)\s*:")):
-        tag["style"] = re.sub(r"(?:color|background)\s*:[^;]+;?", "", tag["style"])
+        if console:
+            console.trace(f"Load failed: waiting {delay:.1f} to retry ({reason})")
+        time.sleep(delay)
+
+    raise FetchError("Couldn't fetch", url)
+
+
+def compress_page(page: str) -> bytes:
+    return zlib.compress(page.encode("utf-8"))
+
+
+def decompress_page(page: bytes) -> str:
+    return zlib.decompress(page).decode("utf-8")
+
+
+def join_path(*segments):
+    return urllib.parse.urljoin(*segments)
 
 
 def published_at(soup: BeautifulSoup) -> pendulum.DateTime | None:
     dt_string = None
 
-    published_time = soup.find("meta", {"property": "article:published_time"})
+    published_time = soup.select_one('meta[property="article:published_time"]')
     if published_time:
-        assert isinstance(published_time, Tag)
         dt_string = str(published_time["content"])
 
     if not dt_string:
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import contextvars
+import email.utils
+import random
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+class FetchError(RuntimeError):
+    """Raised when a page couldn't be fetched."""
+
+
+class CircuitOpenError(FetchError):
+    """Raised instead of making a request to a host which is considered down."""
+
+    def __init__(self, host: str, until: float):
+        super().__init__(f"'{host}' is unavailable, skipping until {time.ctime(until)}")
+        self.host = host
+        self.until = until
+
+
+class RetryLaterError(FetchError):
+    """Raised instead of waiting to retry a failed request, when retries are deferred.
+
+    See `deferred_retries`.
+    """
+
+    def __init__(self, url: str, reason: str, delay: float):
+        super().__init__(f"Couldn't fetch ({reason}), retry in {delay:.1f}s", url)
+        self.delay = delay
+
+
+# The number of attempts already made at the current (deferred) fetch, if its
+# retries are deferred to the caller.
+_deferred_attempts: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "deferred_attempts", default=None
+)
+
+
+@contextmanager
+def deferred_retries(attempts: int = 0) -> Generator[None, None, None]:
+    """Raise `RetryLaterError` for a failed fetch, rather than waiting to retry it.
+
+    For callers which reschedule fetches themselves (such as the crawl frontier),
+    so that a worker isn't left blocked meanwhile. The delay is that of the
+    retry following the fetch's previous `attempts`.
+    """
+    token = _deferred_attempts.set(attempts)
+    try:
+        yield
+    finally:
+        _deferred_attempts.reset(token)
+
+
+def deferred_attempts() -> int | None:
+    """Return the previous attempts at the current fetch, if its retries are deferred."""
+    return _deferred_attempts.get()
+
+
+@dataclass
+class CircuitBreaker:
+    """Tracks consecutive request failures per host.
+
+    Once a host has failed `threshold` times in a row, its circuit "opens", and
+    requests to it fail immediately (with `CircuitOpenError`) for `reset_after`
+    seconds. After that, a single request is let through: if it fails, the circuit
+    reopens straight away, otherwise it closes again.
+    """
+
+    threshold: int = 5
+    reset_after: float = 300
+
+    _failures: dict[str, int] = field(default_factory=dict, init=False)
+    _open_until: dict[str, float] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def check(self, host: str):
+        with self._lock:
+            until = self._open_until.get(host)
+            if until is None:
+                return
+
+            if time.time() < until:
+                raise CircuitOpenError(host, until)
+
+            # Half-open: allow a trial request, which reopens the circuit on failure.
+            del self._open_until[host]
+            self._failures[host] = self.threshold - 1
+
+    def succeed(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def fail(self, host: str):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                self._open_until[host] = time.time() + self.reset_after
+
+    def open(self, host: str, duration: float):
+        """Open the circuit for (at least) `duration` seconds, e.g. at the host's request."""
+        with self._lock:
+            until = time.time() + duration
+            self._open_until[host] = max(until, self._open_until.get(host, until))
+
+
+@dataclass
+class RetryPolicy:
+    """How failed requests are retried.
+
+    Retries back off exponentially from `base_delay`, up to `max_delay`, with up
+    to `jitter` (as a fraction) of each delay randomized away so that retries
+    from concurrent workers spread out. A server-provided `Retry-After` is used
+    as-is, unless it's longer than `max_delay`, in which case (rather than block
+    on it) the host's circuit is opened for that long.
+    """
+
+    retries: int = 3
+    base_delay: float = 2
+    max_delay: float = 60
+    jitter: float = 0.5
+
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        return delay * (1 - self.jitter * random.random())  # noqa: S311
+
+
+# Statuses which indicate a (likely) transient problem, which may succeed on retry.
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header, in either of its seconds or HTTP-date forms.
+
+    Examples:
+        >>> parse_retry_after("120")
+        120.0
+        >>> parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is not None
+        True
+        >>> parse_retry_after("soon") is None
+        True
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, date.timestamp() - time.time())
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import statistics
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from chapter_sync.schema import Chapter, Series, as_utc, utcnow
+
+# Series are never checked more often than this, nor less often than `MAX_INTERVAL`.
+MIN_INTERVAL = timedelta(hours=1)
+MAX_INTERVAL = timedelta(days=30)
+
+# How often a series is checked when there's no release history to go on.
+DEFAULT_INTERVAL = timedelta(days=1)
+
+# The number of most recent chapters whose release dates determine the cadence.
+CADENCE_SAMPLE = 10
+
+
+def release_cadence(chapters: Sequence[Chapter]) -> timedelta | None:
+    """Find the typical time between the series' most recent chapter releases.
+
+    Several chapters are often published at once (e.g. on launch), so the median
+    gap is used, rather than the mean.
+    """
+    published = sorted(as_utc(c.published_at) for c in chapters[-CADENCE_SAMPLE:])
+    gaps = [b - a for a, b in itertools.pairwise(published)]
+    if not gaps:
+        return None
+
+    return max(statistics.median(gaps), MIN_INTERVAL)
+
+
+def check_interval(series: Series, now: datetime | None = None) -> timedelta:
+    """How long to wait, after checking a series, before checking it again.
+
+    An active series is checked twice per release cadence. Once a series is
+    overdue (more than twice its cadence since its last release), the interval
+    doubles for every check which doesn't find anything new.
+    """
+    now = now or utcnow()
+
+    cadence = release_cadence(series.chapters)
+    if cadence is None:
+        interval = DEFAULT_INTERVAL
+        overdue = True
+    else:
+        interval = cadence / 2
+        overdue = now - as_utc(series.chapters[-1].published_at) > cadence * 2
+
+    if overdue:
+        # The exponent is bounded, which `MAX_INTERVAL` is well within anyway.
+        interval *= 2 ** min(series.idle_checks, 16)
+
+    return min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+
+
+def record_check(series: Series, *, new_chapters: int, now: datetime | None = None):
+    """Schedule a series' next check, given the result of checking it just now."""
+    now = now or utcnow()
+
+    series.idle_checks = 0 if new_chapters else series.idle_checks + 1
+    series.next_check_at = now + check_interval(series, now)
+
+
+def due(series: Iterable[Series], now: datetime | None = None) -> list[Series]:
+    """Select the series which are due to be checked, most overdue first.
+
+    A series which has never been scheduled is always due.
+    """
+    now = now or utcnow()
+
+    queue: list[tuple[datetime, int, Series]] = []
+    for s in series:
+        assert s.id is not None
+        next_check_at = as_utc(s.next_check_at) if s.next_check_at else None
+        if next_check_at is None or next_check_at <= now:
+            heapq.heappush(queue, (next_check_at or _EPOCH, s.id, s))
+
+    return [heapq.heappop(queue)[2] for _ in range(len(queue))]
+
+
+def record_failure(series: Series, now: datetime | None = None):
+    """Postpone the next check of a series which couldn't be checked just now."""
+    now = now or utcnow()
+    series.next_check_at = now + MIN_INTERVAL
+
+
+def next_due(
+    database: Session, series_ids: Iterable[int] | None = None
+) -> datetime | None:
+    """Find when the next (of the given) series is due to be checked, if any."""
+    query = select(
+        func.count(Series.id) - func.count(Series.next_check_at),
+        func.min(Series.next_check_at),
+    )
+    if series_ids is not None:
+        query = query.where(Series.id.in_(series_ids))
+
+    unscheduled, next_check_at = database.execute(query).one()
+    if unscheduled:
+        return utcnow()
+    if next_check_at is None:
+        return None
+    return as_utc(next_check_at)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import ClassVar
+import hashlib
+import re
+import unicodedata
+from datetime import datetime, timezone
+from typing import ClassVar, Literal, TypeAlias, get_args
 
 from pendulum import now
 from sqlalchemy import (
     JSON,
+    Boolean,
     ColumnElement,
     DateTime,
     Float,
@@ -16,7 +20,11 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    event,
+    false,
     func,
+    inspect,
+    text,
     type_coerce,
 )
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -40,6 +48,14 @@ convention = {
 
 metadata = MetaData(naming_convention=convention)
 
+# How often a subscriber is emailed: as chapters are sent, or in periodic digests.
+DigestPolicy: TypeAlias = Literal["immediate", "hourly", "daily"]
+DIGEST_POLICIES: tuple[DigestPolicy, ...] = get_args(DigestPolicy)
+
+# Whether a subscriber is emailed the epubs themselves, or links to download them.
+DeliveryMode: TypeAlias = Literal["attachment", "link"]
+DELIVERY_MODES: tuple[DeliveryMode, ...] = get_args(DeliveryMode)
+
 
 class Base(DeclarativeBase):
     metadata = metadata
@@ -49,6 +65,26 @@ def utcnow() -> datetime:
     return now("UTC")
 
 
+def as_utc(d: datetime) -> datetime:
+    """Return a stored datetime as (timezone aware) UTC.
+
+    SQLite drops timezones, and all stored datetimes are UTC.
+    """
+    if d.tzinfo is None:
+        return d.replace(tzinfo=timezone.utc)
+    return d
+
+
+def hash_content(content: str) -> str:
+    """Hash chapter content, ignoring differences in unicode form and whitespace."""
+    normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", content)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _default_content_hash(context) -> str:
+    return hash_content(context.get_current_parameters()["content"])
+
+
 class Series(Base):
     __tablename__ = "series"
 
@@ -74,13 +110,33 @@ class Series(Base):
         DateTime(timezone=True), default=None
     )
 
+    # When the series is next due to be checked for updates (see `schedule`).
+    next_check_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), default=None, index=True
+    )
+    # The number of consecutive checks which found no new chapters.
+    idle_checks: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
     ebook: Mapped[bytes | None] = mapped_column(LargeBinary, default=None)
+    # Whether the stored epub includes chapters revised since it was built, and so
+    # must be rebuilt (rather than only extended with new chapters).
+    ebook_stale: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
 
     chapters: Mapped[list[Chapter]] = relationship(
         "Chapter",
         back_populates="series",
         order_by="Chapter.number",
     )
+    volumes: Mapped[list[SeriesVolume]] = relationship(
+        "SeriesVolume",
+        back_populates="series",
+        order_by="SeriesVolume.number",
+        cascade="all, delete-orphan",
+    )
     email_subscribers: Mapped[list[EmailSubscriber]] = relationship(
         "EmailSubscriber",
         secondary="email_subscription",
@@ -106,9 +162,16 @@ class Chapter(Base):
     url: Mapped[str] = mapped_column(Text, nullable=False)
 
     number: Mapped[int] = mapped_column(Integer, nullable=False)
+    # The site's own grouping of the chapter (e.g. a Royal Road volume), if any.
+    volume_id: Mapped[str | None] = mapped_column(String, nullable=True, default=None)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(
+        String, nullable=True, default=_default_content_hash
+    )
 
     ebook: Mapped[bytes | None] = mapped_column(LargeBinary, default=None)
+    # The (compressed) raw page the chapter was extracted from, if retained.
+    page: Mapped[bytes | None] = mapped_column(LargeBinary, default=None, deferred=True)
 
     sent_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), default=None
@@ -136,11 +199,134 @@ class Chapter(Base):
     def filename(self) -> str:
         return f"{self.series.title}: {self.title}.epub"
 
+    def revise(self, content: str) -> bool:
+        """Replace the chapter's content, if it has meaningfully changed.
+
+        The prior content is retained as a `ChapterRevision`, and any ebooks
+        which include the chapter are invalidated so they'll be rebuilt. The
+        series' epub is kept (to be served until then), but marked stale.
+        """
+        current_hash = self.content_hash or hash_content(self.content)
+        new_hash = hash_content(content)
+        if new_hash == current_hash:
+            self.content_hash = current_hash
+            return False
+
+        self.revisions.append(
+            ChapterRevision(content=self.content, content_hash=current_hash)
+        )
+        self.content = content
+        self.content_hash = new_hash
+        self.ebook = None
+        if self.series.ebook is not None:
+            self.series.ebook_stale = True
+        for volume in self.series.volumes:
+            if volume.first_number <= self.number <= volume.last_number:
+                volume.ebook = None
+        return True
+
     series: Mapped[Series] = relationship(
         "Series",
         back_populates="chapters",
         uselist=False,
     )
+    revisions: Mapped[list[ChapterRevision]] = relationship(
+        "ChapterRevision",
+        back_populates="chapter",
+        order_by="ChapterRevision.id",
+        cascade="all, delete-orphan",
+    )
+
+
+class ChapterRevision(Base):
+    """A prior version of a chapter's content, superseded by an upstream edit."""
+
+    __tablename__ = "chapter_revision"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    chapter_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("chapter.id"), nullable=False, index=True
+    )
+
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=utcnow
+    )
+
+    chapter: Mapped[Chapter] = relationship(
+        "Chapter",
+        back_populates="revisions",
+        uselist=False,
+    )
+
+
+class SeriesVolume(Base):
+    """The epub of one volume (`first_number` to `last_number`) of a long series.
+
+    See `series export`'s volume options. Each volume is stored separately, so
+    that new chapters only require the last volume to be rebuilt.
+    """
+
+    __tablename__ = "series_volume"
+    __table_args__ = (UniqueConstraint("series_id", "number"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    series_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("series.id", ondelete="CASCADE"), nullable=False
+    )
+    number: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    first_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_number: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    ebook: Mapped[bytes | None] = mapped_column(
+        LargeBinary, default=None, deferred=True
+    )
+
+    series: Mapped[Series] = relationship(
+        "Series",
+        back_populates="volumes",
+        uselist=False,
+    )
+
+
+class FrontierEntry(Base):
+    """A discovered chapter of a series, which has yet to be collected.
+
+    Entries are claimed by a worker (for a limited lease) while being collected,
+    and deleted once the chapter has been stored. Failed attempts are recorded,
+    so an interrupted crawl resumes from where it left off; and an entry whose
+    fetch should be retried isn't claimable again until `retry_at`.
+    """
+
+    __tablename__ = "crawl_frontier"
+    __table_args__ = (UniqueConstraint("series_id", "url"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    series_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("series.id"), nullable=False
+    )
+
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    title: Mapped[str | None] = mapped_column(String, nullable=True, default=None)
+    number: Mapped[int] = mapped_column(Integer, nullable=False)
+    volume_id: Mapped[str | None] = mapped_column(String, nullable=True, default=None)
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
+    retry_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=None
+    )
+
+    claimed_by: Mapped[str | None] = mapped_column(String, nullable=True, default=None)
+    claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=None
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=utcnow
+    )
 
 
 class EmailSubscriber(Base):
@@ -152,6 +338,17 @@ class EmailSubscriber(Base):
         DateTime(timezone=True), nullable=False, default=utcnow
     )
 
+    digest: Mapped[DigestPolicy] = mapped_column(
+        String, nullable=False, default="immediate", server_default="immediate"
+    )
+    # When the subscriber was last sent a digest (see `digest`).
+    digest_sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=None
+    )
+    delivery: Mapped[DeliveryMode] = mapped_column(
+        String, nullable=False, default="attachment", server_default="attachment"
+    )
+
     email_subscriptions: Mapped[list[EmailSubscription]] = relationship(
         overlaps="email_subcribers"
     )
@@ -177,3 +374,99 @@ class EmailSubscription(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=utcnow
     )
+
+
+class DownloadLink(Base):
+    """A (signed, expiring) link to download the epub of a block of chapters.
+
+    A link to a single chapter is to that chapter's own epub; otherwise the epub of
+    the series' chapters `first_number` to `last_number` is built when it's first
+    downloaded.
+    """
+
+    __tablename__ = "download_link"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    series_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("series.id"), nullable=False
+    )
+    chapter_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("chapter.id"), nullable=True, default=None
+    )
+    subscriber_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("email_subscriber.id", ondelete="SET NULL"),
+        nullable=True,
+        default=None,
+    )
+
+    first_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_number: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=utcnow
+    )
+
+    series: Mapped[Series] = relationship()
+    accesses: Mapped[list[DownloadAccess]] = relationship(
+        back_populates="link", order_by="DownloadAccess.accessed_at"
+    )
+
+
+class DownloadAccess(Base):
+    __tablename__ = "download_access"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    link_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("download_link.id"), nullable=False, index=True
+    )
+
+    remote_addr: Mapped[str | None] = mapped_column(String, nullable=True)
+    user_agent: Mapped[str | None] = mapped_column(Text, nullable=True)
+    accessed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=utcnow
+    )
+
+    link: Mapped[DownloadLink] = relationship(back_populates="accesses")
+
+
+@event.listens_for(metadata, "after_create")
+def _create_chapter_search(target, connection, **kw):
+    from chapter_sync.search import ddl
+
+    for statement in ddl(connection.dialect.name):
+        connection.execute(text(statement))
+
+
+@event.listens_for(metadata, "before_drop")
+def _drop_chapter_search(target, connection, **kw):
+    from chapter_sync.search import drop_ddl
+
+    for statement in drop_ddl(connection.dialect.name):
+        connection.execute(text(statement))
+
+
+@event.listens_for(Chapter, "after_insert")
+def _index_chapter(mapper, connection, target: Chapter):
+    from chapter_sync.search import index_chapter
+
+    index_chapter(connection, target)
+
+
+@event.listens_for(Chapter, "after_update")
+def _reindex_chapter(mapper, connection, target: Chapter):
+    from chapter_sync.search import index_chapter
+
+    attrs = inspect(target).attrs
+    if attrs.content.history.has_changes() or attrs.title.history.has_changes():
+        index_chapter(connection, target)
+
+
+@event.listens_for(Chapter, "after_delete")
+def _unindex_chapter(mapper, connection, target: Chapter):
+    from chapter_sync.search import unindex_chapter
+
+    unindex_chapter(connection, target.id)
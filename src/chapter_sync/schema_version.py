@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import importlib.resources
+import json
+import os
+from pathlib import Path
+
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import OperationalError
+
+
+def cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "chapter-sync" / "schema.json"
+
+
+def migrations_key() -> str:
+    """Identify the installed migrations, and therefore their head revision.
+
+    The package version alone isn't enough, since migrations are added between
+    releases.
+    """
+    try:
+        version = importlib.metadata.version("chapter-sync")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+
+    versions = importlib.resources.files("chapter_sync.migrations") / "versions"
+    names = sorted(f.name for f in versions.iterdir() if f.name.endswith(".py"))
+    digest = hashlib.sha1("\n".join(names).encode()).hexdigest()[:12]  # noqa: S324
+    return f"{version}+{digest}"
+
+
+def cached_head() -> str | None:
+    """Return the head revision recorded by `cache_head`, for these migrations."""
+    try:
+        cache = json.loads(cache_path().read_text())
+    except (OSError, ValueError):
+        return None
+
+    return cache.get(migrations_key())
+
+
+def cache_head(head: str):
+    # The cache is only an optimization, so being unable to write it is no matter.
+    path = cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({migrations_key(): head}))
+    except OSError:
+        pass
+
+
+def current_revision(conn: Connection) -> str | None:
+    try:
+        revisions = conn.scalars(text("SELECT version_num FROM alembic_version")).all()
+    except OperationalError:
+        # A new database, without even alembic's table.
+        conn.rollback()
+        return None
+
+    if len(revisions) != 1:
+        return None
+    return revisions[0]
+
+
+def is_current(conn: Connection) -> bool:
+    """Check whether the database is (known to be) migrated to the head revision.
+
+    This avoids loading alembic, and scanning its migrations, to determine the
+    head revision on every invocation. If the head isn't cached, the answer is
+    conservatively `False`.
+    """
+    head = cached_head()
+    return head is not None and current_revision(conn) == head
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import html
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from sqlalchemy import Connection, select, text
+from sqlalchemy.orm import Session, joinedload
+
+from chapter_sync.schema import Chapter
+
+# Sentinels wrapped around matched terms in snippets. They're control characters,
+# so they can't collide with real chapter text, and are swapped for output-specific
+# markup (html/rich) at render time.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+sqlite_ddl = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chapter_search "
+    "USING fts5(title, content, tokenize='porter unicode61')",
+]
+sqlite_drop_ddl = ["DROP TABLE IF EXISTS chapter_search"]
+
+postgresql_ddl = [
+    """
+    CREATE TABLE IF NOT EXISTS chapter_search (
+        chapter_id INTEGER PRIMARY KEY REFERENCES chapter (id) ON DELETE CASCADE,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', title), 'A')
+            || setweight(to_tsvector('english', content), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_chapter_search_document "
+    "ON chapter_search USING gin (document)",
+]
+postgresql_drop_ddl = ["DROP TABLE IF EXISTS chapter_search"]
+
+
+@dataclass
+class SearchResult:
+    chapter: Chapter
+    rank: float
+    snippet: str
+
+    def html_snippet(self) -> str:
+        return highlight(self.snippet, "<mark>", "</mark>", escape=html.escape)
+
+
+def chapter_text(content: str) -> str:
+    """Strip the markup from a chapter's content, leaving only the searchable text."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    return soup.get_text(" ", strip=True)
+
+
+def index_chapter(connection: Connection, chapter: Chapter):
+    key = _key_column(connection)
+    unindex_chapter(connection, chapter.id)
+    connection.execute(
+        text(
+            f"INSERT INTO chapter_search ({key}, title, content) "  # noqa: S608
+            "VALUES (:id, :title, :content)"
+        ),
+        {
+            "id": chapter.id,
+            "title": chapter.title,
+            "content": chapter_text(chapter.content),
+        },
+    )
+
+
+def unindex_chapter(connection: Connection, chapter_id: int):
+    key = _key_column(connection)
+    connection.execute(
+        text(f"DELETE FROM chapter_search WHERE {key} = :id"),  # noqa: S608
+        {"id": chapter_id},
+    )
+
+
+def search_chapters(
+    database: Session,
+    query: str,
+    *,
+    series: int | None = None,
+    limit: int = 20,
+) -> list[SearchResult]:
+    """Search the indexed chapter text, returning the best matches first."""
+    terms = query.split()
+    if not terms:
+        return []
+
+    if database.get_bind().dialect.name == "postgresql":
+        statement = _postgresql_query(series)
+        params = {"query": query}
+    else:
+        statement = _sqlite_query(series)
+        params = {"query": " ".join(_quote_term(t) for t in terms)}
+
+    rows = database.execute(
+        text(statement),
+        {
+            **params,
+            "series": series,
+            "limit": limit,
+            "start": MATCH_START,
+            "end": MATCH_END,
+        },
+    ).all()
+    if not rows:
+        return []
+
+    chapters = {
+        c.id: c
+        for c in database.scalars(
+            select(Chapter)
+            .options(joinedload(Chapter.series))
+            .where(Chapter.id.in_([row.id for row in rows]))
+        )
+    }
+    return [
+        SearchResult(chapter=chapters[row.id], rank=row.rank, snippet=row.snippet)
+        for row in rows
+        if row.id in chapters
+    ]
+
+
+def highlight(snippet: str, start: str, end: str, *, escape=None) -> str:
+    if escape is not None:
+        snippet = escape(snippet)
+    return snippet.replace(MATCH_START, start).replace(MATCH_END, end)
+
+
+def ddl(dialect: str) -> Sequence[str]:
+    if dialect == "postgresql":
+        return postgresql_ddl
+    return sqlite_ddl
+
+
+def drop_ddl(dialect: str) -> Sequence[str]:
+    if dialect == "postgresql":
+        return postgresql_drop_ddl
+    return sqlite_drop_ddl
+
+
+def _key_column(connection: Connection) -> str:
+    if connection.dialect.name == "postgresql":
+        return "chapter_id"
+    return "rowid"
+
+
+def _quote_term(term: str) -> str:
+    # Quoting every term avoids FTS5 interpreting user input as query syntax
+    # (e.g. a stray `"` or `-`); the terms are implicitly AND-ed together.
+    escaped = term.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def _sqlite_query(series: int | None) -> str:
+    series_filter = "AND chapter.series_id = :series" if series is not None else ""
+    return f"""
+        SELECT
+            chapter.id AS id,
+            bm25(chapter_search, 10.0, 1.0) AS rank,
+            snippet(chapter_search, 1, :start, :end, '…', 16) AS snippet
+        FROM chapter_search
+        JOIN chapter ON chapter.id = chapter_search.rowid
+        WHERE chapter_search MATCH :query {series_filter}
+        ORDER BY rank
+        LIMIT :limit
+    """  # noqa: S608
+
+
+def _postgresql_query(series: int | None) -> str:
+    series_filter = "AND chapter.series_id = :series" if series is not None else ""
+    return f"""
+        SELECT
+            chapter.id AS id,
+            ts_rank(chapter_search.document, q) AS rank,
+            ts_headline(
+                'english',
+                chapter_search.content,
+                q,
+                'StartSel=' || :start || ', StopSel=' || :end || ', MaxWords=32, MinWords=8'
+            ) AS snippet
+        FROM chapter_search
+        JOIN chapter ON chapter.id = chapter_search.chapter_id
+        CROSS JOIN websearch_to_tsquery('english', :query) AS q
+        WHERE chapter_search.document @@ q {series_filter}
+        ORDER BY rank DESC
+        LIMIT :limit
+    """  # noqa: S608
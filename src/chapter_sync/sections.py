@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+
+from bs4 import BeautifulSoup, NavigableString, PageElement, Tag
+
+# Elements which only wrap a chapter's content, and are descended through to find
+# the blocks it can be split between.
+WRAPPERS = {"article", "body", "div", "main", "section"}
+
+
+def split_content(
+    content: str, max_bytes: int, filename: Callable[[int], str]
+) -> list[str]:
+    """Split (oversized) chapter content into sections of at most `max_bytes`.
+
+    Content is only split between its block-level elements, so a single block
+    larger than `max_bytes` is left whole. Each section retains the elements
+    wrapping the content (and therefore their styling), and links to a fragment
+    of the chapter which is now in another section are pointed at that section's
+    `filename` (given the section's 1-based index).
+
+    Examples:
+        >>> split_content('<div class="c"><p>one</p><p>two</p></div>', 16, str)
+        ['<div class="c"><p>one</p></div>', '<div class="c"><p>two</p></div>']
+    """
+    if len(content.encode()) <= max_bytes:
+        return [content]
+
+    soup = BeautifulSoup(content, "html.parser")
+
+    container: Tag = soup
+    wrappers: list[Tag] = []
+    while True:
+        children = [c for c in container.contents if not _is_whitespace(c)]
+        if not (
+            len(children) == 1
+            and isinstance(children[0], Tag)
+            and children[0].name in WRAPPERS
+        ):
+            break
+        container = children[0]
+        wrappers.append(container)
+
+    sections: list[list[PageElement]] = [[]]
+    size = 0
+    for child in list(container.contents):
+        child_size = len(str(child).encode())
+        if sections[-1] and size + child_size > max_bytes:
+            sections.append([])
+            size = 0
+        sections[-1].append(child)
+        size += child_size
+
+    if len(sections) == 1:
+        return [content]
+
+    _relink(sections, filename)
+    return [str(_wrap(soup, section, wrappers)) for section in sections]
+
+
+def _is_whitespace(element: PageElement) -> bool:
+    return isinstance(element, NavigableString) and not element.strip()
+
+
+def _tags(section: Sequence[PageElement]):
+    for element in section:
+        if isinstance(element, Tag):
+            yield element
+            yield from element.find_all(True)
+
+
+def _relink(sections: list[list[PageElement]], filename: Callable[[int], str]):
+    targets = {
+        tag["id"]: index
+        for index, section in enumerate(sections, start=1)
+        for tag in _tags(section)
+        if tag.get("id")
+    }
+
+    for index, section in enumerate(sections, start=1):
+        for tag in _tags(section):
+            href = tag.get("href")
+            if tag.name != "a" or not isinstance(href, str) or not href.startswith("#"):
+                continue
+
+            target = targets.get(href[1:])
+            if target is not None and target != index:
+                tag["href"] = filename(target) + href
+
+
+def _wrap(
+    soup: BeautifulSoup, section: list[PageElement], wrappers: list[Tag]
+) -> PageElement | str:
+    if not wrappers:
+        return "".join(str(element) for element in section)
+
+    outer = None
+    inner = None
+    for wrapper in wrappers:
+        tag = soup.new_tag(wrapper.name, attrs=dict(wrapper.attrs))
+        if inner is None:
+            outer = tag
+        else:
+            inner.append(tag)
+        inner = tag
+
+    assert outer is not None and inner is not None
+    for element in section:
+        inner.append(element.extract())
+    return outer
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import functools
 import json
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict
 from pathlib import Path
 from typing import Annotated, Any
@@ -8,15 +11,38 @@ from typing import Annotated, Any
 import cappa
 from requests import Session as RequestsSession
 from sqlalchemy import delete, or_, select
-from sqlalchemy.orm import Session, selectinload
-
-from chapter_sync.cli.base import console, database, email_client, requests
-from chapter_sync.cli.series import Add, Export, List, Remove, Send, Set, Subscribe
+from sqlalchemy.orm import Session, selectinload, undefer
+
+from chapter_sync import volumes
+from chapter_sync.cli.base import (
+    console,
+    database,
+    email_client,
+    image_cache,
+    requests,
+)
+from chapter_sync.cli.series import (
+    Add,
+    Export,
+    List,
+    Remove,
+    Reprocess,
+    Send,
+    Set,
+    Subscribe,
+)
 from chapter_sync.console import Console
 from chapter_sync.email import EmailClient
-from chapter_sync.epub import Epub
-from chapter_sync.handlers import detect, get_infer_handler, get_settings_handler
-from chapter_sync.schema import EmailSubscription, Series
+from chapter_sync.handlers import (
+    HandlerTypes,
+    detect,
+    get_infer_handler,
+    get_reprocess_handler,
+    get_settings_handler,
+)
+from chapter_sync.images import PROFILES, ImageCache, ImageEmbedder
+from chapter_sync.request import decompress_page
+from chapter_sync.schema import Chapter, EmailSubscription, Series, SeriesVolume
 
 
 def add(
@@ -159,26 +185,123 @@ def export(
     command: Export,
     database: Annotated[Session, cappa.Dep(database)],
     console: Annotated[Console, cappa.Dep(console)],
+    requests: Annotated[RequestsSession, cappa.Dep(requests)],
+    image_cache: Annotated[ImageCache, cappa.Dep(image_cache)],
 ):
+    from chapter_sync.epub import series_epub
+
     series = get_series(database, command.series)
 
-    ebook = series.ebook
-    if not ebook or command.force:
-        epub = Epub.from_series(series, *series.chapters).write_buffer()
-        ebook = epub.getbuffer()
+    file = Path(command.output or series.filename())
+
+    images = None
+    if command.images:
+        images = ImageEmbedder(
+            requests, PROFILES[command.images], image_cache, console=console
+        )
 
-        if not command.no_save:
-            series.ebook = ebook
-            database.commit()
+    blocks = volume_blocks(
+        command, series.chapters, [] if command.force else series.volumes
+    )
+    if blocks is not None:
+        export_volumes(command, database, console, series, blocks, file, images)
+        return
+
+    # The stored epub is brought up to date with any newer chapters, unless forced
+    # to rebuild it entirely (or it's stale, see `Chapter.revise`).
+    existing = None if command.force or series.ebook_stale else series.ebook
+    ebook = series_epub(
+        series,
+        series.chapters,
+        existing=existing,
+        images=images,
+        max_chapter_size=command.split_chapters * 1024,
+    )
 
-    file = command.output
-    if file is None:
-        file = series.filename()
+    if (ebook != series.ebook or series.ebook_stale) and not command.no_save:
+        series.ebook = ebook
+        series.ebook_stale = False
+        database.commit()
 
-    Path(file).write_bytes(ebook)
+    file.write_bytes(ebook)
     console.info(f"Exported '{file}'")
 
 
+def volume_blocks(
+    command: Export, chapters: Sequence[Chapter], stored: Sequence[SeriesVolume] = ()
+) -> list[list[Chapter]] | None:
+    """Split the chapters into volumes, if any of the volume options were given.
+
+    The `stored` volumes (but the last) keep their chapters (see `extend_volumes`).
+    """
+    options = [command.volume_chapters, command.volume_size, command.by_volume]
+    if sum(bool(o) for o in options) > 1:
+        raise cappa.Exit(
+            "Only one of `--volume-chapters`, `--volume-size` or `--by-volume` "
+            "may be given",
+            code=1,
+        )
+
+    split: Callable[[Sequence[Chapter]], list[list[Chapter]]]
+    if command.volume_chapters:
+        split = functools.partial(volumes.split_by_count, count=command.volume_chapters)
+    elif command.volume_size:
+        max_bytes = command.volume_size * 1024 * 1024
+        split = functools.partial(volumes.split_by_size, max_bytes=max_bytes)
+    elif command.by_volume:
+        split = volumes.split_by_volume_id
+    else:
+        return None
+
+    return volumes.extend_volumes(chapters, stored, split)
+
+
+def export_volumes(
+    command: Export,
+    database: Session,
+    console: Console,
+    series: Series,
+    blocks: Sequence[Sequence[Chapter]],
+    file: Path,
+    images: ImageEmbedder | None = None,
+):
+    """Export each volume of the series, alongside `file`.
+
+    Stored volumes keep their chapters, so new chapters only extend (or follow)
+    the last volume; unless forced, which splits the whole series afresh. Each
+    volume's epub is stored, and only rebuilt when its chapters change.
+    """
+    stored = {v.number: v for v in series.volumes}
+    for number, block in enumerate(blocks, start=1):
+        volume = stored.get(number)
+        existing = None if command.force or volume is None else volume.ebook
+        ebook = volumes.volume_epub(
+            series,
+            number,
+            block,
+            existing=existing,
+            images=images,
+            max_chapter_size=command.split_chapters * 1024,
+        )
+
+        if ebook != existing and not command.no_save:
+            if volume is None:
+                volume = SeriesVolume(number=number)
+                series.volumes.append(volume)
+            volume.first_number = block[0].number
+            volume.last_number = block[-1].number
+            volume.ebook = ebook
+
+        volume_file = file.with_name(f"{file.stem} - Volume {number}{file.suffix}")
+        volume_file.write_bytes(ebook)
+        console.info(f"Exported '{volume_file}'")
+
+    if not command.no_save:
+        # e.g. After splitting the series differently.
+        del series.volumes[len(blocks) :]
+        database.commit()
+
+
 def send(
     command: Send,
     database: Annotated[Session, cappa.Dep(database)],
@@ -188,14 +311,13 @@ def send(
     ebook = series.ebook
     assert ebook
 
-    for subscriber in series.email_subscribers:
-        title = series.filename()
-        email_client.send(
-            subject=title,
-            to=subscriber.email,
-            filename=title,
-            attachment=ebook,
-        )
+    title = series.filename()
+    email_client.send_all(
+        subject=title,
+        to=[subscriber.email for subscriber in series.email_subscribers],
+        filename=title,
+        attachment=ebook,
+    )
 
 
 def set_series(
@@ -220,6 +342,67 @@ def set_series(
     database.commit()
 
 
+def reprocess(
+    command: Reprocess,
+    database: Annotated[Session, cappa.Dep(database)],
+    console: Annotated[Console, cappa.Dep(console)],
+):
+    series = get_series(database, command.series)
+    chapters = database.scalars(
+        select(Chapter)
+        .options(undefer(Chapter.page))
+        .where(Chapter.series_id == series.id, Chapter.page.is_not(None))
+        .order_by(Chapter.number)
+    ).all()
+    if not chapters:
+        console.info("No chapters with saved pages found")
+        return
+
+    args = [
+        (series.type, series.settings, series.id, c.url, c.title, c.number, c.page)
+        for c in chapters
+    ]
+
+    # Extraction is CPU bound (parsing and cleaning), so it's spread across processes.
+    with ProcessPoolExecutor(max_workers=command.workers) as executor:
+        results = executor.map(_reprocess_page, *zip(*args), chunksize=8)
+
+        revised = 0
+        for chapter, content in zip(chapters, results):
+            if content is None:
+                console.warn(f"No content found for chapter: '{chapter.title}'")
+                continue
+
+            if chapter.revise(content):
+                revised += 1
+                console.trace(f"Revised chapter: '{chapter.title}'")
+
+    database.commit()
+    console.info(f"Reprocessed {len(chapters)} chapter(s), {revised} changed")
+
+
+def _reprocess_page(
+    type: HandlerTypes,
+    raw_settings: dict | None,
+    series_id: int,
+    url: str,
+    title: str,
+    number: int,
+    page: bytes,
+) -> str | None:
+    settings_handler = get_settings_handler(type, load=False)
+    settings = settings_handler(raw_settings)
+
+    series = Series(id=series_id, type=type)
+    chapter = Chapter(series_id=series_id, url=url, title=title, number=number)
+
+    reprocess_handler = get_reprocess_handler(type)
+    reprocessed = reprocess_handler(series, settings, chapter, decompress_page(page))
+    if reprocessed is None:
+        return None
+    return reprocessed.content
+
+
 def get_series(database: Session, series: int):
     sub = database.scalars(
         select(Series)
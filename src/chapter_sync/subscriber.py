@@ -27,7 +27,9 @@ def add(
                 code=1,
             )
 
-        subscriber = EmailSubscriber(email=command.email)
+        subscriber = EmailSubscriber(
+            email=command.email, digest=command.digest, delivery=command.delivery
+        )
         database.add(subscriber)
         database.commit()
 
@@ -68,8 +70,8 @@ def list_subscribers(
         console.info("No subscribers found")
         return
 
-    columns = ["ID", "Email"]
-    table_result = [(r.id, r.email) for r in result]
+    columns = ["ID", "Email", "Digest", "Delivery"]
+    table_result = [(r.id, r.email, r.digest, r.delivery) for r in result]
 
     console.table(
         "Subscriber",
@@ -92,6 +94,12 @@ def set_subscriber(
     if command.email:
         subscriber.email = command.email
 
+    if command.digest:
+        subscriber.digest = command.digest
+
+    if command.delivery:
+        subscriber.delivery = command.delivery
+
     if command.series is not None:
         declared_series = set(command.series)
         existing_series = set(subscriber.subscribed_series_by_id)
@@ -1,20 +1,48 @@
 from __future__ import annotations
 
-import time
+import contextlib
+import contextvars
+import itertools
+import signal
+import threading
+from collections import deque
+from collections.abc import Generator, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Annotated
 
 import cappa
 import pendulum
+from requests import Session as RequestsSession
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
-from chapter_sync.cli.base import Sync, Watch, console, database, email_client
-from chapter_sync.console import Console
+from chapter_sync import digest, frontier, links, metrics, schedule, trace, volumes
+from chapter_sync.cli.base import (
+    Sync,
+    SyncOptions,
+    Watch,
+    console,
+    database,
+    email_client,
+    image_cache,
+    requests,
+)
+from chapter_sync.console import Console, render_datetime, render_float
 from chapter_sync.email import EmailClient
-from chapter_sync.epub import Epub
-from chapter_sync.handlers import get_chapter_handler, get_settings_handler
-from chapter_sync.request import requests_session
-from chapter_sync.schema import Chapter, Series
+from chapter_sync.epub import Epub, build_options, epub_build_options, series_epub
+from chapter_sync.handlers import (
+    ChapterLink,
+    get_chapter_handler,
+    get_collect_handler,
+    get_discover_handler,
+    get_refresh_handler,
+    get_settings_handler,
+)
+from chapter_sync.health import HealthFile
+from chapter_sync.images import PROFILES, ImageCache, ImageEmbedder
+from chapter_sync.retry import FetchError
+from chapter_sync.schema import Chapter, EmailSubscriber, Series
 
 
 def watch(
@@ -22,17 +50,82 @@ def watch(
     database: Annotated[Session, cappa.Dep(database)],
     console: Annotated[Console, cappa.Dep(console)],
     email_client: Annotated[EmailClient, cappa.Dep(email_client)],
+    requests: Annotated[RequestsSession, cappa.Dep(requests)],
+    image_cache: Annotated[ImageCache, cappa.Dep(image_cache)],
 ):
+    images = image_embedder(command, requests, image_cache, console)
+
+    # SIGTERM (e.g. `docker stop`) lets the in-progress chapter/email finish and
+    # be committed, rather than interrupting it; so nothing is lost (or resent).
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        console.info("Stopping once in-progress work is complete")
+        stop.set()
+
+    previous_handler = signal.signal(signal.SIGTERM, request_stop)
+
+    health = HealthFile(command.health_file)
+    health.update("starting")
+
     try:
         with console.status("Syncing series") as status:
-            while True:
-                sync(command, database, console, email_client)
+            while not stop.is_set():
+                status.update("Syncing series")
+                health.update("syncing")
+                try:
+                    with tracing(command, console):
+                        sync_series(
+                            command,
+                            database,
+                            console,
+                            email_client,
+                            requests,
+                            images=images,
+                            stop=stop,
+                        )
+                except Exception as e:
+                    health.last_error = repr(e)
+                    raise
+                else:
+                    health.last_error = None
+                finally:
+                    health.iterations += 1
+                    health.last_sync_at = pendulum.now("utc")
 
-                status.update("Sleeping")
-                time.sleep(command.interval)
+                    metrics.last_sync.set(health.last_sync_at.timestamp())
+                    if command.metrics_file:
+                        metrics.registry.write_textfile(command.metrics_file)
+
+                if command.iterations and health.iterations >= command.iterations:
+                    break
+
+                wake_at = next_wake(command, database)
+                health.update("sleeping", next_sync_at=wake_at)
+                status.update(f"Sleeping until {render_datetime(wake_at, True)}")
+
+                timeout = (wake_at - pendulum.now("utc")).total_seconds()
+                stop.wait(max(timeout, 0))
     except KeyboardInterrupt:
         console.info("Stopping")
-        return
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        health.update("stopped")
+
+
+def next_wake(command: Watch, database: Session) -> datetime:
+    """Find when `watch` should next sync: when the next series is due, at the latest."""
+    now = pendulum.now("utc")
+    wake_at = now + timedelta(seconds=command.interval)
+    if not command.schedule:
+        return wake_at
+
+    due_at = schedule.next_due(database, command.series)
+    if due_at is None:
+        return wake_at
+
+    # Wait at least a moment, in case a series is (somehow) perpetually due.
+    return max(min(due_at, wake_at), now + timedelta(seconds=1))
 
 
 def sync(
@@ -40,6 +133,85 @@ def sync(
     database: Annotated[Session, cappa.Dep(database)],
     console: Annotated[Console, cappa.Dep(console)],
     email_client: Annotated[EmailClient, cappa.Dep(email_client)],
+    requests: Annotated[RequestsSession, cappa.Dep(requests)],
+    image_cache: Annotated[ImageCache, cappa.Dep(image_cache)],
+):
+    images = image_embedder(command, requests, image_cache, console)
+    with tracing(command, console):
+        sync_series(command, database, console, email_client, requests, images=images)
+
+
+def image_embedder(
+    command: SyncOptions,
+    requests: RequestsSession,
+    image_cache: ImageCache,
+    console: Console,
+) -> ImageEmbedder | None:
+    if command.images is None:
+        return None
+    return ImageEmbedder(
+        requests, PROFILES[command.images], image_cache, console=console
+    )
+
+
+@contextlib.contextmanager
+def tracing(command: SyncOptions, console: Console) -> Generator[None, None, None]:
+    """Trace the enclosed sync, if requested; then export and/or report the trace."""
+    if not (command.profile or command.trace_file):
+        yield
+        return
+
+    trace.tracer.enabled = True
+    try:
+        with trace.span("sync"):
+            yield
+    finally:
+        trace.tracer.enabled = False
+        spans = trace.tracer.collect()
+
+        if command.trace_file:
+            trace.export_otlp(spans, command.trace_file)
+
+        if command.profile:
+            report_profile(spans, console)
+
+
+def report_profile(spans: Sequence[trace.Span], console: Console, limit: int = 10):
+    stages = [s for s in trace.summarize_stages(spans) if s.name != "sync"]
+    console.table(
+        "Slowest stages",
+        ["Stage", "Count", "Total (s)", "Self (s)", "Max (s)"],
+        [
+            (
+                s.name,
+                s.count,
+                render_float(s.total_ns / 1e9, 3),
+                render_float(s.self_ns / 1e9, 3),
+                render_float(s.max_ns / 1e9, 3),
+            )
+            for s in stages[:limit]
+        ],
+    )
+
+    console.table(
+        "Slowest series",
+        ["Series", "Total (s)"],
+        [
+            (name, render_float(duration_ns / 1e9, 3))
+            for name, duration_ns in trace.summarize_series(spans)[:limit]
+        ],
+    )
+
+
+def sync_series(
+    command: SyncOptions,
+    database: Session,
+    console: Console,
+    email_client: EmailClient,
+    requests: RequestsSession,
+    *,
+    images: ImageEmbedder | None = None,
+    stop: threading.Event | None = None,
 ):
     query = select(Series).options(selectinload(Series.chapters))
     if command.series:
@@ -47,42 +219,174 @@ def sync(
 
     series = database.scalars(query).all()
 
-    console.info(f"Found {len(series)} series")
+    # Only updates are scheduled; whatever's already been collected is saved and
+    # sent regardless. Due series are synced first, the most overdue first.
+    due = {s.id for s in series}
+    if command.schedule:
+        due_series = schedule.due(series)
+        due = {s.id for s in due_series}
+        series = [*due_series, *(s for s in series if s.id not in due)]
+
+    console.info(f"Found {len(series)} series ({len(due)} due)")
 
     for s in series:
-        if command.update:
-            update_series(database, s, console)
-            console.info(f"Updated series: '{s.name}'")
+        if stop and stop.is_set():
+            break
+
+        with trace.span("series", series=s.name):
+            try:
+                if command.update and s.id in due:
+                    known_chapters = len(s.chapters)
+                    update_series(
+                        database,
+                        s,
+                        console,
+                        requests,
+                        save_pages=command.save_pages,
+                        workers=command.workers,
+                        stop=stop,
+                    )
+                    if stop and stop.is_set():
+                        # The update may be incomplete, so the series is still due.
+                        break
+
+                    console.info(f"Updated series: '{s.name}'")
+
+                    new_chapters = len(s.chapters) - known_chapters
+                    metrics.chapters_collected.inc(new_chapters, series=s.name)
+                    schedule.record_check(s, new_chapters=new_chapters)
+                    _commit(database)
 
-        if command.save:
-            save_series_ebooks(command, database, s, console)
+                if command.recheck:
+                    recheck_series(database, s, command.recheck, console, requests)
+            except FetchError as e:
+                # The site is down (or at least, failing), so there's no sense
+                # waiting on it; but whatever was already collected can still be
+                # saved/sent.
+                database.rollback()
+                console.warn(f"Skipped updating series '{s.name}': {e}")
 
-        if command.send:
-            send_series(command, database, s, email_client, console)
+                schedule.record_failure(s)
+                _commit(database)
 
+            if command.save:
+                save_series_ebooks(command, database, s, console, images=images)
 
-def update_series(database: Session, series: Series, console: Console):
+            if command.send:
+                send_series(
+                    command,
+                    database,
+                    s,
+                    email_client,
+                    console,
+                    images=images,
+                    stop=stop,
+                )
+
+    if command.send and not (stop and stop.is_set()):
+        send_digests(command, database, email_client, console, images=images, stop=stop)
+
+
+@trace.traced()
+def update_series(
+    database: Session,
+    series: Series,
+    console: Console,
+    requests: RequestsSession,
+    *,
+    save_pages: bool = False,
+    workers: int = 1,
+    stop: threading.Event | None = None,
+):
     settings_handler = get_settings_handler(series.type, load=False)
     settings = settings_handler(series.settings)
 
-    requests = requests_session()
-    chapter_handler = get_chapter_handler(series.type)
-    for chapter in chapter_handler(requests, series, settings, console):
-        database.add(chapter)
-        database.commit()
+    # Series whose chapters can be discovered up front are crawled through the
+    # frontier, so that an interrupted crawl resumes from the chapters still
+    # pending. They're rediscovered regardless (which only enqueues unknown urls),
+    # so that chapters released since aren't held up behind them.
+    assert series.id is not None
+    discover_handler = get_discover_handler(series.type)
+    links = discover_handler(requests, series, settings, console)
+    if links is None:
+        chapter_handler = get_chapter_handler(series.type)
+        for chapter in chapter_handler(
+            requests, series, settings, console, save_pages=save_pages
+        ):
+            database.add(chapter)
+            _commit(database)
+
+            if stop and stop.is_set():
+                break
+        return
+
+    frontier.enqueue(database, series.id, links)
+
+    # Chapters are collected on worker threads, which mustn't touch the session
+    # (nor, therefore, any of its instances).
+    detached = Series(
+        id=series.id,
+        name=series.name,
+        url=series.url,
+        type=series.type,
+        title=series.title,
+        settings=series.settings,
+    )
+    collect_handler = get_collect_handler(series.type)
 
+    def collect(link: ChapterLink) -> Chapter | None:
+        return collect_handler(
+            requests, detached, settings, link, console, save_pages=save_pages
+        )
 
+    frontier.drain(
+        database, series.id, collect, console=console, workers=workers, stop=stop
+    )
+
+
+@trace.traced()
+def recheck_series(
+    database: Session,
+    series: Series,
+    count: int,
+    console: Console,
+    requests: RequestsSession,
+):
+    """Re-collect the most recent `count` chapters, revising any which have changed."""
+    settings_handler = get_settings_handler(series.type, load=False)
+    settings = settings_handler(series.settings)
+
+    refresh_handler = get_refresh_handler(series.type)
+    for chapter in series.chapters[-count:]:
+        refreshed = refresh_handler(requests, series, settings, chapter, console)
+        if refreshed is None:
+            continue
+
+        if chapter.revise(refreshed.content):
+            console.info(f"Revised chapter: '{chapter.title}'")
+        _commit(database)
+
+
+@trace.traced()
 def save_series_ebooks(
-    command: Sync, database: Session, series: Series, console: Console
+    command: SyncOptions,
+    database: Session,
+    series: Series,
+    console: Console,
+    *,
+    images: ImageEmbedder | None = None,
 ):
+    max_chapter_size = command.split_chapters * 1024
     for chapter in series.chapters:
         console.info(f"Saving chapter: '{chapter.title}'")
-        if chapter.ebook:
+        if chapter.ebook and _current(chapter.ebook, images, max_chapter_size):
             continue
 
-        ebook = Epub.from_series(series, chapter).write_buffer()
+        ebook = Epub.from_series(
+            series, chapter, images=images, max_chapter_size=max_chapter_size
+        ).write_buffer()
         chapter.ebook = ebook.getbuffer().tobytes()
-        database.commit()
+        _commit(database)
 
         if command.export_to:
             output_file = command.export_to / chapter.filename()
@@ -91,54 +395,371 @@ def save_series_ebooks(
             output_file.write_bytes(ebook)
             console.info(f"Auto-exported '{output_file}'")
 
+    # Only a series' stored epub(s) (see `series export`) are kept up to date,
+    # which costs only as much as its new chapters; unless chapters it includes
+    # have since been revised, and it has to be rebuilt.
+    if series.ebook is not None:
+        existing = None if series.ebook_stale else series.ebook
+        ebook = series_epub(
+            series,
+            series.chapters,
+            existing=existing,
+            images=images,
+            max_chapter_size=max_chapter_size,
+        )
+        if ebook != series.ebook or series.ebook_stale:
+            series.ebook = ebook
+            series.ebook_stale = False
+            _commit(database)
+            console.info(f"Updated series ebook: '{series.name}'")
+
+    # New chapters are added to the last volume, until the series is next exported
+    # (and its last volume split, if need be).
+    stored = sorted(series.volumes, key=lambda v: v.number)
+    for volume, block in zip(
+        stored, volumes.stored_blocks(series.chapters, stored), strict=True
+    ):
+        if not block:
+            continue
+
+        ebook = volumes.volume_epub(
+            series,
+            volume.number,
+            block,
+            existing=volume.ebook,
+            images=images,
+            max_chapter_size=max_chapter_size,
+        )
+        if ebook != volume.ebook:
+            volume.last_number = block[-1].number
+            volume.ebook = ebook
+            _commit(database)
+            console.info(f"Updated volume {volume.number} ebook: '{series.name}'")
 
+
+@trace.traced()
 def send_series(
-    command: Sync,
+    command: SyncOptions,
     database: Session,
     series: Series,
     email_client: EmailClient,
     console: Console,
+    *,
+    images: ImageEmbedder | None = None,
+    stop: threading.Event | None = None,
 ):
-    subscribers = series.email_subscribers
+    # Digest subscribers are sent these chapters later, by `send_digests`.
+    subscribers = [s for s in series.email_subscribers if s.digest == "immediate"]
+    attach_to, link_to = by_delivery(command, subscribers, console)
     unsent_chapters = [c for c in series.chapters if c.sent_at is None]
+    blocks = chapter_blocks(
+        unsent_chapters,
+        contiguous=command.contiguous_chapters,
+        max_bytes=command.max_attachment_size * 1024 * 1024,
+    )
+    ebooks = block_ebooks(
+        series,
+        blocks if attach_to else [],
+        workers=command.workers,
+        images=images,
+        max_chapter_size=command.split_chapters * 1024,
+    )
 
-    if command.contiguous_chapters:
-        last_chapter = -1
-        contiguous_blocks: list[list[Chapter]] = []
-        for chapter in unsent_chapters:
-            if chapter.number == last_chapter + 1:
-                contiguous_blocks[-1].append(chapter)
-            else:
-                contiguous_blocks.append([chapter])
-            last_chapter = chapter.number
-    else:
-        contiguous_blocks = [[c] for c in unsent_chapters]
+    # Every block is sent over the same SMTP connection.
+    connection: contextlib.AbstractContextManager = contextlib.nullcontext()
+    if subscribers and blocks:
+        connection = email_client.connection()
 
-    for block in contiguous_blocks:
-        if len(block) == 1 and block[0].ebook is not None:
-            chapter = block[0]
+    with connection, contextlib.closing(ebooks):
+        for block in blocks:
+            if stop and stop.is_set():
+                break
 
-            assert chapter.ebook is not None
-            ebook = chapter.ebook
+            titles = ", ".join([chapter.title for chapter in block])
+            console.info(f"Sending chapters: {titles}")
+
+            if attach_to:
+                title, ebook = next(ebooks)
+                email_client.send_all(
+                    subject=title,
+                    to=[subscriber.email for subscriber in attach_to],
+                    filename=title,
+                    attachment=ebook,
+                )
+
+            for subscriber in link_to:
+                title, url = download_link(command, database, series, block, subscriber)
+                email_client.send_books(
+                    subject=title,
+                    to=[subscriber.email],
+                    books={},
+                    body=f"{title} is ready to download:\n\n{url}\n",
+                )
+
+            for chapter in block:
+                chapter.sent_at = pendulum.now("utc")
+
+            _commit(database)
+            console.trace("Chapter(s) sent")
+
+
+def by_delivery(
+    command: SyncOptions, subscribers: Sequence[EmailSubscriber], console: Console
+) -> tuple[list[EmailSubscriber], list[EmailSubscriber]]:
+    """Split subscribers into those to be sent attachments, and those sent links.
+
+    Links require `--public-url` and `--link-secret`; lacking those, everyone is
+    sent attachments.
+    """
+    link_to = [s for s in subscribers if s.delivery == "link"]
+    if link_to and not (command.public_url and command.link_secret):
+        console.warn(
+            "Sending download links requires `--public-url` and `--link-secret`, "
+            "sending attachments instead"
+        )
+        link_to = []
+
+    attach_to = [s for s in subscribers if s not in link_to]
+    return attach_to, link_to
 
-            title = chapter.filename()
+
+def download_link(
+    command: SyncOptions,
+    database: Session,
+    series: Series,
+    block: Sequence[Chapter],
+    subscriber: EmailSubscriber,
+) -> tuple[str, str]:
+    """Create a subscriber's link to download a block of chapters' epub.
+
+    Returns the title of the epub, and the link's url.
+    """
+    assert command.public_url and command.link_secret
+
+    link = links.create_link(
+        database,
+        series,
+        block,
+        ttl=timedelta(days=command.link_ttl),
+        subscriber=subscriber,
+    )
+    url = links.url(link, public_url=command.public_url, secret=command.link_secret)
+
+    if link.chapter_id is not None:
+        return block[0].filename(), url
+    return volumes.block_title(series, block), url
+
+
+def chapter_blocks(
+    chapters: Sequence[Chapter],
+    *,
+    contiguous: bool = True,
+    max_bytes: int | None = None,
+) -> list[list[Chapter]]:
+    """Group chapters into the blocks which are each sent as one epub.
+
+    Blocks are planned (from the chapters' stored sizes) to produce epubs of at
+    most `max_bytes`, before any are built.
+    """
+    if not contiguous:
+        return [[c] for c in chapters]
+
+    last_chapter = -1
+    blocks: list[list[Chapter]] = []
+    for chapter in chapters:
+        if chapter.number == last_chapter + 1:
+            blocks[-1].append(chapter)
         else:
-            ebook = Epub.from_series(series, *block).write_buffer().read()
-            title = f"{series.name} - Chapters {block[0].number} to {block[-1].number}"
+            blocks.append([chapter])
+        last_chapter = chapter.number
 
-        titles = ", ".join([chapter.title for chapter in block])
-        console.info(f"Sending chapters: {titles}")
+    return [v for block in blocks for v in volumes.split_by_size(block, max_bytes)]
 
-        for subscriber in subscribers:
-            email_client.send(
-                subject=title,
-                to=subscriber.email,
-                filename=title,
-                attachment=ebook,
-            )
 
-        for chapter in block:
-            chapter.sent_at = pendulum.now("utc")
+def block_ebooks(
+    series: Series,
+    blocks: Iterable[Sequence[Chapter]],
+    *,
+    workers: int = 1,
+    images: ImageEmbedder | None = None,
+    max_chapter_size: int = 0,
+) -> Iterator[tuple[str, bytes]]:
+    """Yield the title and epub of each block of chapters, reusing a chapter's own.
+
+    Up to `workers` epubs are written (and compressed) concurrently, ahead of the
+    one being consumed. They're assembled on this thread though, since the
+    chapters belong to its session.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque[tuple[str, Future[bytes]]] = deque()
+        for block in blocks:
+            if len(block) == 1 and _current(block[0].ebook, images, max_chapter_size):
+                chapter = block[0]
+                assert chapter.ebook is not None
+                built: Future[bytes] = Future()
+                built.set_result(chapter.ebook)
+                pending.append((chapter.filename(), built))
+            else:
+                epub = Epub.from_series(
+                    series, *block, images=images, max_chapter_size=max_chapter_size
+                )
+                title = volumes.block_title(series, block)
+                # Run in a copy of this context, so the write's span is nested
+                # under this one.
+                context = contextvars.copy_context()
+                pending.append((title, executor.submit(context.run, _write, epub)))
+
+            if len(pending) > workers:
+                title, built = pending.popleft()
+                yield title, built.result()
 
+        while pending:
+            title, built = pending.popleft()
+            yield title, built.result()
+
+
+def _commit(database: Session):
+    """Commit the session, within a span (which includes flushing its changes)."""
+    with trace.span("db.commit"):
         database.commit()
-        console.trace("Chapter(s) sent")
+
+
+def _write(epub: Epub) -> bytes:
+    return epub.write_buffer().read()
+
+
+def _current(
+    ebook: bytes | None, images: ImageEmbedder | None, max_chapter_size: int
+) -> bool:
+    """Whether a stored (chapter) epub can be reused, given how it'd be built now."""
+    if ebook is None:
+        return False
+    profile = images.profile.name if images is not None else None
+    return epub_build_options(ebook) == build_options(profile, max_chapter_size)
+
+
+def split_books(
+    books: Sequence[tuple[str, bytes]], max_bytes: int | None
+) -> list[list[tuple[str, bytes]]]:
+    """Split books across as few emails as keep each email within `max_bytes`."""
+    parts: list[list[tuple[str, bytes]]] = []
+    size = 0
+    for book in books:
+        if not parts or (max_bytes and size + len(book[1]) > max_bytes):
+            parts.append([])
+            size = 0
+        parts[-1].append(book)
+        size += len(book[1])
+    return parts
+
+
+@trace.traced()
+def send_digests(
+    command: SyncOptions,
+    database: Session,
+    email_client: EmailClient,
+    console: Console,
+    *,
+    images: ImageEmbedder | None = None,
+    stop: threading.Event | None = None,
+):
+    """Send each due digest subscriber one email, of everything sent since their last."""
+    subscribers = digest.due(database)
+    if not subscribers:
+        return
+
+    _, link_to = by_delivery(command, subscribers, console)
+
+    with email_client.connection():
+        for subscriber in subscribers:
+            if stop and stop.is_set():
+                break
+
+            now = pendulum.now("utc")
+            chapters = digest.pending_chapters(database, subscriber, now)
+            if chapters:
+                console.info(
+                    f"Sending {subscriber.digest} digest of {len(chapters)} "
+                    f"chapter(s) to {subscriber.email}"
+                )
+                send_digest(
+                    command,
+                    database,
+                    email_client,
+                    subscriber,
+                    chapters,
+                    subject=f"Chapter digest: {render_datetime(now, True)}",
+                    link=subscriber in link_to,
+                    images=images,
+                )
+
+            digest.record_digest(subscriber, now)
+            _commit(database)
+
+
+def send_digest(
+    command: SyncOptions,
+    database: Session,
+    email_client: EmailClient,
+    subscriber: EmailSubscriber,
+    chapters: Sequence[Chapter],
+    *,
+    subject: str,
+    link: bool = False,
+    images: ImageEmbedder | None = None,
+):
+    """Send a digest of chapters (of any number of series) to a subscriber.
+
+    Each series' chapters are attached as their own epub(s), or linked to. If the
+    attachments won't all fit within `max_attachment_size`, they're spread across
+    as few emails as they do.
+    """
+    max_bytes = command.max_attachment_size * 1024 * 1024
+    body = "\n".join(f"{c.series.title}: {c.title}" for c in chapters)
+
+    by_series = [
+        (
+            series,
+            chapter_blocks(
+                list(series_chapters),
+                contiguous=command.contiguous_chapters,
+                max_bytes=max_bytes,
+            ),
+        )
+        for series, series_chapters in itertools.groupby(chapters, lambda c: c.series)
+    ]
+
+    if link:
+        urls = [
+            download_link(command, database, series, block, subscriber)
+            for series, blocks in by_series
+            for block in blocks
+        ]
+        body += "\n\nReady to download:\n\n" + "\n".join(
+            f"{title}: {url}" for title, url in urls
+        )
+        email_client.send_books(
+            subject=subject, to=[subscriber.email], books={}, body=body
+        )
+        return
+
+    books: list[tuple[str, bytes]] = []
+    for series, blocks in by_series:
+        books.extend(
+            block_ebooks(
+                series,
+                blocks,
+                workers=command.workers,
+                images=images,
+                max_chapter_size=command.split_chapters * 1024,
+            )
+        )
+
+    parts = split_books(books, max_bytes)
+    for i, part in enumerate(parts, 1):
+        email_client.send_books(
+            subject=f"{subject} ({i}/{len(parts)})" if len(parts) > 1 else subject,
+            to=[subscriber.email],
+            books=dict(part),
+            body=body,
+        )
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import json
+import secrets
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Generator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """A timed stage of work, nested within its parent span (if any)."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    duration_ns: int = 0
+    error: str | None = None
+
+    @property
+    def end_ns(self) -> int:
+        return self.start_ns + self.duration_ns
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+@dataclass
+class Tracer:
+    """Records spans, when enabled; otherwise `span` is (very nearly) free.
+
+    The current span is tracked per context, so spans started on other threads
+    are only nested under the span which started the thread when the thread
+    runs in a copy of its context (see `contextvars.copy_context`).
+    """
+
+    enabled: bool = False
+    spans: list[Span] = field(default_factory=list)
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes) -> Generator[Span | None, None, None]:
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+
+        token = _current_span.set(span)
+        start = time.perf_counter_ns()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.duration_ns = time.perf_counter_ns() - start
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def collect(self) -> list[Span]:
+        """Return, and forget, the spans recorded so far."""
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+
+tracer = Tracer()
+span = tracer.span
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Decorate a function, recording each call to it in a span."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name or fn.__name__):
+                return fn(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def export_otlp(spans: Sequence[Span], path: Path):
+    """Append spans to a file, as a line of OTLP/JSON (`ExportTraceServiceRequest`).
+
+    This is the format read by the OpenTelemetry collector's `otlpjsonfile`
+    receiver, among others.
+    """
+    if not spans:
+        return
+
+    request = {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": "chapter-sync"})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "chapter_sync"},
+                        "spans": [_otlp_span(s) for s in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        f.write(json.dumps(request) + "\n")
+
+
+def _otlp_span(span: Span) -> dict:
+    result: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        # STATUS_CODE_OK / STATUS_CODE_ERROR
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        result["parentSpanId"] = span.parent_id
+    return result
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
+
+
+@dataclass
+class StageSummary:
+    name: str
+    count: int = 0
+    # Including the time spent in child spans.
+    total_ns: int = 0
+    # Excluding the time spent in child spans.
+    self_ns: int = 0
+    max_ns: int = 0
+
+
+def summarize_stages(spans: Sequence[Span]) -> list[StageSummary]:
+    """Summarize spans by name, slowest (by time spent in the stage itself) first."""
+    child_ns: dict[str, int] = defaultdict(int)
+    for s in spans:
+        if s.parent_id:
+            child_ns[s.parent_id] += s.duration_ns
+
+    stages: dict[str, StageSummary] = {}
+    for s in spans:
+        stage = stages.setdefault(s.name, StageSummary(s.name))
+        stage.count += 1
+        stage.total_ns += s.duration_ns
+        # Concurrent children may (in sum) outlast their parent.
+        stage.self_ns += max(s.duration_ns - child_ns[s.span_id], 0)
+        stage.max_ns = max(stage.max_ns, s.duration_ns)
+
+    return sorted(stages.values(), key=lambda stage: stage.self_ns, reverse=True)
+
+
+def summarize_series(spans: Sequence[Span]) -> list[tuple[str, int]]:
+    """Total the time spent on each series (in "series" spans), slowest first."""
+    result: dict[str, int] = defaultdict(int)
+    for s in spans:
+        if s.name == "series":
+            result[s.attributes["series"]] += s.duration_ns
+    return sorted(result.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import itertools
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+from chapter_sync.schema import Chapter, Series, SeriesVolume
+
+if TYPE_CHECKING:
+    from chapter_sync.images import ImageEmbedder
+
+# Roughly the size of what every epub contains, regardless of its chapters
+# (the cover image, styles, front matter, etc).
+EPUB_OVERHEAD = 16 * 1024
+
+
+def estimated_size(chapter: Chapter) -> int:
+    """Estimate the bytes a chapter adds to an epub, without building one.
+
+    A chapter's own epub (see `Chapter.size_kb`) is the best guide, less the
+    overhead it shares with any other epub; failing that, its (uncompressed)
+    content overestimates it.
+    """
+    if chapter.ebook is None:
+        return len(chapter.content.encode())
+
+    return max(int(chapter.size_kb * 1024) - EPUB_OVERHEAD, 0)
+
+
+def split_by_size(
+    chapters: Sequence[Chapter], max_bytes: int | None
+) -> list[list[Chapter]]:
+    """Split chapters into consecutive volumes whose epubs fit within `max_bytes`.
+
+    A chapter which alone exceeds `max_bytes` is given a volume of its own.
+    """
+    if not max_bytes:
+        return [list(chapters)] if chapters else []
+
+    volumes: list[list[Chapter]] = []
+    size = 0
+    for chapter in chapters:
+        chapter_size = estimated_size(chapter)
+        if not volumes or size + chapter_size > max_bytes:
+            volumes.append([])
+            size = EPUB_OVERHEAD
+        volumes[-1].append(chapter)
+        size += chapter_size
+    return volumes
+
+
+def split_by_count(chapters: Sequence[Chapter], count: int) -> list[list[Chapter]]:
+    """Split chapters into consecutive volumes of (at most) `count` chapters."""
+    return [list(chapters[i : i + count]) for i in range(0, len(chapters), count)]
+
+
+def split_by_volume_id(chapters: Sequence[Chapter]) -> list[list[Chapter]]:
+    """Split chapters into the volumes the site groups them by (`Chapter.volume_id`).
+
+    Chapters collected before their volume was recorded share a volume of their own.
+    """
+    return [list(group) for _, group in itertools.groupby(chapters, _volume_id)]
+
+
+def _volume_id(chapter: Chapter) -> str | None:
+    return chapter.volume_id
+
+
+def stored_blocks(
+    chapters: Sequence[Chapter], stored: Sequence[SeriesVolume]
+) -> list[list[Chapter]]:
+    """Group chapters into a series' stored volumes (in order).
+
+    Each volume keeps the chapters it was exported with, except the last, which
+    also takes every chapter since.
+    """
+    ordered = sorted(stored, key=lambda v: v.number)
+    return [
+        [
+            c
+            for c in chapters
+            if volume.first_number <= c.number
+            and (i == len(ordered) - 1 or c.number <= volume.last_number)
+        ]
+        for i, volume in enumerate(ordered)
+    ]
+
+
+def extend_volumes(
+    chapters: Sequence[Chapter],
+    stored: Sequence[SeriesVolume],
+    split: Callable[[Sequence[Chapter]], list[list[Chapter]]],
+) -> list[list[Chapter]]:
+    """Split chapters into volumes, without moving any stored volume's chapters.
+
+    Only the last stored volume (which may not yet be full) is split afresh, along
+    with the chapters since; so an earlier volume never changes, even if the
+    chapters' sizes (or the split itself) do.
+    """
+    if not stored:
+        return split(chapters)
+
+    *frozen, last = stored_blocks(chapters, stored)
+    return [*frozen, *split(last)]
+
+
+def block_title(series: Series, block: Sequence[Chapter]) -> str:
+    """Title the epub of a block of (several) chapters."""
+    return f"{series.name} - Chapters {block[0].number} to {block[-1].number}"
+
+
+def volume_title(series: Series, number: int) -> str:
+    return f"{series.title} - Volume {number}"
+
+
+def volume_epub(
+    series: Series,
+    number: int,
+    block: Sequence[Chapter],
+    *,
+    existing: bytes | None = None,
+    images: ImageEmbedder | None = None,
+    max_chapter_size: int = 0,
+) -> bytes:
+    """Build (or update the `existing` epub of) one volume of a series."""
+    from chapter_sync.epub import series_epub
+
+    return series_epub(
+        series,
+        block,
+        existing=existing,
+        title=volume_title(series, number),
+        id=f"{series.id}-{number}",
+        images=images,
+        max_chapter_size=max_chapter_size,
+    )
@@ -1,8 +1,7 @@
-import io
 from typing import Annotated
 
 from fastapi import Depends, Request
-from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session, joinedload
 from starlette.status import HTTP_302_FOUND
@@ -12,7 +11,9 @@ from chapter_sync.cli.chapter import Export, Send
 from chapter_sync.console import Console
 from chapter_sync.email import EmailClient
 from chapter_sync.schema import Chapter
+from chapter_sync.search import search_chapters
 from chapter_sync.web.dependencies import console, database, email_client, templates
+from chapter_sync.web.responses import ebook_response
 
 
 def find_chapter(db: Session, series_id: int, chapter_id: int) -> Chapter | None:
@@ -43,6 +44,26 @@ def get_chapter(
     )
 
 
+def search(
+    request: Request,
+    db: Annotated[Session, Depends(database)],
+    templates: Annotated[Jinja2Templates, Depends(templates)],
+    q: str = "",
+    series_id: int | None = None,
+):
+    results = search_chapters(db, q, series=series_id)
+    return templates.TemplateResponse(
+        request=request,
+        name="search.html",
+        context={
+            "series": None,
+            "chapter": None,
+            "query": q,
+            "results": results,
+        },
+    )
+
+
 def export(
     request: Request,
     db: Annotated[Session, Depends(database)],
@@ -67,6 +88,7 @@ def export(
 
 
 def download(
+    request: Request,
     db: Annotated[Session, Depends(database)],
     series_id: int,
     chapter_id: int,
@@ -75,11 +97,7 @@ def download(
 
     assert chapter
     assert chapter.ebook
-    return StreamingResponse(
-        io.BytesIO(chapter.ebook),
-        media_type="application/epub+zip",
-        headers={"Content-Disposition": f'inline; filename="{chapter.filename()}"'},
-    )
+    return ebook_response(request, chapter.ebook, chapter.filename())
 
 
 def send(
@@ -7,18 +7,23 @@ from typing import Annotated
 
 import pendulum
 from dataclass_settings import Env, load_settings
-from fastapi import Depends, Request
+from fastapi import Depends, HTTPException, Request
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
+from starlette.status import HTTP_403_FORBIDDEN, HTTP_410_GONE
 
+from chapter_sync import links
 from chapter_sync.cli import base
 from chapter_sync.console import Console
 from chapter_sync.email import EmailClient
+from chapter_sync.schema import DownloadLink
 
 
 @dataclass(frozen=True)
 class Config:
     timezone: Annotated[str, Env("TIMEZONE")] = "UTC"
+    # The secret with which download links are signed (see `sync --link-secret`).
+    link_secret: Annotated[str | None, Env("LINK_SECRET")] = None
 
 
 @cache
@@ -32,10 +37,10 @@ def chapter_sync(request: Request) -> base.ChapterSync:
 
 def database(
     chapter_sync: Annotated[base.ChapterSync, Depends(chapter_sync)],
-    alembic_config=None,
 ) -> Generator[Session, None, None]:
+    # The database is migrated once, on startup, rather than checked per request.
     url = base.database_url(chapter_sync)
-    yield from base.database(url, alembic_config=alembic_config)
+    yield from base.database(url, migrate=False)
 
 
 def console(
@@ -48,6 +53,39 @@ def email_client(console: Annotated[Console, Depends(console)]) -> EmailClient:
     return base.email_client(console)
 
 
+def download_link(
+    request: Request,
+    db: Annotated[Session, Depends(database)],
+    config: Annotated[Config, Depends(config)],
+    link_id: int,
+    expires: int | None = None,
+    signature: str | None = None,
+) -> DownloadLink:
+    """Verify (and log the access of) the download link an ebook was requested by.
+
+    Only a link signed with the web app's `LINK_SECRET` is valid; without one,
+    there are no valid links.
+    """
+    if not (config.link_secret and expires is not None and signature):
+        raise HTTPException(HTTP_403_FORBIDDEN, "Invalid download link")
+    if not links.verify(link_id, expires, signature, config.link_secret):
+        raise HTTPException(HTTP_403_FORBIDDEN, "Invalid download link")
+
+    download_link = db.get(DownloadLink, link_id)
+    if download_link is None:
+        raise HTTPException(HTTP_403_FORBIDDEN, "Invalid download link")
+    if links.is_expired(download_link):
+        raise HTTPException(HTTP_410_GONE, "Download link has expired")
+
+    links.record_access(
+        db,
+        download_link,
+        remote_addr=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+    )
+    return download_link
+
+
 @cache
 def templates(config: Annotated[Config, Depends(config)]):
     template_dir = importlib.resources.files("chapter_sync.web").joinpath("templates")
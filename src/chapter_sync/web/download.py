@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.status import HTTP_410_GONE
+
+from chapter_sync import volumes
+from chapter_sync.epub import Epub
+from chapter_sync.schema import Chapter, DownloadLink, Series
+from chapter_sync.web.dependencies import database, download_link
+from chapter_sync.web.responses import ebook_response
+
+# The epubs built for links to several chapters, by link id. A link is often
+# downloaded more than once (e.g. a retried, or conditional, request), so each is
+# only built once; and only the most recent few are kept.
+MAX_CACHED_EBOOKS = 16
+
+_ebooks: OrderedDict[int, tuple[bytes, str]] = OrderedDict()
+_ebooks_lock = threading.Lock()
+
+
+def download(
+    request: Request,
+    db: Annotated[Session, Depends(database)],
+    link: Annotated[DownloadLink, Depends(download_link)],
+):
+    """Serve the epub a (verified) download link is to."""
+    if link.chapter_id is not None:
+        chapter = db.get(Chapter, link.chapter_id)
+        if chapter is None or chapter.ebook is None:
+            raise HTTPException(HTTP_410_GONE, "The linked chapter no longer exists")
+        return ebook_response(request, chapter.ebook, chapter.filename())
+
+    ebook, filename = link_ebook(db, link)
+    return ebook_response(request, ebook, filename)
+
+
+def link_ebook(db: Session, link: DownloadLink) -> tuple[bytes, str]:
+    """Return the epub (and its filename) of a link to a block of chapters."""
+    with _ebooks_lock:
+        if link.id in _ebooks:
+            _ebooks.move_to_end(link.id)
+            return _ebooks[link.id]
+
+    series = db.get(Series, link.series_id)
+    block = db.scalars(
+        select(Chapter)
+        .where(Chapter.series_id == link.series_id)
+        .where(Chapter.number.between(link.first_number, link.last_number))
+        .order_by(Chapter.number)
+    ).all()
+    if series is None or not block:
+        raise HTTPException(HTTP_410_GONE, "The linked chapters no longer exist")
+
+    ebook = Epub.from_series(series, *block).write_buffer().read()
+    result = ebook, f"{volumes.block_title(series, block)}.epub"
+
+    with _ebooks_lock:
+        _ebooks[link.id] = result
+        while len(_ebooks) > MAX_CACHED_EBOOKS:
+            _ebooks.popitem(last=False)
+    return result
@@ -4,8 +4,7 @@ import logging
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from chapter_sync.cli.base import ChapterSync, alembic_config, database_url
-from chapter_sync.web.dependencies import database
+from chapter_sync.cli.base import ChapterSync, database, database_url
 from chapter_sync.web.routes import routes
 
 
@@ -30,6 +29,4 @@ def create_app(command: ChapterSync, routes=routes):
 
 
 def boostrap_db(command: ChapterSync):
-    url = database_url(command)
-    alembic = alembic_config(url)
-    list(database(command, alembic))
+    list(database(database_url(command)))
@@ -0,0 +1,9 @@
+from fastapi.responses import PlainTextResponse
+
+from chapter_sync.metrics import registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
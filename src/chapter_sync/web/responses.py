@@ -0,0 +1,26 @@
+import hashlib
+import io
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+
+def ebook_response(request: Request, ebook: bytes, filename: str) -> Response:
+    """Serve an epub, with its hash as a (strong) `ETag`.
+
+    Epubs are built reproducibly, so an unchanged book keeps its `ETag` even when
+    rebuilt; and a client which already has it needn't download it again.
+    """
+    etag = f'"{hashlib.sha256(ebook).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return StreamingResponse(
+        io.BytesIO(ebook),
+        media_type="application/epub+zip",
+        headers={**headers, "Content-Disposition": f'inline; filename="{filename}"'},
+    )
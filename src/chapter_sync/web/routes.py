@@ -1,7 +1,7 @@
 from collections.abc import Callable
 from typing import Literal, TypedDict
 
-from chapter_sync.web import chapter, series, subscriber
+from chapter_sync.web import chapter, download, metrics, series, subscriber
 
 
 class Route(TypedDict):
@@ -16,6 +16,16 @@ routes: list[Route] = [
         "path": "/",
         "endpoint": series.list_series,
     },
+    {
+        "method": "GET",
+        "path": "/search",
+        "endpoint": chapter.search,
+    },
+    {
+        "method": "GET",
+        "path": "/metrics",
+        "endpoint": metrics.metrics,
+    },
     {
         "method": "GET",
         "path": "/subscriber",
@@ -81,4 +91,9 @@ routes: list[Route] = [
         "path": "/series/{series_id}/chapter/{chapter_id}/ebook",
         "endpoint": chapter.send,
     },
+    {
+        "method": "GET",
+        "path": "/download/{link_id}",
+        "endpoint": download.download,
+    },
 ]
@@ -1,9 +1,8 @@
-import io
 from typing import Annotated
 
 import requests
 from fastapi import Depends, Form, Request
-from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_302_FOUND
@@ -15,6 +14,7 @@ from chapter_sync.email import EmailClient
 from chapter_sync.handlers.base import HandlerTypes
 from chapter_sync.schema import Chapter, Series
 from chapter_sync.web.dependencies import console, database, email_client, templates
+from chapter_sync.web.responses import ebook_response
 
 
 def find_series(db: Session, series_id: int) -> Series | None:
@@ -114,6 +114,7 @@ def export(
 
 
 def download(
+    request: Request,
     db: Annotated[Session, Depends(database)],
     series_id: int,
 ):
@@ -121,11 +122,7 @@ def download(
 
     assert series
     assert series.ebook
-    return StreamingResponse(
-        io.BytesIO(series.ebook),
-        media_type="application/epub+zip",
-        headers={"Content-Disposition": f'inline; filename="{series.filename()}"'},
-    )
+    return ebook_response(request, series.ebook, series.filename())
 
 
 def send(
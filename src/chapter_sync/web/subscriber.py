@@ -9,7 +9,15 @@ from starlette.status import HTTP_302_FOUND
 
 from chapter_sync import subscriber as subscriber_actions
 from chapter_sync.console import Console
-from chapter_sync.schema import EmailSubscriber, EmailSubscription, Series
+from chapter_sync.schema import (
+    DELIVERY_MODES,
+    DIGEST_POLICIES,
+    DeliveryMode,
+    DigestPolicy,
+    EmailSubscriber,
+    EmailSubscription,
+    Series,
+)
 from chapter_sync.web.dependencies import console, database, templates
 
 
@@ -58,6 +66,8 @@ def get_subscriber(
         name="subscriber.html",
         context={
             "subscriber": subscriber,
+            "digest_policies": DIGEST_POLICIES,
+            "delivery_modes": DELIVERY_MODES,
             "subscribed_series": subscribed_series,
             "unsubscribed_series": unsubscribed_series,
         },
@@ -72,10 +82,17 @@ async def update_subscriber(
     form_data = await request.form()
     email = str(form_data.get("email"))
 
+    digest = form_data.get("digest")
+    delivery = form_data.get("delivery")
+
     series = [int(cast(str, series_id)) for series_id in form_data.getlist("series")]
 
     command = subscriber_actions.Set(
-        subscriber=subscriber_id, email=email, series=series
+        subscriber=subscriber_id,
+        email=email,
+        series=series,
+        digest=cast(DigestPolicy, digest) if digest in DIGEST_POLICIES else None,
+        delivery=cast(DeliveryMode, delivery) if delivery in DELIVERY_MODES else None,
     )
 
     try:
@@ -0,0 +1,69 @@
+from cappa.testing import CommandRunner
+from sqlalchemy.orm import Session
+
+from chapter_sync.search import search_chapters
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("chapter", "search")
+
+
+def test_search(cli: CommandRunner, mf: ModelFactory, capsys):
+    series = mf.series(id=1, title="My Series")
+    mf.chapter(
+        series=series,
+        number=1,
+        title="Beginnings",
+        content="<div><p>The dragon slept.</p></div>",
+    )
+    mf.chapter(
+        series=series,
+        number=2,
+        title="Endings",
+        content="<div><p>The knight woke.</p></div>",
+    )
+
+    cli.invoke("dragon")
+
+    out = capsys.readouterr().out
+    assert "Beginnings" in out
+    assert "Endings" not in out
+
+
+def test_no_results(cli: CommandRunner, mf: ModelFactory, capsys):
+    mf.series(id=1, title="My Series")
+
+    cli.invoke("dragon")
+
+    out = capsys.readouterr().out
+    assert "No chapters found" in out
+
+
+def test_rank_and_snippet(db: Session, mf: ModelFactory):
+    series = mf.series(id=1, name="one")
+    other = mf.series(id=2, name="two")
+    mf.chapter(series=series, number=1, content="<p>a dragon</p>")
+    mf.chapter(series=series, number=2, content="<p>dragon, <b>dragon</b>, dragon</p>")
+    mf.chapter(series=other, number=1, content="<p>dragon</p>")
+
+    results = search_chapters(db, "dragon", series=1)
+    assert [r.chapter.number for r in results] == [2, 1]
+    assert results[1].html_snippet() == "a <mark>dragon</mark>"
+
+
+def test_reindex_on_update(db: Session, mf: ModelFactory):
+    series = mf.series(id=1)
+    chapter = mf.chapter(series=series, number=1, content="<p>dragon</p>")
+
+    chapter.content = "<p>knight</p>"
+    db.commit()
+
+    assert search_chapters(db, "dragon") == []
+    assert [r.chapter.id for r in search_chapters(db, "knight")] == [chapter.id]
+
+
+def test_query_syntax_is_escaped(db: Session, mf: ModelFactory):
+    series = mf.series(id=1)
+    mf.chapter(series=series, number=1, content='<p>a "quoted" - term</p>')
+
+    assert len(search_chapters(db, '"quoted -')) == 1
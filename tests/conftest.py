@@ -35,6 +35,21 @@ def time(time_machine: TimeMachineFixture):
     yield
 
 
+@pytest.fixture
+def sleeps(
+    monkeypatch: pytest.MonkeyPatch, time_machine: TimeMachineFixture
+) -> list[float]:
+    """Record, rather than wait for, any `time.sleep`s; though the clock still moves."""
+    result: list[float] = []
+
+    def sleep(seconds: float):
+        result.append(seconds)
+        time_machine.shift(seconds)
+
+    monkeypatch.setattr("time.sleep", sleep)
+    return result
+
+
 @pytest.fixture
 def mf_session(db: Session):
     return db
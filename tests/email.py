@@ -1,3 +1,4 @@
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 
 from chapter_sync.email import EmailClient
@@ -7,21 +8,40 @@ from chapter_sync.email import EmailClient
 class StubEmailClient(EmailClient):
     sent_emails: list = field(default_factory=list)
 
-    def send(
+    def send_all(
         self,
         *,
         subject: str,
-        to: str,
+        to: Sequence[str],
         attachment: bytes,
         filename: str,
         body: str | None = None,
     ):
-        self.sent_emails.append(
-            {
-                "subject": subject,
-                "to": to,
-                "attachment": attachment,
-                "filename": filename,
-                "body": body,
-            }
-        )
+        for recipient in to:
+            self.sent_emails.append(
+                {
+                    "subject": subject,
+                    "to": recipient,
+                    "attachment": attachment,
+                    "filename": filename,
+                    "body": body,
+                }
+            )
+
+    def send_books(
+        self,
+        *,
+        subject: str,
+        to: Sequence[str],
+        books: Mapping[str, bytes],
+        body: str | None = None,
+    ):
+        for recipient in to:
+            self.sent_emails.append(
+                {
+                    "subject": subject,
+                    "to": recipient,
+                    "books": dict(books),
+                    "body": body,
+                }
+            )
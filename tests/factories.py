@@ -3,7 +3,14 @@ from typing import Literal
 
 from sqlalchemy_model_factory import declarative
 
-from chapter_sync.schema import Chapter, EmailSubscriber, EmailSubscription, Series
+from chapter_sync.schema import (
+    Chapter,
+    DeliveryMode,
+    DigestPolicy,
+    EmailSubscriber,
+    EmailSubscription,
+    Series,
+)
 
 
 @declarative
@@ -39,6 +46,7 @@ class ModelFactory:
         sent_at: datetime | None = datetime(2020, 1, 1),
         published_at: datetime = datetime(2020, 1, 1),
         created_at: datetime = datetime(2020, 1, 1),
+        volume_id: str | None = None,
     ):
         return Chapter(
             series=series,
@@ -51,6 +59,7 @@ class ModelFactory:
             sent_at=sent_at,
             published_at=published_at,
             created_at=created_at,
+            volume_id=volume_id,
         )
 
     def email_subscriber(
@@ -58,8 +67,10 @@ class ModelFactory:
         *,
         id: int | None = None,
         email: str = "foo@foo.com",
+        digest: DigestPolicy = "immediate",
+        delivery: DeliveryMode = "attachment",
     ):
-        return EmailSubscriber(id=id, email=email)
+        return EmailSubscriber(id=id, email=email, digest=digest, delivery=delivery)
 
     def email_subscription(self, series: Series, subscriber: EmailSubscriber):
         return EmailSubscription(series_id=series.id, subscriber_id=subscriber.id)
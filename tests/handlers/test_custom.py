@@ -89,6 +89,36 @@ def test_collect_chapter(requests: Session, console: Console, responses: Request
     assert chapter2.created_at == datetime(2020, 1, 1)
 
 
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_next_fetches_each_page_once(
+    requests: Session, console: Console, responses: RequestsMock, prefetch: bool
+):
+    responses.add(responses.GET, "http://basic.com/", body=chapter1_content)
+    responses.add(responses.GET, "http://basic.com/chapter2", body=chapter2_content)
+
+    series = Series(
+        id=1,
+        name="series",
+        type="custom",
+        url="http://basic.com/",
+        title="Basic",
+        author="Basic",
+    )
+    settings = Settings(
+        content_selector="#main",
+        content_title_selector="h1.title",
+        next_selector='a[rel="next"]',
+        prefetch=prefetch,
+    )
+    chapters = list(chapter_handler(requests, series, settings, console))
+
+    assert [c.title for c in chapters] == ["Chapter 1", "Chapter 2"]
+    assert [c.request.url for c in responses.calls] == [
+        "http://basic.com/",
+        "http://basic.com/chapter2",
+    ]
+
+
 chapter1_content = """
 <!DOCTYPE html>
 <html lang="en">
@@ -71,6 +71,9 @@ def test_collect_chapter(requests: Session, console: Console, responses: Request
     )
     assert chapter1.url == "https://royalroad.com/series/chapter1"
     assert chapter1.published_at == datetime(2020, 1, 1)
+    assert chapter1.volume_id is None
+    # The page is only kept when asked to (see `sync --save-pages`).
+    assert chapter1.page is None
 
     chapter2 = all_chapters[1]
     assert chapter2.series_id == series.id
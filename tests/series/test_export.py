@@ -0,0 +1,136 @@
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from cappa import Exit
+from cappa.testing import CommandRunner
+from sqlalchemy.orm import Session
+
+from chapter_sync import volumes
+from chapter_sync.epub import Epub
+from chapter_sync.schema import Series, SeriesVolume
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("series", "export")
+sync = create_cli_fixture("sync", "--no-update", "--no-send")
+
+
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_export_volumes(
+    cli: CommandRunner, mf: ModelFactory, db: Session, tmp_path: Path
+):
+    series = mf.series(id=1, title="Long")
+    for number in range(1, 6):
+        mf.chapter(series, number=number, content=f"<p>Chapter {number}</p>")
+
+    output = str(tmp_path / "long.epub")
+    cli.invoke("1", "--volume-chapters", "2", "-o", output)
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == [f"long - Volume {n}.epub" for n in (1, 2, 3)]
+    stored = db.query(SeriesVolume).order_by(SeriesVolume.number).all()
+    assert [(v.first_number, v.last_number) for v in stored] == [(1, 2), (3, 4), (5, 5)]
+    first_volume = stored[0].ebook
+
+    # Only the last volume has changed, so only it's rebuilt.
+    mf.chapter(db.get(Series, 1), number=6, content="<p>Chapter 6</p>")
+    with patch.object(Epub, "write", autospec=True, side_effect=Epub.write) as write:
+        cli.invoke("1", "--volume-chapters", "2", "-o", output)
+    assert write.call_count == 1
+
+    stored = db.query(SeriesVolume).order_by(SeriesVolume.number).all()
+    assert [(v.first_number, v.last_number) for v in stored] == [(1, 2), (3, 4), (5, 6)]
+    assert stored[0].ebook == first_volume
+    assert (tmp_path / "long - Volume 3.epub").read_bytes() == stored[2].ebook
+
+
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_export_fewer_volumes(
+    cli: CommandRunner, mf: ModelFactory, db: Session, tmp_path: Path
+):
+    series = mf.series(id=1)
+    for number in range(1, 5):
+        mf.chapter(series, number=number)
+
+    output = str(tmp_path / "series.epub")
+    cli.invoke("1", "--volume-chapters", "1", "-o", output)
+    assert db.query(SeriesVolume).count() == 4
+
+    # Exported volumes keep their chapters, unless forced to split afresh.
+    cli.invoke("1", "--volume-chapters", "2", "-o", output)
+    stored = db.query(SeriesVolume).order_by(SeriesVolume.number).all()
+    assert [(v.first_number, v.last_number) for v in stored] == [
+        (1, 1),
+        (2, 2),
+        (3, 3),
+        (4, 4),
+    ]
+
+    cli.invoke("1", "--volume-chapters", "2", "--force", "-o", output)
+    stored = db.query(SeriesVolume).order_by(SeriesVolume.number).all()
+    assert [(v.first_number, v.last_number) for v in stored] == [(1, 2), (3, 4)]
+
+
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_sync_updates_volumes(
+    cli: CommandRunner,
+    sync: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    tmp_path: Path,
+):
+    series = mf.series(id=1, title="Long")
+    for number in range(1, 4):
+        mf.chapter(series, number=number, content=f"<p>Chapter {number}</p>")
+    cli.invoke("1", "--volume-chapters", "2", "-o", str(tmp_path / "long.epub"))
+
+    mf.chapter(db.get(Series, 1), number=4, content="<p>Chapter 4</p>")
+    mf.chapter(db.get(Series, 1), number=5, content="<p>Chapter 5</p>")
+    sync.invoke()
+
+    # New chapters are added to the last volume, until it's next exported.
+    stored = db.query(SeriesVolume).order_by(SeriesVolume.number).all()
+    assert [(v.first_number, v.last_number) for v in stored] == [(1, 2), (3, 5)]
+    [volume] = [v for v in stored if v.number == 2]
+    assert volume.ebook == volumes.volume_epub(
+        db.get(Series, 1), 2, db.get(Series, 1).chapters[2:]
+    )
+
+
+def test_revise_invalidates_volume(mf: ModelFactory, db: Session):
+    series = mf.series(id=1)
+    chapters = [mf.chapter(series, number=n) for n in range(1, 5)]
+    series.volumes = [
+        SeriesVolume(number=1, first_number=1, last_number=2, ebook=b"1"),
+        SeriesVolume(number=2, first_number=3, last_number=4, ebook=b"2"),
+    ]
+    db.commit()
+
+    chapters[2].revise("<p>revised</p>")
+    assert [v.ebook for v in series.volumes] == [b"1", None]
+
+
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_export_split_chapters(cli: CommandRunner, mf: ModelFactory, tmp_path: Path):
+    series = mf.series(id=1)
+    large = "".join(f"<p>{'x' * 1000}</p>" for _ in range(3))
+    mf.chapter(series, number=1, content=f"<div>{large}</div>")
+    output = tmp_path / "series.epub"
+
+    cli.invoke("1", "-o", str(output))
+    with zipfile.ZipFile(output) as zf:
+        assert "OEBPS/chapter/1-2.html" not in zf.namelist()
+
+    cli.invoke("1", "--split-chapters", "2", "-o", str(output))
+    with zipfile.ZipFile(output) as zf:
+        assert "OEBPS/chapter/1-2.html" in zf.namelist()
+
+
+def test_export_conflicting_volume_options(cli: CommandRunner, mf: ModelFactory):
+    mf.series(id=1)
+
+    with pytest.raises(Exit) as e:
+        cli.invoke("1", "--volume-chapters", "2", "--by-volume")
+    assert e.value.code == 1
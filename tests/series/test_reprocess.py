@@ -0,0 +1,55 @@
+from cappa.testing import CommandRunner
+from responses import RequestsMock
+from sqlalchemy.orm import Session
+
+from chapter_sync.request import compress_page
+from chapter_sync.schema import Chapter, ChapterRevision
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture()
+
+
+def test_reprocess(cli: CommandRunner, mf: ModelFactory, db: Session, capsys):
+    series = mf.series(
+        id=1, settings={"chapter_selector": "ul > li > a", "content_selector": "p"}
+    )
+    chapter = mf.chapter(series, number=1, content="<div>\n stale\n</div>\n")
+    mf.chapter(series, number=2, content="<div>\n unsaved\n</div>\n")
+    chapter.page = compress_page("<p>fresh</p><div>ignored</div>")
+    db.commit()
+
+    cli.invoke("series", "reprocess", "1", "-j", "1")
+
+    chapter1, chapter2 = db.query(Chapter).all()
+    assert chapter1.content == "<div>\n fresh\n</div>\n"
+    assert chapter1.ebook is None
+    assert chapter2.content == "<div>\n unsaved\n</div>\n"
+    assert db.query(ChapterRevision).count() == 1
+
+    out = capsys.readouterr().out
+    assert "Reprocessed 1 chapter(s), 1 changed" in out
+
+
+def test_save_pages(
+    cli: CommandRunner, mf: ModelFactory, db: Session, responses: RequestsMock
+):
+    chap1_url = "http://example.com/chap1"
+    mf.series(
+        id=1,
+        settings={"chapter_selector": "ul > li > a", "content_selector": "p"},
+        url="http://example.com/toc",
+    )
+    responses.get(
+        "http://example.com/toc",
+        body=f'<ul><li><a href="{chap1_url}">Chap 1</a></li></ul>',
+    )
+    responses.get(chap1_url, body="<p>one</p>")
+
+    cli.invoke("sync", "--save-pages", "--no-send")
+    cli.invoke("series", "reprocess", "1", "-j", "1")
+
+    chapter = db.query(Chapter).one()
+    assert chapter.page == compress_page("<p>one</p>")
+    assert chapter.content == "<div>\n one\n</div>\n"
+    assert db.query(ChapterRevision).count() == 0
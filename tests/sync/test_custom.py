@@ -1,16 +1,20 @@
 import io
 import zipfile
+from pathlib import Path
 
+import pytest
 from cappa.testing import CommandRunner
 from responses import RequestsMock
 from sqlalchemy.orm import Session
 
+from chapter_sync.request import ResponseCache, requests_session
 from chapter_sync.schema import Chapter
 from tests.cli import create_cli_fixture
 from tests.email import StubEmailClient
 from tests.factories import ModelFactory
 
 cli = create_cli_fixture("sync")
+root_cli = create_cli_fixture()
 
 
 def test_from_scratch(
@@ -136,3 +140,96 @@ def test_subscriber_send(
             "to": "foo@foo.com",
         }
     ]
+
+
+def test_skip_unavailable_site(
+    cli: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    responses: RequestsMock,
+    sleeps: list[float],
+):
+    settings = {"chapter_selector": "ul > li > a", "content_selector": "p"}
+    mf.series(name="down1", settings=settings, url="http://down.com/1")
+    mf.series(name="down2", settings=settings, url="http://down.com/2")
+    mf.series(name="up", settings=settings, url="http://up.com/toc")
+
+    responses.get("http://down.com/1", status=503)
+    responses.get("http://down.com/2", status=503)
+    responses.get(
+        "http://up.com/toc",
+        body='<ul><li><a href="http://up.com/chap1">Chap 1</a></li></ul>',
+    )
+    responses.get("http://up.com/chap1", body="<p>one</p>")
+
+    cli.invoke("--no-send")
+
+    # The first series' failures trip the circuit breaker, so the second series
+    # on the same site is skipped outright, and the third still progresses.
+    hosts = [call.request.url.split("/")[2] for call in responses.calls]
+    assert hosts == ["down.com"] * 5 + ["up.com", "up.com"]
+    assert [c.title for c in db.query(Chapter).all()] == ["Chap 1"]
+
+
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_offline_partial_cache(
+    root_cli: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    responses: RequestsMock,
+    email_client: StubEmailClient,
+    tmp_path: Path,
+):
+    settings = {"chapter_selector": "ul > li > a", "content_selector": "p"}
+    uncached = mf.series(name="uncached", settings=settings, url="http://a.com/toc")
+    mf.chapter(uncached, number=1, title="Chapter 1", sent_at=None)
+    subscriber = mf.email_subscriber()
+    mf.email_subscription(uncached, subscriber)
+    mf.series(name="cached", settings=settings, url="http://b.com/toc")
+
+    responses.get(
+        "http://b.com/toc",
+        body='<ul><li><a href="http://b.com/chap1">Chap 1</a></li></ul>',
+    )
+    responses.get("http://b.com/chap1", body="<p>one</p>")
+    session = requests_session(ResponseCache(tmp_path))
+    session.get("http://b.com/toc")
+    session.get("http://b.com/chap1")
+
+    root_cli.invoke("--cache-dir", str(tmp_path), "--offline", "sync")
+
+    # The first series' table of contents was never cached, so its update is
+    # skipped; but its unsent chapter is still sent, and the next series synced.
+    assert [e["subject"] for e in email_client.sent_emails] == [
+        "uncached: Chapter 1.epub"
+    ]
+    assert [c.title for c in db.query(Chapter).all()] == ["Chapter 1", "Chap 1"]
+
+
+def test_send_split_by_size(
+    cli: CommandRunner,
+    mf: ModelFactory,
+    responses: RequestsMock,
+    email_client: StubEmailClient,
+):
+    url = "http://example.com/toc"
+    series = mf.series(settings={"chapter_selector": "ul > li > a"}, url=url)
+    for number in range(1, 4):
+        mf.chapter(
+            series,
+            number=number,
+            title=f"Chapter {number}",
+            ebook=b"x" * 400 * 1024,
+            sent_at=None,
+        )
+    subscriber = mf.email_subscriber()
+    mf.email_subscription(series, subscriber)
+
+    responses.get(url, body="<ul></ul>")
+
+    cli.invoke("--max-attachment-size", "1")
+
+    assert [e["subject"] for e in email_client.sent_emails] == [
+        "foo - Chapters 1 to 2",
+        "foo: Chapter 3.epub",
+    ]
@@ -0,0 +1,68 @@
+from cappa.testing import CommandRunner
+from sqlalchemy.orm import Session
+from time_machine import TimeMachineFixture
+
+from chapter_sync.schema import EmailSubscriber
+from tests.cli import create_cli_fixture
+from tests.email import StubEmailClient
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("sync", "--no-update", "--no-save")
+subscriber_cli = create_cli_fixture("subscriber")
+
+
+def test_digest(
+    cli: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    email_client: StubEmailClient,
+    time_machine: TimeMachineFixture,
+):
+    one = mf.series(name="one")
+    two = mf.series(name="two")
+    immediate = mf.email_subscriber(email="immediate@foo.com")
+    daily = mf.email_subscriber(email="daily@foo.com", digest="daily")
+    for series in (one, two):
+        mf.email_subscription(series, immediate)
+        mf.email_subscription(series, daily)
+
+    mf.chapter(one, number=1, title="One 1", sent_at=None)
+    mf.chapter(one, number=2, title="One 2", sent_at=None)
+    mf.chapter(two, number=1, title="Two 1", sent_at=None)
+    db.commit()
+
+    time_machine.shift(60)
+    cli.invoke()
+
+    # Only immediate subscribers are sent each block as it's sent.
+    assert [(e["to"], e["subject"]) for e in email_client.sent_emails] == [
+        ("immediate@foo.com", "one - Chapters 1 to 2"),
+        ("immediate@foo.com", "two: Two 1.epub"),
+    ]
+    email_client.sent_emails.clear()
+
+    time_machine.shift(24 * 60 * 60)
+    cli.invoke()
+
+    [digest] = email_client.sent_emails
+    assert digest["to"] == "daily@foo.com"
+    assert digest["subject"] == "Chapter digest: 2020-01-02 00:01"
+    assert list(digest["books"]) == ["one - Chapters 1 to 2", "two: Two 1.epub"]
+    assert digest["body"] == "one: One 1\none: One 2\ntwo: Two 1"
+    email_client.sent_emails.clear()
+
+    # Nothing new has been sent, and the next digest isn't due for a day.
+    time_machine.shift(24 * 60 * 60)
+    cli.invoke()
+    assert email_client.sent_emails == []
+
+
+def test_set_digest(subscriber_cli: CommandRunner, mf: ModelFactory, db: Session):
+    mf.email_subscriber(id=1)
+    db.commit()
+
+    subscriber_cli.invoke("set", "1", "--digest", "hourly")
+
+    subscriber = db.get(EmailSubscriber, 1)
+    assert subscriber
+    assert subscriber.digest == "hourly"
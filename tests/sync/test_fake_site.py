@@ -0,0 +1,99 @@
+from collections.abc import Generator
+
+import pytest
+from cappa.testing import CommandRunner
+from sqlalchemy.orm import Session
+
+from benchmarks.fake_site import FakeSite, Faults, chapter_text, serve
+from chapter_sync.schema import Chapter, Series
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("sync", "--no-send", "--no-save")
+
+faults = Faults(error_rate=0.15, throttle_rate=0.1, retry_after=3, seed=1)
+
+
+@pytest.fixture
+def site() -> FakeSite:
+    return FakeSite(chapters=30, faults=faults)
+
+
+@pytest.fixture
+def url(site: FakeSite) -> Generator[str, None, None]:
+    with serve(site.app()) as url:
+        yield url
+
+
+def sync_until_complete(cli: CommandRunner, db: Session, *args: str) -> int:
+    """Sync repeatedly (as `watch` would), until every chapter is collected."""
+    for attempt in range(1, 11):
+        cli.invoke(*args)
+        if db.query(Chapter).count() == 30 * db.query(Series).count():
+            return attempt
+    raise AssertionError("Not every chapter was collected")
+
+
+def assert_collected(db: Session, name: str):
+    chapters = (
+        db.query(Chapter)
+        .join(Series)
+        .where(Series.name == name)
+        .order_by(Chapter.number)
+        .all()
+    )
+    assert [c.number for c in chapters] == list(range(1, 31))
+    assert len({c.url for c in chapters}) == 30
+    for chapter in chapters:
+        assert chapter.content
+        assert chapter_text(1, chapter.number) in chapter.content
+
+
+def test_royal_road_under_faults(
+    cli: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    site: FakeSite,
+    url: str,
+    sleeps: list[float],
+):
+    mf.series(name="royal-road", type="royal-road", url=f"{url}/fiction/1")
+    db.commit()
+
+    sync_until_complete(cli, db, "-j", "4")
+
+    assert_collected(db, "royal-road")
+    # Faults were both injected and retried; the throttled chapters no sooner
+    # than their `Retry-After`, waited out once the rest had been collected.
+    assert site.statuses[500] and site.statuses[429]
+    assert sum(sleeps) >= 3
+
+
+def test_custom_under_faults(
+    cli: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    site: FakeSite,
+    url: str,
+    sleeps: list[float],
+):
+    mf.series(
+        name="listed",
+        url=f"{url}/custom/1/",
+        settings={"chapter_selector": "ul a", "content_selector": "div.content"},
+    )
+    mf.series(
+        name="linked",
+        url=f"{url}/custom/1/chapter/1",
+        settings={
+            "next_selector": "a.next",
+            "content_selector": "div.content",
+            "content_title_selector": "h1",
+        },
+    )
+    db.commit()
+
+    sync_until_complete(cli, db, "-j", "4")
+
+    assert_collected(db, "listed")
+    assert_collected(db, "linked")
@@ -0,0 +1,120 @@
+from cappa.testing import CommandRunner
+from responses import RequestsMock
+from sqlalchemy.orm import Session
+from time_machine import TimeMachineFixture
+
+from chapter_sync import frontier
+from chapter_sync.handlers import ChapterLink
+from chapter_sync.schema import Chapter, FrontierEntry
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("sync", "--no-send")
+
+
+def test_resume_after_failure(
+    cli: CommandRunner, mf: ModelFactory, db: Session, responses: RequestsMock
+):
+    url = "http://example.com"
+    chapter_urls = [f"{url}/chap{i}" for i in range(1, 4)]
+
+    mf.series(
+        settings={"chapter_selector": "ul > li > a", "content_selector": "p"},
+        url=f"{url}/toc",
+    )
+
+    links = "".join(
+        f'<li><a href="{u}">Chap {i}</a></li>' for i, u in enumerate(chapter_urls, 1)
+    )
+    toc = responses.get(f"{url}/toc", body=f"<ul>{links}</ul>")
+    responses.get(chapter_urls[0], body="<p>one</p>")
+    responses.get(chapter_urls[1], body=ConnectionError("Connection reset"))
+    responses.get(chapter_urls[1], body="<p>two</p>")
+    responses.get(chapter_urls[2], body="<p>three</p>")
+
+    cli.invoke("-j", "2")
+
+    assert [c.number for c in db.query(Chapter).all()] == [1, 3]
+    entry = db.query(FrontierEntry).one()
+    assert entry.url == chapter_urls[1]
+    assert entry.attempts == 1
+    assert entry.last_error and "Connection reset" in entry.last_error
+    assert entry.claimed_by is None
+
+    # A chapter is released before the pending one is resumed.
+    chapter_urls.append(f"{url}/chap4")
+    links += f'<li><a href="{chapter_urls[3]}">Chap 4</a></li>'
+    toc = responses.replace(responses.GET, f"{url}/toc", body=f"<ul>{links}</ul>")
+    responses.get(chapter_urls[3], body="<p>four</p>")
+
+    cli.invoke()
+
+    # The pending chapter is resumed, along with the newly discovered one.
+    assert toc.call_count == 1
+    chapters = db.query(Chapter).order_by(Chapter.number).all()
+    assert [(c.number, c.title) for c in chapters] == [
+        (1, "Chap 1"),
+        (2, "Chap 2"),
+        (3, "Chap 3"),
+        (4, "Chap 4"),
+    ]
+    assert db.query(FrontierEntry).count() == 0
+
+
+def test_claim(mf: ModelFactory, db: Session, time_machine: TimeMachineFixture):
+    series = mf.series()
+    frontier.enqueue(
+        db,
+        series.id,
+        [
+            ChapterLink("http://example.com/1", "One", 1),
+            ChapterLink("http://example.com/2", "Two", 2),
+            ChapterLink("http://example.com/1", "One", 1),
+        ],
+    )
+
+    first = frontier.claim(db, series.id, "a")
+    second = frontier.claim(db, series.id, "b")
+    assert first and first.number == 1 and first.claimed_by == "a"
+    assert second and second.number == 2 and second.claimed_by == "b"
+    assert frontier.claim(db, series.id, "c") is None
+
+    # Claims held by a worker which has died eventually lapse.
+    time_machine.shift(frontier.LEASE.total_seconds() + 1)
+    third = frontier.claim(db, series.id, "c")
+    assert third and third.number == 1 and third.claimed_by == "c"
+
+
+def test_retry_rescheduled(
+    cli: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    responses: RequestsMock,
+    sleeps: list[float],
+):
+    url = "http://example.com"
+    mf.series(
+        settings={"chapter_selector": "ul > li > a", "content_selector": "p"},
+        url=f"{url}/toc",
+    )
+    responses.get(
+        f"{url}/toc",
+        body=f'<ul><li><a href="{url}/1">One</a></li><li><a href="{url}/2">Two</a></li></ul>',
+    )
+    responses.get(f"{url}/1", status=503)
+    responses.get(f"{url}/1", body="<p>one</p>")
+    responses.get(f"{url}/2", body="<p>two</p>")
+
+    cli.invoke()
+
+    # The failed chapter is retried once the others are collected, rather than
+    # holding up its worker.
+    assert [c.request.url for c in responses.calls] == [
+        f"{url}/toc",
+        f"{url}/1",
+        f"{url}/2",
+        f"{url}/1",
+    ]
+    assert len(sleeps) == 1
+    assert [c.number for c in db.query(Chapter).order_by(Chapter.number)] == [1, 2]
+    assert db.query(FrontierEntry).count() == 0
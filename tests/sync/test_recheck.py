@@ -0,0 +1,89 @@
+from cappa.testing import CommandRunner
+from responses import RequestsMock
+from sqlalchemy.orm import Session
+
+from chapter_sync.epub import series_epub
+from chapter_sync.schema import Chapter, ChapterRevision, Series
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("sync", "--no-send")
+
+
+def setup_series(mf: ModelFactory, responses: RequestsMock):
+    url = "http://example.com"
+    chap1_url = f"{url}/chap1"
+    chap2_url = f"{url}/chap2"
+
+    series = mf.series(
+        settings={"chapter_selector": "ul > li > a", "content_selector": "p"},
+        url=f"{url}/toc",
+    )
+    mf.chapter(series, number=1, content="<div>\n one\n</div>\n", url=chap1_url)
+    mf.chapter(series, number=2, content="<div>\n two\n</div>\n", url=chap2_url)
+
+    responses.get(
+        f"{url}/toc",
+        body=f"""
+        <ul>
+            <li><a href="{chap1_url}">Chap 1</a></li>
+            <li><a href="{chap2_url}">Chap 2</a></li>
+        </ul>
+        """,
+    )
+    responses.get(chap1_url, body="<p>one, edited</p>")
+    return chap2_url
+
+
+def test_recheck_unchanged(
+    cli: CommandRunner, mf: ModelFactory, db: Session, responses: RequestsMock
+):
+    chap2_url = setup_series(mf, responses)
+    responses.get(chap2_url, body="<p>two</p>")
+
+    cli.invoke("--recheck", "1")
+
+    chapters = db.query(Chapter).all()
+    assert [c.ebook for c in chapters] == [b"foo", b"foo"]
+    assert db.query(ChapterRevision).count() == 0
+
+
+def test_recheck_changed(
+    cli: CommandRunner, mf: ModelFactory, db: Session, responses: RequestsMock
+):
+    chap2_url = setup_series(mf, responses)
+    responses.get(chap2_url, body="<p>two, edited</p>")
+
+    cli.invoke("--recheck", "1")
+
+    chapter1, chapter2 = db.query(Chapter).all()
+
+    # Only the rechecked chapter is refetched, and only its ebook is rebuilt.
+    assert chapter1.content == "<div>\n one\n</div>\n"
+    assert chapter1.ebook == b"foo"
+
+    assert chapter2.content == "<div>\n two, edited\n</div>\n"
+    assert chapter2.ebook != b"foo"
+
+    revision = db.query(ChapterRevision).one()
+    assert revision.chapter_id == chapter2.id
+    assert revision.content == "<div>\n two\n</div>\n"
+
+
+def test_recheck_rebuilds_series_ebook(
+    cli: CommandRunner, mf: ModelFactory, db: Session, responses: RequestsMock
+):
+    chap2_url = setup_series(mf, responses)
+    responses.get(chap2_url, body="<p>two, edited</p>")
+    series = db.query(Series).one()
+    series.ebook = exported = series_epub(series, series.chapters)
+    db.commit()
+
+    # The exported epub is rebuilt with the revised chapter, and then kept up to
+    # date as before.
+    cli.invoke("--recheck", "1")
+
+    series = db.query(Series).one()
+    assert series.ebook != exported
+    assert series.ebook == series_epub(series, series.chapters)
+    assert series.ebook_stale is False
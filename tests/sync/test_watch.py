@@ -0,0 +1,59 @@
+import json
+import os
+import signal
+from pathlib import Path
+
+import pytest
+from cappa.testing import CommandRunner
+from responses import RequestsMock
+
+from chapter_sync import sync
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("watch", "--no-send", "--interval", "0")
+
+
+# cappa enters `Path` arguments as though they were context managers.
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_iterations(
+    cli: CommandRunner, mf: ModelFactory, responses: RequestsMock, tmp_path: Path
+):
+    mf.series(settings={"chapter_selector": "a", "content_selector": "p"})
+    responses.get("http://example.com", body="")
+
+    health_file = tmp_path / "health.json"
+    cli.invoke("--no-schedule", "-n", "2", "--health-file", str(health_file))
+
+    assert len(responses.calls) == 2
+
+    health = json.loads(health_file.read_text())
+    assert health["status"] == "stopped"
+    assert health["iterations"] == 2
+    assert health["last_error"] is None
+
+
+def test_sigterm(
+    cli: CommandRunner,
+    mf: ModelFactory,
+    responses: RequestsMock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    mf.series(name="one", settings={"chapter_selector": "a"}, url="http://one.com")
+    mf.series(name="two", settings={"chapter_selector": "a"}, url="http://two.com")
+    responses.get("http://one.com", body="")
+    responses.get("http://two.com", body="")
+
+    update_series = sync.update_series
+
+    def terminated_update_series(*args, **kwargs):
+        update_series(*args, **kwargs)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    monkeypatch.setattr(sync, "update_series", terminated_update_series)
+
+    # Despite not being limited, the watch stops, having finished its in-progress
+    # update but not having started the next.
+    cli.invoke()
+
+    assert [call.request.url for call in responses.calls] == ["http://one.com/"]
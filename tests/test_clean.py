@@ -0,0 +1,45 @@
+from bs4 import BeautifulSoup
+
+from chapter_sync.clean import Cleaner, hidden_classes
+
+
+def test_clean_emails():
+    soup = BeautifulSoup(
+        '<div><a href="/cdn-cgi/l/email-protection" class="__cf_email__" '
+        'data-cfemail="85d5eaecebf1dac8e0dac5">[email&#160;protected]</a>_The_Sky</div>',
+        "html.parser",
+    )
+    Cleaner().clean(soup.div)
+    assert soup.div and soup.div.get_text() == "Point_Me_@_The_Sky"
+
+
+def test_clean_only_content():
+    soup = BeautifulSoup(
+        '<p style="color: red">outside</p><div><p style="color: red">inside</p></div>',
+        "html.parser",
+    )
+    Cleaner().clean(soup.div)
+    assert str(soup) == (
+        '<p style="color: red">outside</p><div><p style="">inside</p></div>'
+    )
+
+
+def test_clean_root():
+    soup = BeautifulSoup(
+        '<div class="spoiler-new" style="color: red; margin: 0"><p>kept</p></div>',
+        "html.parser",
+    )
+    Cleaner(removed_classes={"spoiler-new"}).clean(soup.div)
+    # The root's own styling is cleaned, but it's never removed.
+    assert str(soup) == '<div class="spoiler-new" style=" margin: 0"><p>kept</p></div>'
+
+
+def test_removed_classes():
+    soup = BeautifulSoup(
+        "<style>.abc { display: none; }</style>"
+        '<div><p class="abc">stolen</p><div class="spoiler-new">spoiler</div><p>kept</p></div>',
+        "html.parser",
+    )
+    cleaner = Cleaner(removed_classes={"spoiler-new", *hidden_classes(soup)})
+    cleaner.clean(soup.div)
+    assert str(soup.div) == "<div><p>kept</p></div>"
@@ -0,0 +1,96 @@
+import email
+from email import policy
+
+import pytest
+
+from chapter_sync import email as email_module
+from chapter_sync.email import EmailClient
+
+
+class FakeSMTP:
+    def __init__(self, host):
+        self.host = host
+        self.logins = []
+        self.sent = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def login(self, username, password):
+        self.logins.append((username, password))
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        self.sent.append((from_addr, to_addrs, msg))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    connections: list[FakeSMTP] = []
+
+    def connect(host):
+        connections.append(FakeSMTP(host))
+        return connections[-1]
+
+    monkeypatch.setattr(email_module.smtplib, "SMTP_SSL", connect)
+    return connections
+
+
+def make_client():
+    return EmailClient(host="smtp.example.com", username="me@me.com", password="pw")  # noqa: S106
+
+
+def test_send_all_encodes_once(smtp):
+    make_client().send_all(
+        subject="Chapter 1",
+        to=["a@a.com", "b@b.com"],
+        attachment=b"epub",
+        filename="Chapter 1.epub",
+    )
+
+    [connection] = smtp
+    assert connection.logins == [("me@me.com", "pw")]
+    assert connection.closed
+
+    (_, to_a, raw_a), (_, to_b, raw_b) = connection.sent
+    assert (to_a, to_b) == (["a@a.com"], ["b@b.com"])
+
+    # Identical, but for the recipient header.
+    header_a, body_a = raw_a.split(b"\r\n", 1)
+    header_b, body_b = raw_b.split(b"\r\n", 1)
+    assert (header_a, header_b) == (b"To: a@a.com", b"To: b@b.com")
+    assert body_a == body_b
+
+    msg = email.message_from_bytes(raw_b, policy=policy.SMTP)
+    assert msg["To"] == "b@b.com"
+    assert msg["Subject"] == "Chapter 1"
+    [attachment] = msg.iter_attachments()
+    assert attachment.get_filename() == "Chapter 1.epub"
+    assert attachment.get_content() == b"epub"
+
+
+def test_connection_is_reused(smtp):
+    client = make_client()
+    with client.connection():
+        client.send(subject="1", to="a@a.com", attachment=b"1", filename="1")
+        client.send_all(subject="2", to=["a@a.com"], attachment=b"2", filename="2")
+
+    [connection] = smtp
+    assert len(connection.sent) == 2
+    assert connection.closed
+
+
+def test_no_recipients(smtp):
+    with make_client().connection():
+        pass
+    make_client().send_all(subject="1", to=[], attachment=b"1", filename="1")
+
+    # Only the explicit `connection` block connected.
+    [connection] = smtp
+    assert connection.sent == []
@@ -0,0 +1,151 @@
+import zipfile
+from datetime import datetime
+from io import BytesIO
+
+import xmltodict
+from starlette.requests import Request
+from time_machine import TimeMachineFixture
+
+from chapter_sync.epub import REPRODUCIBLE_DATE_TIME, Epub, series_epub
+from chapter_sync.web.responses import ebook_response
+from tests.factories import ModelFactory
+
+
+def test_reproducible(mf: ModelFactory, time_machine: TimeMachineFixture):
+    series = mf.series()
+    chapters = [
+        mf.chapter(series, number=1, published_at=datetime(2020, 1, 1)),
+        mf.chapter(series, number=2, published_at=datetime(2020, 1, 2)),
+    ]
+
+    ebook = Epub.from_series(series, *chapters).write_buffer()
+    time_machine.shift(3600)
+    assert Epub.from_series(series, *chapters).write_buffer().read() == ebook.read()
+
+    ebook.seek(0)
+    with zipfile.ZipFile(ebook) as zf:
+        assert {i.date_time for i in zf.infolist()} == {REPRODUCIBLE_DATE_TIME}
+        assert "Downloaded: 2020-01-02" in zf.read("OEBPS/frontmatter.html").decode()
+
+
+def test_unreproducible(mf: ModelFactory, time_machine: TimeMachineFixture):
+    series = mf.series()
+    chapter = mf.chapter(series)
+
+    ebook = Epub.from_series(series, chapter, reproducible=False).write_buffer()
+    time_machine.shift(3600)
+    other = Epub.from_series(series, chapter, reproducible=False).write_buffer()
+    assert ebook.read() != other.read()
+
+
+def test_etag():
+    response = ebook_response(Request({"type": "http", "headers": []}), b"a", "a.epub")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+
+    request = Request(
+        {"type": "http", "headers": [(b"if-none-match", f'"x", {etag}'.encode())]}
+    )
+    response = ebook_response(request, b"a", "a.epub")
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    assert ebook_response(request, b"b", "b.epub").status_code == 200
+
+
+def test_series_epub_incremental(mf: ModelFactory):
+    series = mf.series()
+    chapters = [
+        mf.chapter(series, number=n, content=f"<p>Chapter {n}</p>") for n in (1, 2, 3)
+    ]
+
+    existing = series_epub(series, chapters[:2])
+    assert series_epub(series, chapters[:2], existing=existing) is existing
+
+    updated = series_epub(series, chapters, existing=existing)
+    assert updated == series_epub(series, chapters)
+
+    # Prebuilt chapters are copied from the existing epub, not rebuilt.
+    chapters[0].content = "<p>Changed</p>"
+    updated = series_epub(series, chapters, existing=existing)
+    with zipfile.ZipFile(BytesIO(updated)) as zf:
+        assert "Chapter 1" in zf.read("OEBPS/chapter/1.html").decode()
+        assert "Chapter 3" in zf.read("OEBPS/chapter/3.html").decode()
+        assert zf.testzip() is None
+
+    # An epub of chapters which no longer exist is rebuilt.
+    assert series_epub(series, chapters[1:], existing=existing) == series_epub(
+        series, chapters[1:]
+    )
+
+
+def test_toc_matches_xmltodict(mf: ModelFactory):
+    series = mf.series(title="Tom & Jerry's")
+    chapters = [
+        mf.chapter(series, number=1, title='The "Start"'),
+        mf.chapter(series, number=2, title="<Interlude> & 'more'"),
+    ]
+
+    epub = Epub.from_series(series, *chapters)
+    with zipfile.ZipFile(epub.write_buffer()) as zf:
+        toc = zf.read("OEBPS/toc.ncx").decode()
+        assert zf.read("OEBPS/Content.opf").decode().startswith("<?xml")
+
+    expected = xmltodict.unparse(
+        epub.toc_ncx_dict(epub.id, epub.title, epub.author), pretty=True, indent="  "
+    )
+    assert toc == expected
+
+
+def test_split_chapter(mf: ModelFactory):
+    series = mf.series()
+    paragraphs = "".join(f'<p id="p{n}">{"x" * 40}</p>' for n in range(4))
+    content = f'<div class="chapter"><p><a href="#p3">end</a></p>{paragraphs}</div>'
+    chapter = mf.chapter(series, number=1, title="Long", content=content)
+
+    epub = Epub.from_series(series, chapter, max_chapter_size=120)
+    assert [c.path for c in epub.chapters] == [
+        "chapter/1.html",
+        "chapter/1-2.html",
+        "chapter/1-3.html",
+    ]
+
+    with zipfile.ZipFile(epub.write_buffer()) as zf:
+        first = zf.read("OEBPS/chapter/1.html").decode()
+        last = zf.read("OEBPS/chapter/1-3.html").decode()
+        toc = zf.read("OEBPS/toc.ncx").decode()
+        opf = zf.read("OEBPS/Content.opf").decode()
+
+    assert "<h1>Long</h1>" in first
+    assert '<a href="1-3.html#p3">' in first
+    assert '<div class="chapter"><p id="p3">' in last
+    assert "<h1>" not in last
+
+    # Only the chapter itself is in the table of contents, but every section is
+    # in the spine.
+    assert toc.count('src="chapter/') == 1
+    assert opf.count('<itemref idref="chapter_1') == 3
+
+
+def test_series_epub_incremental_split(mf: ModelFactory):
+    series = mf.series()
+    large = "".join(f"<p>{'x' * 1000}</p>" for _ in range(300))
+    chapters = [
+        mf.chapter(series, number=1, content=f"<div>{large}</div>"),
+        mf.chapter(series, number=2, content="<p>Chapter 2</p>"),
+    ]
+
+    size = 256 * 1024
+    existing = series_epub(series, chapters[:1], max_chapter_size=size)
+    updated = series_epub(series, chapters, existing=existing, max_chapter_size=size)
+    assert updated == series_epub(series, chapters, max_chapter_size=size)
+
+    with zipfile.ZipFile(BytesIO(updated)) as zf:
+        assert "OEBPS/chapter/1-2.html" in zf.namelist()
+
+    # Chapters are only split when asked; and an epub split at another size (or
+    # not at all) is rebuilt, rather than updated.
+    unsplit = series_epub(series, chapters, existing=updated)
+    assert unsplit == series_epub(series, chapters)
+    with zipfile.ZipFile(BytesIO(unsplit)) as zf:
+        assert "OEBPS/chapter/1-2.html" not in zf.namelist()
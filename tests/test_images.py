@@ -0,0 +1,158 @@
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from responses import RequestsMock
+
+from chapter_sync.epub import Epub, image_profile, series_epub
+from chapter_sync.images import (
+    PROFILES,
+    ImageCache,
+    ImageEmbedder,
+    image_urls,
+    prepare_image,
+)
+from chapter_sync.request import requests_session
+from chapter_sync.sync import block_ebooks
+from tests.factories import ModelFactory
+
+
+def image(size=(100, 50), mode="RGB", format="PNG") -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size, "red").save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def test_prepare_image():
+    prepared = prepare_image(image(size=(3000, 2000)), PROFILES["eink"])
+    assert prepared.media_type == "image/jpeg"
+    with Image.open(BytesIO(prepared.data)) as result:
+        assert result.size == (1072, 715)
+        assert result.mode == "L"
+
+    # Transparency is retained, and small images aren't scaled up.
+    prepared = prepare_image(image(mode="RGBA"), PROFILES["tablet"])
+    assert prepared.media_type == "image/png"
+    with Image.open(BytesIO(prepared.data)) as result:
+        assert result.size == (100, 50)
+        assert result.mode == "RGBA"
+
+
+def test_prepare_decompression_bomb(responses: RequestsMock):
+    # Tiny as a file, but far too many pixels to decode.
+    bomb = image(size=(20000, 9000), mode="1")
+    assert len(bomb) < 100_000
+    with pytest.raises(ValueError):
+        prepare_image(bomb, PROFILES["eink"])
+
+    # As with any other unusable image, it's left as a link.
+    responses.get("http://example.com/bomb.png", body=bomb)
+    embedder = ImageEmbedder(requests_session(), PROFILES["eink"])
+    assert embedder.prepare(["http://example.com/bomb.png"]) == {}
+
+
+def test_image_urls():
+    content = (
+        '<div><img alt="a" src="/a.png"/><img src="http://other.com/b.jpg?x=1&amp;y=2"/>'
+        '<img src="data:image/png;base64,AAAA"/></div>'
+    )
+    assert image_urls(content, "http://example.com/chapter/1") == [
+        "http://example.com/a.png",
+        "http://other.com/b.jpg?x=1&y=2",
+    ]
+
+
+def test_prepare_dedupes(tmp_path: Path, responses: RequestsMock):
+    data = image()
+    responses.get("http://example.com/a.png", body=data)
+    responses.get("http://example.com/copy-of-a.png", body=data)
+    responses.get("http://example.com/missing.png", status=404)
+
+    embedder = ImageEmbedder(
+        requests_session(), PROFILES["tablet"], ImageCache(tmp_path)
+    )
+    prepared = embedder.prepare(
+        [
+            "http://example.com/a.png",
+            "http://example.com/copy-of-a.png",
+            "http://example.com/a.png",
+            "http://example.com/missing.png",
+        ]
+    )
+    assert set(prepared) == {
+        "http://example.com/a.png",
+        "http://example.com/copy-of-a.png",
+    }
+    assert len({i.filename for i in prepared.values()}) == 1
+    assert len(responses.calls) == 3
+
+    # The cache persists, so nothing is refetched.
+    embedder = ImageEmbedder(
+        requests_session(), PROFILES["tablet"], ImageCache(tmp_path)
+    )
+    embedder.prepare(["http://example.com/a.png", "http://example.com/copy-of-a.png"])
+    assert len(responses.calls) == 3
+
+
+def test_embed_images(mf: ModelFactory, responses: RequestsMock):
+    responses.get("http://example.com/a.png", body=image())
+    responses.get("http://example.com/gone.png", status=404)
+    series = mf.series()
+    chapters = [
+        mf.chapter(
+            series,
+            number=n,
+            url=f"http://example.com/{n}",
+            content=f'<p>{n}</p><img src="/a.png"/><img src="/gone.png"/>',
+        )
+        for n in (1, 2)
+    ]
+    embedder = ImageEmbedder(requests_session(), PROFILES["tablet"])
+
+    epub = Epub.from_series(series, *chapters, images=embedder)
+    assert [i.path for i in epub.images] == [epub.images[0].path]
+
+    with zipfile.ZipFile(epub.write_buffer()) as zf:
+        chapter = zf.read("OEBPS/chapter/2.html").decode()
+        opf = zf.read("OEBPS/Content.opf").decode()
+        embedded = zf.read(f"OEBPS/{epub.images[0].path}")
+
+    assert f'<img src="../{epub.images[0].path}"/>' in chapter
+    assert '<img src="/gone.png"/>' in chapter
+    assert f'href="{epub.images[0].path}" media-type="image/jpeg"' in opf
+    assert embedded == epub.images[0].contents
+
+    # Updating an epub retains the images of its existing chapters.
+    existing = series_epub(series, chapters[:1], images=embedder)
+    updated = series_epub(series, chapters, existing=existing, images=embedder)
+    assert updated == series_epub(series, chapters, images=embedder)
+
+
+def test_profile_change_rebuilds(mf: ModelFactory, responses: RequestsMock):
+    responses.get("http://example.com/a.png", body=image())
+    series = mf.series()
+    chapter = mf.chapter(
+        series, number=1, url="http://example.com/1", content='<img src="/a.png"/>'
+    )
+    eink = ImageEmbedder(requests_session(), PROFILES["eink"])
+    tablet = ImageEmbedder(requests_session(), PROFILES["tablet"])
+
+    plain = series_epub(series, [chapter])
+    assert image_profile(plain) is None
+    embedded = series_epub(series, [chapter], existing=plain, images=eink)
+    assert image_profile(embedded) == "eink"
+    assert embedded == series_epub(series, [chapter], images=eink)
+
+    # The same chapters, but for another profile (or none), aren't reused.
+    updated = series_epub(series, [chapter], existing=embedded, images=tablet)
+    assert updated == series_epub(series, [chapter], images=tablet)
+    assert series_epub(series, [chapter], existing=embedded) == plain
+
+    # Nor is a chapter's own epub.
+    chapter.ebook = plain
+    [(_, ebook)] = block_ebooks(series, [[chapter]], images=eink)
+    assert image_profile(ebook) == "eink"
+    [(_, ebook)] = block_ebooks(series, [[chapter]])
+    assert ebook is plain
@@ -0,0 +1,192 @@
+import asyncio
+import zipfile
+from datetime import timedelta
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from cappa.testing import CommandRunner
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from time_machine import TimeMachineFixture
+
+from chapter_sync import links
+from chapter_sync.schema import DownloadAccess
+from chapter_sync.web import download as download_web
+from chapter_sync.web.dependencies import Config, download_link
+from tests.cli import create_cli_fixture
+from tests.email import StubEmailClient
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture(
+    "sync",
+    "--no-update",
+    "--no-save",
+    "--public-url",
+    "https://books.example.com/",
+    "--link-secret",
+    "secret",
+)
+
+config = Config(link_secret="secret")  # noqa: S106
+
+
+def request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"user-agent", b"kindle")],
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+
+
+def params(url: str) -> dict:
+    return {k: v for k, [v] in parse_qs(urlsplit(url).query).items()}
+
+
+def verify(db: Session, url: str):
+    query = params(url)
+    return download_link(
+        request(),
+        db,
+        config,
+        link_id=int(urlsplit(url).path.rsplit("/", 1)[-1]),
+        expires=int(query["expires"]),
+        signature=query["signature"],
+    )
+
+
+@pytest.fixture(autouse=True)
+def ebook_cache():
+    # Link ids restart with each test's database.
+    yield
+    download_web._ebooks.clear()
+
+
+def read(response: StreamingResponse) -> bytes:
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+def test_sign():
+    signature = links.sign(1, 100, "secret")
+    assert links.verify(1, 100, signature, "secret")
+    assert not links.verify(1, 101, signature, "secret")
+    assert not links.verify(2, 100, signature, "secret")
+    assert not links.verify(1, 100, signature, "other")
+
+
+def test_send_links(
+    cli: CommandRunner, mf: ModelFactory, db: Session, email_client: StubEmailClient
+):
+    series = mf.series(name="big", title="Big")
+    attach = mf.email_subscriber(email="attach@foo.com")
+    link = mf.email_subscriber(email="link@foo.com", delivery="link")
+    mf.email_subscription(series, attach)
+    mf.email_subscription(series, link)
+
+    mf.chapter(series, number=1, title="One", content="<p>One</p>", sent_at=None)
+    mf.chapter(series, number=2, title="Two", content="<p>Two</p>", sent_at=None)
+    series_id = series.id
+    db.commit()
+
+    cli.invoke()
+
+    attached, linked = email_client.sent_emails
+    assert attached["to"] == "attach@foo.com"
+    assert attached["attachment"]
+
+    assert linked["to"] == "link@foo.com"
+    assert linked["subject"] == "big - Chapters 1 to 2"
+    assert linked["books"] == {}
+    [url] = [line for line in linked["body"].splitlines() if "://" in line]
+    assert url.startswith("https://books.example.com/download/")
+
+    link_row = verify(db, url)
+    assert link_row.series_id == series_id
+
+    response = download_web.download(request(), db, link_row)
+    assert "big - Chapters 1 to 2.epub" in response.headers["content-disposition"]
+    with zipfile.ZipFile(BytesIO(read(response))) as epub:
+        assert len([n for n in epub.namelist() if n.startswith("OEBPS/chapter/")]) == 2
+
+    [access] = db.scalars(select(DownloadAccess)).all()
+    assert access.link_id == link_row.id
+    assert (access.remote_addr, access.user_agent) == ("10.0.0.1", "kindle")
+
+
+def test_chapter_link(mf: ModelFactory, db: Session):
+    series = mf.series()
+    chapter = mf.chapter(series, number=1)
+    db.commit()
+
+    link = links.create_link(db, series, [chapter], ttl=timedelta(days=1))
+    url = links.url(link, public_url="http://x", secret="secret")  # noqa: S106
+    assert url.startswith(f"http://x/download/{link.id}?")
+
+    link_row = verify(db, url)
+    assert link_row.chapter_id == chapter.id
+    response = download_web.download(request(), db, link_row)
+    assert read(response) == b"foo"
+
+
+def test_block_link(mf: ModelFactory, db: Session):
+    series = mf.series()
+    block = [mf.chapter(series, number=n, content=f"<p>{n}</p>") for n in (1, 2)]
+    db.commit()
+
+    link = links.create_link(db, series, block, ttl=timedelta(days=1))
+    db.commit()
+    first = read(download_web.download(request(), db, link))
+
+    # The epub is only built once, however many times the link is downloaded.
+    block[0].content = "<p>revised</p>"
+    db.commit()
+    assert read(download_web.download(request(), db, link)) == first
+
+    # A link to chapters which have since been removed is gone.
+    gone = links.create_link(db, series, block, ttl=timedelta(days=1))
+    for chapter in block:
+        db.delete(chapter)
+    db.commit()
+    with pytest.raises(HTTPException) as e:
+        download_web.download(request(), db, gone)
+    assert e.value.status_code == 410
+
+
+def test_invalid_links(mf: ModelFactory, db: Session, time_machine: TimeMachineFixture):
+    series = mf.series()
+    chapter = mf.chapter(series, number=1)
+    db.commit()
+
+    link = links.create_link(db, series, [chapter], ttl=timedelta(days=1))
+    db.commit()
+    expires = int(link.expires_at.timestamp())
+    signature = links.sign(link.id, expires, "secret")
+
+    def status(**kwargs) -> int:
+        kwargs = {
+            "link_id": link.id,
+            "expires": expires,
+            "signature": signature,
+            **kwargs,
+        }
+        with pytest.raises(HTTPException) as e:
+            download_link(request(), db, kwargs.pop("config", config), **kwargs)
+        return e.value.status_code
+
+    assert status(signature="0" * 64) == 403
+    assert status(expires=expires + 86400) == 403
+    assert status(config=Config()) == 403
+    assert status(signature=None) == 403
+
+    time_machine.shift(86400)
+    assert status() == 410
+
+    assert db.scalars(select(DownloadAccess)).all() == []
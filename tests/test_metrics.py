@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from responses import RequestsMock
+
+from chapter_sync import metrics
+from chapter_sync.metrics import Counter, Histogram, Registry
+from chapter_sync.request import get_page, requests_session
+from chapter_sync.web.metrics import metrics as metrics_endpoint
+
+
+def test_render():
+    registry = Registry()
+    counter = registry.register(Counter("requests_total", "Requests.", ["host"]))
+    histogram = registry.register(Histogram("duration", "Duration.", buckets=[1, 5]))
+
+    counter.inc(host='a"b')
+    counter.inc(2, host='a"b')
+    histogram.observe(0.5)
+    histogram.observe(3)
+    histogram.observe(10)
+
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{host="a\\"b"} 3\n'
+        "# HELP duration Duration.\n"
+        "# TYPE duration histogram\n"
+        'duration_bucket{le="1"} 1\n'
+        'duration_bucket{le="5"} 2\n'
+        'duration_bucket{le="+Inf"} 3\n'
+        "duration_sum 13.5\n"
+        "duration_count 3\n"
+    )
+
+
+def test_textfile(tmp_path: Path):
+    registry = Registry()
+    registry.register(Counter("requests_total", "Requests.")).inc()
+
+    path = tmp_path / "metrics" / "chapter_sync.prom"
+    registry.write_textfile(path)
+
+    assert path.read_text() == registry.render()
+
+
+def test_fetch_metrics(responses: RequestsMock, sleeps: list[float]):
+    responses.get("http://metrics.example.com/1", status=503)
+    responses.get("http://metrics.example.com/1", body="<p>one</p>")
+
+    host = "metrics.example.com"
+    get_page(requests_session(), "http://metrics.example.com/1")
+
+    assert metrics.fetch_responses.value(host=host, status=503) == 1
+    assert metrics.fetch_responses.value(host=host, status=200) == 1
+    assert metrics.fetch_retries.value(host=host) == 1
+    assert metrics.fetch_duration.count(host=host) == 2
+
+    response = metrics_endpoint()
+    assert (
+        f'chapter_sync_fetch_retries_total{{host="{host}"}} 1'
+        in bytes(response.body).decode()
+    )
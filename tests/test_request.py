@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+from responses import RequestsMock
+from time_machine import TimeMachineFixture
+
+from chapter_sync.request import (
+    CacheMissError,
+    ResponseCache,
+    get_page,
+    get_soup,
+    requests_session,
+)
+from chapter_sync.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def test_cache_hit(tmp_path: Path, responses: RequestsMock):
+    responses.get("http://example.com/1", body="<p>one</p>")
+    session = requests_session(ResponseCache(tmp_path))
+
+    get_soup(session, "http://example.com/1")
+    soup = get_soup(session, "http://example.com/1")
+
+    assert soup.p and soup.p.string == "one"
+    assert len(responses.calls) == 1
+
+
+def test_cache_persists(tmp_path: Path, responses: RequestsMock):
+    responses.get("http://example.com/1", body="<p>one</p>")
+    get_soup(requests_session(ResponseCache(tmp_path)), "http://example.com/1")
+
+    session = requests_session(ResponseCache(tmp_path, offline=True))
+    soup = get_soup(session, "http://example.com/1")
+
+    assert soup.p and soup.p.string == "one"
+    assert len(responses.calls) == 1
+
+
+def test_cache_ttl(
+    tmp_path: Path, responses: RequestsMock, time_machine: TimeMachineFixture
+):
+    responses.get("http://example.com/1", body="<p>one</p>")
+    session = requests_session(ResponseCache(tmp_path, ttl=60))
+
+    get_soup(session, "http://example.com/1")
+    time_machine.shift(61)
+    get_soup(session, "http://example.com/1")
+
+    assert len(responses.calls) == 2
+
+
+def test_cache_lru_eviction(
+    tmp_path: Path, responses: RequestsMock, time_machine: TimeMachineFixture
+):
+    for i in range(3):
+        responses.get(f"http://example.com/{i}", body=f"<p>{i}</p>" * 100)
+
+    cache = ResponseCache(tmp_path, max_size=25)
+    session = requests_session(cache)
+    for i in range(3):
+        time_machine.shift(1)
+        session.get(f"http://example.com/{i}")
+
+    assert cache.get("http://example.com/0") is None
+    assert cache.get("http://example.com/1") is None
+    assert cache.get("http://example.com/2") is not None
+
+
+def test_offline_miss(tmp_path: Path):
+    session = requests_session(ResponseCache(tmp_path, offline=True))
+
+    with pytest.raises(CacheMissError):
+        get_soup(session, "http://example.com/1")
+
+
+def test_retry_backoff(responses: RequestsMock, sleeps: list[float]):
+    responses.get("http://example.com/1", status=503)
+    responses.get("http://example.com/1", status=503)
+    responses.get("http://example.com/1", body="<p>one</p>")
+
+    policy = RetryPolicy(base_delay=2, jitter=0)
+    page = get_page(requests_session(), "http://example.com/1", policy=policy)
+
+    assert page == "<p>one</p>"
+    assert sleeps == [2, 4]
+
+
+def test_retry_not_retryable(responses: RequestsMock, sleeps: list[float]):
+    responses.get("http://example.com/1", status=404)
+
+    with pytest.raises(RuntimeError):
+        get_page(requests_session(), "http://example.com/1")
+
+    assert len(responses.calls) == 1
+    assert sleeps == []
+
+
+def test_retry_after_http_date(responses: RequestsMock, sleeps: list[float]):
+    # Time is frozen at 2020-01-01.
+    retry_after = "Wed, 01 Jan 2020 00:00:30 GMT"
+    responses.get(
+        "http://example.com/1", status=429, headers={"Retry-After": retry_after}
+    )
+    responses.get("http://example.com/1", body="<p>one</p>")
+
+    get_page(requests_session(), "http://example.com/1")
+
+    assert sleeps == [30]
+
+
+def test_retry_after_too_long(responses: RequestsMock, sleeps: list[float]):
+    responses.get("http://example.com/1", status=429, headers={"Retry-After": "3600"})
+
+    session = requests_session()
+    with pytest.raises(CircuitOpenError):
+        get_page(session, "http://example.com/1")
+
+    # The host is skipped for the requested duration, rather than waited on.
+    with pytest.raises(CircuitOpenError):
+        get_page(session, "http://example.com/2")
+
+    assert len(responses.calls) == 1
+    assert sleeps == []
+
+
+def test_circuit_breaker(
+    responses: RequestsMock, sleeps: list[float], time_machine: TimeMachineFixture
+):
+    responses.get("http://example.com/1", status=500)
+    responses.get("http://other.com/1", body="<p>other</p>")
+
+    policy = RetryPolicy(retries=1, breaker=CircuitBreaker(threshold=2, reset_after=60))
+    session = requests_session(retry_policy=policy)
+
+    with pytest.raises(RuntimeError):
+        get_page(session, "http://example.com/1")
+    with pytest.raises(CircuitOpenError):
+        get_page(session, "http://example.com/1")
+    assert len(responses.calls) == 2
+
+    # Other hosts are unaffected.
+    assert get_page(session, "http://other.com/1") == "<p>other</p>"
+
+    # Once the circuit resets, a single trial request is let through.
+    time_machine.shift(61)
+    with pytest.raises(CircuitOpenError):
+        get_page(session, "http://example.com/1")
+    assert len(responses.calls) == 4
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+from cappa.testing import CommandRunner
+from responses import RequestsMock
+from sqlalchemy.orm import Session
+
+from chapter_sync import schedule
+from chapter_sync.schema import Series
+from tests.cli import create_cli_fixture
+from tests.email import StubEmailClient
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("sync", "--no-send")
+send_cli = create_cli_fixture("sync")
+
+# Time is frozen at 2020-01-01.
+now = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def daily_series(mf: ModelFactory, last_published: datetime, **kwargs) -> Series:
+    series = mf.series(**kwargs)
+    for i in range(5):
+        mf.chapter(series, number=i + 1, published_at=last_published - timedelta(4 - i))
+    return series
+
+
+def test_active_series(mf: ModelFactory):
+    series = daily_series(mf, now - timedelta(hours=6))
+
+    assert schedule.release_cadence(series.chapters) == timedelta(days=1)
+
+    schedule.record_check(series, new_chapters=0)
+    assert series.idle_checks == 1
+    assert series.next_check_at == now + timedelta(hours=12)
+
+
+def test_dead_series_backs_off(mf: ModelFactory):
+    series = daily_series(mf, now - timedelta(days=365))
+
+    intervals = []
+    for _ in range(8):
+        schedule.record_check(series, new_chapters=0)
+        assert series.next_check_at
+        intervals.append(series.next_check_at - now)
+
+    assert intervals[:3] == [timedelta(days=1), timedelta(days=2), timedelta(days=4)]
+    assert intervals[-1] == schedule.MAX_INTERVAL
+
+    schedule.record_check(series, new_chapters=1)
+    assert series.idle_checks == 0
+    assert series.next_check_at == now + timedelta(hours=12)
+
+
+def test_due(mf: ModelFactory):
+    later = mf.series(name="later")
+    overdue = mf.series(name="overdue")
+    new = mf.series(name="new")
+    soon = mf.series(name="soon")
+    later.next_check_at = now + timedelta(hours=1)
+    overdue.next_check_at = now - timedelta(hours=2)
+    soon.next_check_at = now
+
+    assert schedule.due([later, overdue, new, soon]) == [new, overdue, soon]
+
+
+def test_sync_schedule(
+    cli: CommandRunner, mf: ModelFactory, db: Session, responses: RequestsMock
+):
+    settings = {"chapter_selector": "a", "content_selector": "p"}
+    due = mf.series(name="due", settings=settings, url="http://example.com/due")
+    later = mf.series(name="later", settings=settings, url="http://example.com/later")
+    later.next_check_at = now + timedelta(hours=1)
+    db.commit()
+
+    responses.get("http://example.com/due", body="")
+
+    cli.invoke("--schedule")
+
+    assert [call.request.url for call in responses.calls] == ["http://example.com/due"]
+    # Nothing new was found, and there's no release history to go on.
+    assert due.idle_checks == 1
+    assert due.next_check_at
+    assert due.next_check_at.replace(tzinfo=timezone.utc) == now + timedelta(days=2)
+
+
+def test_sync_schedule_sends(
+    send_cli: CommandRunner,
+    mf: ModelFactory,
+    db: Session,
+    responses: RequestsMock,
+    email_client: StubEmailClient,
+):
+    series = mf.series(settings={"chapter_selector": "a"}, url="http://example.com")
+    mf.chapter(series, number=1, title="Chapter 1", sent_at=None)
+    mf.email_subscription(series, mf.email_subscriber())
+    series.next_check_at = now + timedelta(days=30)
+    db.commit()
+
+    send_cli.invoke("--schedule")
+
+    # The series isn't due to be checked, but its unsent chapter is still sent.
+    assert not responses.calls
+    assert [e["subject"] for e in email_client.sent_emails] == ["foo: Chapter 1.epub"]
+
+
+def test_next_due(mf: ModelFactory, db: Session):
+    later = mf.series(name="later")
+    soon = mf.series(name="soon")
+    later.next_check_at = now + timedelta(hours=2)
+    soon.next_check_at = now + timedelta(hours=1)
+    db.commit()
+
+    assert schedule.next_due(db) == now + timedelta(hours=1)
+    assert schedule.next_due(db, [later.id]) == now + timedelta(hours=2)
+
+    mf.series(name="new")
+    assert schedule.next_due(db) == now
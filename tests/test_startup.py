@@ -0,0 +1,51 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from chapter_sync import db, schema_version
+from chapter_sync.cli.base import database
+
+
+def test_lazy_imports():
+    # Importing each command's module (as `series list` would) doesn't load the
+    # dependencies which only a few commands need.
+    heavy = ["alembic", "bs4", "PIL", "fastapi", "xmltodict"]
+    script = (
+        "import sys, chapter_sync.cli.base, chapter_sync.series, chapter_sync.chapter;"
+        f"print([m for m in {heavy!r} if m in sys.modules])"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+    # Nor does building epubs need xmltodict, since their large documents are
+    # streamed.
+    script = "import sys, chapter_sync.epub; print('xmltodict' in sys.modules)"
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_cached_head(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    url = f"sqlite:///{tmp_path / 'chapter-sync.sqlite'}"
+
+    # A new database is migrated, and the head revision cached.
+    list(database(url))
+    head = schema_version.cached_head()
+    assert head
+
+    def bootstrap(*args):
+        raise AssertionError("The database was already up to date")
+
+    monkeypatch.setattr(db, "bootstrap", bootstrap)
+    for session in database(url):
+        assert schema_version.current_revision(session.connection()) == head
+
+    # A different (or reset) database file isn't assumed to be up to date.
+    with pytest.raises(AssertionError, match="already up to date"):
+        list(database(f"sqlite:///{tmp_path / 'other.sqlite'}"))
@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+
+import pytest
+from cappa.testing import CommandRunner
+from responses import RequestsMock
+
+from chapter_sync.trace import Tracer, export_otlp, summarize_series, summarize_stages
+from tests.cli import create_cli_fixture
+from tests.factories import ModelFactory
+
+cli = create_cli_fixture("sync", "--no-send", "--no-save")
+
+
+def test_disabled():
+    tracer = Tracer()
+    with tracer.span("series") as span:
+        assert span is None
+
+    assert tracer.collect() == []
+
+
+def test_nesting():
+    tracer = Tracer(enabled=True)
+    with tracer.span("series", series="one") as series:
+        with tracer.span("get_page"):
+            pass
+        with pytest.raises(ValueError), tracer.span("get_page"):
+            raise ValueError("nope")
+
+    spans = tracer.collect()
+    assert tracer.collect() == []
+
+    first, second, parent = spans
+    assert series is parent
+    assert first.parent_id == second.parent_id == parent.span_id
+    assert first.trace_id == second.trace_id == parent.trace_id
+    assert parent.parent_id is None
+    assert second.error == "ValueError('nope')"
+
+
+def test_summaries():
+    tracer = Tracer(enabled=True)
+    for name in ["one", "two"]:
+        with tracer.span("series", series=name):
+            with tracer.span("get_page"):
+                pass
+
+    spans = tracer.collect()
+    parents = [s for s in spans if s.name == "series"]
+    children = [s for s in spans if s.name == "get_page"]
+
+    stages = {s.name: s for s in summarize_stages(spans)}
+    assert stages["series"].count == 2
+    assert stages["series"].total_ns == sum(s.duration_ns for s in parents)
+    assert stages["series"].self_ns == sum(
+        p.duration_ns - c.duration_ns for p, c in zip(parents, children)
+    )
+    assert {name for name, _ in summarize_series(spans)} == {"one", "two"}
+
+
+def test_export_otlp(tmp_path: Path):
+    tracer = Tracer(enabled=True)
+    with tracer.span("series", series="one", chapters=2):
+        with tracer.span("get_page"):
+            pass
+
+    path = tmp_path / "trace.jsonl"
+    export_otlp(tracer.collect(), path)
+
+    [line] = path.read_text().splitlines()
+    [resource_spans] = json.loads(line)["resourceSpans"]
+    [scope_spans] = resource_spans["scopeSpans"]
+    child, parent = scope_spans["spans"]
+
+    assert child["parentSpanId"] == parent["spanId"]
+    assert "parentSpanId" not in parent
+    assert parent["attributes"] == [
+        {"key": "series", "value": {"stringValue": "one"}},
+        {"key": "chapters", "value": {"intValue": "2"}},
+    ]
+    assert int(parent["endTimeUnixNano"]) >= int(child["endTimeUnixNano"])
+
+
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_sync_trace(
+    cli: CommandRunner, mf: ModelFactory, responses: RequestsMock, tmp_path: Path
+):
+    mf.series(
+        name="traced",
+        url="http://example.com/traced",
+        settings={"chapter_selector": "a", "content_selector": "p"},
+    )
+
+    responses.get(
+        "http://example.com/traced", body='<a href="http://example.com/1">One</a>'
+    )
+    responses.get("http://example.com/1", body="<p>One</p>")
+
+    path = tmp_path / "trace.jsonl"
+    cli.invoke("--profile", "--trace-file", str(path), "-j", "2")
+
+    [line] = path.read_text().splitlines()
+    [resource_spans] = json.loads(line)["resourceSpans"]
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    by_id = {s["spanId"]: s for s in spans}
+
+    def ancestors(span):
+        while "parentSpanId" in span:
+            span = by_id[span["parentSpanId"]]
+            yield span["name"]
+
+    [collect] = [s for s in spans if s["name"] == "collect_chapter"]
+    # Collected on a worker thread, but still within the series' trace.
+    assert list(ancestors(collect)) == ["update_series", "series", "sync"]
+    assert len({s["traceId"] for s in spans}) == 1
+
+    # Time spent committing is accounted for too.
+    commits = [list(ancestors(s)) for s in spans if s["name"] == "db.commit"]
+    assert ["series", "sync"] in commits
+
+
+@pytest.mark.filterwarnings("ignore:pathlib.Path.__enter__")
+def test_sync_trace_next_links(
+    cli: CommandRunner, mf: ModelFactory, responses: RequestsMock, tmp_path: Path
+):
+    mf.series(
+        name="traced",
+        url="http://example.com/1",
+        settings={
+            "next_selector": "a.next",
+            "content_selector": "div",
+            "content_title_selector": "h1",
+        },
+    )
+
+    responses.get(
+        "http://example.com/1",
+        body='<div><h1>One</h1></div><a class="next" href="http://example.com/2">2</a>',
+    )
+    responses.get("http://example.com/2", body="<div><h1>Two</h1></div>")
+
+    path = tmp_path / "trace.jsonl"
+    cli.invoke("--profile", "--trace-file", str(path))
+
+    [line] = path.read_text().splitlines()
+    [resource_spans] = json.loads(line)["resourceSpans"]
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    by_id = {s["spanId"]: s for s in spans}
+
+    # Each page followed is traced as it'd be if the chapters were listed.
+    collects = [s for s in spans if s["name"] == "collect_chapter"]
+    assert [s["attributes"][0]["value"]["stringValue"] for s in collects] == [
+        "http://example.com/1",
+        "http://example.com/2",
+    ]
+    for name in ["parse", "extract"]:
+        stages = [s for s in spans if s["name"] == name]
+        assert len(stages) == 2
+        assert all(by_id[s["parentSpanId"]] in collects for s in stages)
@@ -0,0 +1,74 @@
+from chapter_sync.schema import SeriesVolume
+from chapter_sync.volumes import (
+    EPUB_OVERHEAD,
+    estimated_size,
+    extend_volumes,
+    split_by_count,
+    split_by_size,
+    split_by_volume_id,
+)
+from tests.factories import ModelFactory
+
+
+def test_estimated_size(mf: ModelFactory):
+    series = mf.series()
+    built = mf.chapter(series, number=1, ebook=b"x" * (EPUB_OVERHEAD + 100))
+    unbuilt = mf.chapter(series, number=2, ebook=None, content="é" * 10)
+
+    assert estimated_size(built) == 100
+    assert estimated_size(unbuilt) == 20
+
+
+def test_split_by_size(mf: ModelFactory):
+    series = mf.series()
+    chapters = [
+        mf.chapter(series, number=n, ebook=b"x" * (EPUB_OVERHEAD + size))
+        for n, size in enumerate([400, 400, 300, 2000, 100], 1)
+    ]
+
+    volumes = split_by_size(chapters, EPUB_OVERHEAD + 1000)
+    assert [[c.number for c in v] for v in volumes] == [[1, 2], [3], [4], [5]]
+
+    assert split_by_size(chapters, None) == [chapters]
+    assert split_by_size([], 1000) == []
+
+
+def test_split_by_count(mf: ModelFactory):
+    series = mf.series()
+    chapters = [mf.chapter(series, number=n) for n in range(1, 6)]
+
+    volumes = split_by_count(chapters, 2)
+    assert [[c.number for c in v] for v in volumes] == [[1, 2], [3, 4], [5]]
+
+
+def test_split_by_volume_id(mf: ModelFactory):
+    series = mf.series()
+    chapters = [
+        mf.chapter(series, number=n, volume_id=volume_id)
+        for n, volume_id in enumerate([None, "1", "1", "2"], 1)
+    ]
+
+    volumes = split_by_volume_id(chapters)
+    assert [[c.number for c in v] for v in volumes] == [[1], [2, 3], [4]]
+
+
+def test_extend_volumes(mf: ModelFactory):
+    series = mf.series()
+    chapters = [
+        mf.chapter(series, number=n, ebook=b"x" * (EPUB_OVERHEAD + 300))
+        for n in range(1, 8)
+    ]
+    stored = [
+        SeriesVolume(number=2, first_number=3, last_number=4),
+        SeriesVolume(number=1, first_number=1, last_number=2),
+    ]
+
+    def split(chapters):
+        return split_by_size(chapters, EPUB_OVERHEAD + 1000)
+
+    # Even though the first volume would now fit a third chapter, it's unchanged;
+    # only the last stored volume (and the chapters since) are split.
+    volumes = extend_volumes(chapters, stored, split)
+    assert [[c.number for c in v] for v in volumes] == [[1, 2], [3, 4, 5], [6, 7]]
+
+    assert extend_volumes(chapters, [], split) == split(chapters)